@@ -24,7 +24,7 @@ class ErrorHandlerAgent:
     def __init__(self, model: LLMModel):
         self.model = model
 
-    def classify_error(
+    async def classify_error(
         self, command: str, axtree: str, screenshot: str | None
     ) -> tuple[str, ErrorHandlerOutput, TokenUsage]:
         """The first argument may be a Playwright command or LLM extraction_instructions."""
@@ -36,11 +36,15 @@ class ErrorHandlerAgent:
         [/INPUT]
         """
 
-        response, token_usage = self.model.get_model_response_with_structured_output(
-            prompt=final_prompt,
-            response_schema=ErrorHandlerOutput,
-            screenshot=screenshot,
-            system_instruction=system_prompt,
+        response, token_usage = (
+            await self.model.aget_model_response_with_structured_output(
+                prompt=final_prompt,
+                response_schema=ErrorHandlerOutput,
+                screenshot=screenshot,
+                system_instruction=system_prompt,
+                agent_name="ErrorHandlerAgent",
+                axtree=axtree,
+            )
         )
 
         return final_prompt, response, token_usage
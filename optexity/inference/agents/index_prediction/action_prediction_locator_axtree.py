@@ -29,7 +29,7 @@ class ActionPredictionLocatorAxtree:
     def __init__(self, model: LLMModel):
         self.model = model
 
-    def predict_action(
+    async def predict_action(
         self,
         goal: str,
         axtree: str,
@@ -64,11 +64,15 @@ class ActionPredictionLocatorAxtree:
             else IndexPredictionOutputPositiveOnly
         )
 
-        response, token_usage = self.model.get_model_response_with_structured_output(
-            prompt=final_prompt,
-            response_schema=response_schema,
-            screenshot=screenshot,
-            system_instruction=system_instruction,
+        response, token_usage = (
+            await self.model.aget_model_response_with_structured_output(
+                prompt=final_prompt,
+                response_schema=response_schema,
+                screenshot=screenshot,
+                system_instruction=system_instruction,
+                agent_name="ActionPredictionLocatorAxtree",
+                axtree=axtree,
+            )
         )
 
         return final_prompt, response, token_usage
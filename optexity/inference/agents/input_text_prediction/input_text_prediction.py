@@ -17,7 +17,7 @@ class InputTextPredictionAgent:
     def __init__(self, model: LLMModel):
         self.model = model
 
-    def predict_input_text(
+    async def predict_input_text(
         self,
         goal: str,
         axtree: str,
@@ -35,11 +35,15 @@ class InputTextPredictionAgent:
         [/INPUT]
         """
 
-        response, token_usage = self.model.get_model_response_with_structured_output(
-            prompt=final_prompt,
-            response_schema=InputTextPredictionOutput,
-            screenshot=screenshot,
-            system_instruction=system_prompt,
+        response, token_usage = (
+            await self.model.aget_model_response_with_structured_output(
+                prompt=final_prompt,
+                response_schema=InputTextPredictionOutput,
+                screenshot=screenshot,
+                system_instruction=system_prompt,
+                agent_name="InputTextPredictionAgent",
+                axtree=axtree,
+            )
         )
 
         return final_prompt, response, token_usage
@@ -20,7 +20,7 @@ class SelectOptionPredictionAgent:
     def __init__(self, model: LLMModel):
         self.model = model
 
-    def predict_select_option(
+    async def predict_select_option(
         self,
         goal: str,
         axtree: str,
@@ -38,11 +38,15 @@ class SelectOptionPredictionAgent:
         [/INPUT]
         """
 
-        response, token_usage = self.model.get_model_response_with_structured_output(
-            prompt=final_prompt,
-            response_schema=SelectOptionPredictionOutput,
-            screenshot=screenshot,
-            system_instruction=system_prompt,
+        response, token_usage = (
+            await self.model.aget_model_response_with_structured_output(
+                prompt=final_prompt,
+                response_schema=SelectOptionPredictionOutput,
+                screenshot=screenshot,
+                system_instruction=system_prompt,
+                agent_name="SelectOptionPredictionAgent",
+                axtree=axtree,
+            )
         )
 
         return final_prompt, response, token_usage
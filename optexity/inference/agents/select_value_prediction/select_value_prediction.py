@@ -18,7 +18,7 @@ class SelectValuePredictionAgent:
     def __init__(self, model: LLMModel):
         self.model = model
 
-    def predict_select_value(
+    async def predict_select_value(
         self, options: list[dict[str, str]], patterns: list[str]
     ) -> tuple[str, SelectValuePredictionOutput, TokenUsage]:
 
@@ -30,10 +30,13 @@ class SelectValuePredictionAgent:
         [{', '.join(patterns)}]
         """
 
-        response, token_usage = self.model.get_model_response_with_structured_output(
-            prompt=final_prompt,
-            response_schema=SelectValuePredictionOutput,
-            system_instruction=system_prompt,
+        response, token_usage = (
+            await self.model.aget_model_response_with_structured_output(
+                prompt=final_prompt,
+                response_schema=SelectValuePredictionOutput,
+                system_instruction=system_prompt,
+                agent_name="SelectValuePredictionAgent",
+            )
         )
 
         return final_prompt, response, token_usage
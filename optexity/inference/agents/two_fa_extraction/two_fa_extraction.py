@@ -24,7 +24,7 @@ class TwoFAExtraction:
     def __init__(self, model: LLMModel):
         self.model = model
 
-    def extract_code(
+    async def extract_code(
         self, instructions: str | None, messages: list[Message]
     ) -> tuple[str, TwoFAExtractionOutput, TokenUsage]:
 
@@ -42,9 +42,12 @@ class TwoFAExtraction:
         [/MESSAGES]
         """
 
-        response, token_usage = self.model.get_model_response_with_structured_output(
-            prompt=final_prompt,
-            response_schema=TwoFAExtractionOutput,
-            system_instruction=system_prompt,
+        response, token_usage = (
+            await self.model.aget_model_response_with_structured_output(
+                prompt=final_prompt,
+                response_schema=TwoFAExtractionOutput,
+                system_instruction=system_prompt,
+                agent_name="TwoFAExtraction",
+            )
         )
         return final_prompt, response, token_usage
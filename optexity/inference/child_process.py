@@ -1,24 +1,27 @@
 import argparse
 import asyncio
+import heapq
 import json
 import logging
 import os
-import pathlib
 import signal
 import subprocess
-import sys
+import time
 import uuid
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from urllib.parse import urljoin
 
 import httpx
 import psutil
 from fastapi import Body, FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from uvicorn import run
 
+from optexity.inference import metrics
 from optexity.inference.core.logging import (
     complete_task_in_server,
     delete_local_data,
@@ -27,12 +30,13 @@ from optexity.inference.core.logging import (
 )
 from optexity.inference.infra.actual_browser import ActualBrowser
 from optexity.inference.infra.browser_health import consume_browser_restart_request
-from optexity.schema.automation import Automation
+from optexity.inference.persistent_queue import PersistentTaskQueue
+from optexity.inference.recording_cache import RecordingCache
+from optexity.inference.worker_pool import WorkerPool, spawn_worker
 from optexity.schema.enums import ExitCodes
 from optexity.schema.inference import InferenceRequest
 from optexity.schema.memory import SystemInfo
 from optexity.schema.task import Task
-from optexity.utils.http import request_with_backoff
 from optexity.utils.settings import settings
 
 logging.basicConfig(level=logging.INFO)
@@ -48,38 +52,253 @@ class HumanInLoopCompletedBody(BaseModel):
     task_id: str
 
 
+class ExecutionSlot:
+    """One concurrent execution lane of this child.
+
+    A slot owns its own ActualBrowser (and therefore CDP port, user-data-dir and
+    download directory) and runs one worker subprocess at a time. Slot 0 keeps
+    the ports and paths a single-slot child always used.
+
+    With BROWSER_HOT_SPARE a slot alternates its browser between two lanes (a
+    CDP port and profile directory each): the current browser holds one while
+    the spare boots, or the previous browser shuts down, on the other.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.actual_browser: ActualBrowser | None = None
+        self.browser_lane = 0
+        self.spare: asyncio.Task | None = None
+        self.spare_key: tuple | None = None
+        # lane -> background stop of a browser that lane's next launch waits on
+        self.teardowns: dict[int, asyncio.Task] = {}
+        self.task_id: str | None = None
+        self.task_running = False
+        self.last_task_start_time: datetime | None = None
+        self.current_task_timeout_minutes: int | None = None
+        self.step_index: int | None = None
+        self.last_progress_at: datetime | None = None
+
+    def cdp_port(self, lane: int = 0) -> int:
+        return (
+            9222
+            + child_process_id
+            + self.index * settings.CHILD_SLOT_PORT_STRIDE
+            + lane * settings.BROWSER_SPARE_PORT_OFFSET
+        )
+
+    def mark_started(self, task: Task) -> None:
+        self.task_id = task.task_id
+        self.task_running = True
+        self.last_task_start_time = datetime.now(timezone.utc)
+        self.current_task_timeout_minutes = task.max_timeout_in_minutes
+
+    def mark_idle(self) -> None:
+        self.task_id = None
+        self.task_running = False
+        self.last_task_start_time = None
+        self.current_task_timeout_minutes = None
+        self.step_index = None
+        self.last_progress_at = None
+
+    def record_progress(self, message: dict) -> None:
+        """Progress frame from this slot's worker (see worker_channel)."""
+        self.step_index = message.get("step_index")
+        self.last_progress_at = datetime.now(timezone.utc)
+
+    def timeout_minutes(self) -> int:
+        return self.current_task_timeout_minutes or 15
+
+    def is_overdue(self) -> bool:
+        return (
+            self.task_running
+            and self.last_task_start_time is not None
+            and datetime.now(timezone.utc) - self.last_task_start_time
+            > timedelta(minutes=self.timeout_minutes())
+        )
+
+    def status(self) -> dict:
+        return {
+            "slot": self.index,
+            "task_running": self.task_running,
+            "task_id": self.task_id,
+            "started_at": (
+                self.last_task_start_time.isoformat()
+                if self.last_task_start_time is not None
+                else None
+            ),
+            "step_index": self.step_index,
+            "last_progress_at": (
+                self.last_progress_at.isoformat()
+                if self.last_progress_at is not None
+                else None
+            ),
+            "cdp_port": self.cdp_port(self.browser_lane),
+            "browser_running": self.actual_browser is not None,
+            "spare_browser": self.spare is not None,
+        }
+
+
 child_process_id = -1
 unique_child_arn: str = str(uuid.uuid4())
-task_running = False
-last_task_start_time: datetime | None = None
-current_task_timeout_minutes: int | None = None
+slots: list[ExecutionSlot] = []
+# Serializes "is there memory for another task" + slot reservation across
+# slots, so two slots cannot both pass the admission check on the same reading.
+_admission_lock = asyncio.Lock()
+# Task id whose log file a record belongs to; each slot processor runs in its
+# own asyncio task, so concurrent tasks never write into each other's log.
+_current_log_task_id: ContextVar[str | None] = ContextVar(
+    "_current_log_task_id", default=None
+)
 task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
 # Monotonic tie-breaker so equal-priority entries stay FIFO and heap ordering
 # never compares Task objects. See Task.priority_order_key.
 _task_seq = 0
 tasks_to_kill: set[str] = set()
+# On-disk copy of the queued tasks; None unless CHILD_PERSISTENT_QUEUE is set.
+persistent_queue: PersistentTaskQueue | None = None
 
 
-def _enqueue_task(task: Task) -> None:
+def _enqueue_task(task: Task, seq: int | None = None) -> None:
     """Put a task on the local priority queue: lower priority runs first, None
-    last, ties FIFO. The queue is unbounded so put_nowait never blocks."""
+    last, ties FIFO. Capacity is enforced by the endpoints (see
+    _queue_rejection), so put_nowait never blocks.
+
+    ``seq`` is only passed when replaying the persistent queue, so replayed
+    tasks keep their original FIFO position and are not journaled twice.
+    """
     global _task_seq
-    _task_seq += 1
-    task_queue.put_nowait((*task.priority_order_key(), _task_seq, task))
+    if settings.CHILD_QUEUE_STRIP_AUTOMATION:
+        # The processor re-fetches the automation at dequeue anyway; don't hold
+        # a parsed copy per queued task.
+        task.automation = None
+    if seq is None:
+        _task_seq += 1
+        seq = _task_seq
+        if persistent_queue is not None:
+            persistent_queue.add(task, seq)
+    task_queue.put_nowait((*task.priority_order_key(), seq, task))
+    _prefetch_wakeup.set()
+
+
+def _queue_rejection(incoming: int) -> JSONResponse | None:
+    """A 429 telling the master to try another child, or None to accept.
+
+    Rejects when ``incoming`` more tasks would take the queue past
+    CHILD_QUEUE_CAPACITY. Batches are accepted or rejected whole.
+    """
+    capacity = settings.CHILD_QUEUE_CAPACITY
+    queued = task_queue.qsize()
+    if capacity <= 0 or queued + incoming <= capacity:
+        return None
+    logger.warning(f"Rejecting {incoming} task(s): queue holds {queued} of {capacity}")
+    return JSONResponse(
+        content={
+            "success": False,
+            "message": f"Task queue full ({queued}/{capacity} queued)",
+            "queued": queued,
+            "capacity": capacity,
+        },
+        status_code=429,
+        headers={"Retry-After": str(settings.CHILD_QUEUE_RETRY_AFTER_SECONDS)},
+    )
+
+
+def _replay_persistent_queue() -> None:
+    global _task_seq
+    assert persistent_queue is not None
+    pending = persistent_queue.load()
+    for seq, task in pending:
+        _task_seq = max(_task_seq, seq)
+        _enqueue_task(task, seq=seq)
+    if pending:
+        logger.info(
+            f"Replayed {len(pending)} queued task(s) from {persistent_queue.path}"
+        )
+
+
+recording_cache = RecordingCache(
+    ttl_seconds=settings.RECORDING_CACHE_TTL_SECONDS,
+    max_entries=settings.RECORDING_CACHE_MAX_ENTRIES,
+)
+# Set whenever the head of task_queue may have changed.
+_prefetch_wakeup = asyncio.Event()
+
+
+def _upcoming_tasks(depth: int) -> list[Task]:
+    """The next ``depth`` tasks in run order, without dequeuing them.
+
+    PriorityQueue keeps its heap in ``_queue``; entries end in a unique sequence
+    number, so nsmallest never compares the Task objects themselves.
+    """
+    return [entry[-1] for entry in heapq.nsmallest(depth, task_queue._queue)]
+
+
+async def recording_prefetcher():
+    """Resolve recordings for the next RECORDING_PREFETCH_DEPTH queued tasks.
+
+    Runs while the slots are busy so the dequeued task finds its validated
+    Automation already cached instead of fetching and parsing it inline. Also
+    wakes every half TTL so entries for tasks stuck behind a long run are kept
+    fresh with cheap If-None-Match revalidations.
+    """
+    logger.info("Recording prefetcher started")
+    refresh_interval = max(1.0, settings.RECORDING_CACHE_TTL_SECONDS / 2)
+    while True:
+        try:
+            try:
+                await asyncio.wait_for(
+                    _prefetch_wakeup.wait(), timeout=refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            _prefetch_wakeup.clear()
+            recordings = {
+                task.recording_id: task.api_key
+                for task in _upcoming_tasks(settings.RECORDING_PREFETCH_DEPTH)
+            }
+            await asyncio.gather(
+                *(
+                    recording_cache.prefetch(recording_id, api_key)
+                    for recording_id, api_key in recordings.items()
+                )
+            )
+        except asyncio.CancelledError:
+            logger.info("Recording prefetcher cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in recording prefetcher: {e}")
 
 
 # task_id -> worker subprocess, so /kill_task can signal an in-flight worker.
 running_task_processes: dict[str, asyncio.subprocess.Process] = {}
-_global_actual_browser: ActualBrowser | None = None
 
 # HITL: task_ids whose HITL step has been completed by the human.
 # Written by POST /human_in_loop_completed; read + cleared by GET /hitl_status.
 hitl_completed_tasks: set[str] = set()
+# task_id -> event set on completion, waking a /hitl_status long-poll.
+_hitl_events: dict[str, asyncio.Event] = {}
 
 # Port this FastAPI server is listening on; set in get_app_with_endpoints so
 # it can be forwarded to worker subprocesses via CHILD_FASTAPI_PORT env var.
 _child_fastapi_port: int = -1
 
+# Warm workers shared by all slots; None when WORKER_POOL_SIZE is 0.
+worker_pool: WorkerPool | None = None
+
+
+def _exit_code_label(returncode: int | None) -> str:
+    if returncode == -1:
+        return "TIMEOUT"
+    try:
+        return ExitCodes(returncode).name
+    except ValueError:
+        return str(returncode)
+
+
+def _worker_env() -> dict[str, str]:
+    return {**os.environ, "CHILD_FASTAPI_PORT": str(_child_fastapi_port)}
+
 
 def log_system_info(comment: str):
     logger.info("=" * 100 + "\n")
@@ -111,20 +330,186 @@ def log_system_info(comment: str):
     logger.info("=" * 100 + "\n")
 
 
-async def restart_global_actual_browser(reason: str) -> None:
-    global _global_actual_browser
-    logger.warning("Restarting actual browser: %s", reason)
-    if _global_actual_browser is not None:
+class _TaskLogFilter(logging.Filter):
+    def __init__(self, task_id: str):
+        super().__init__()
+        self.task_id = task_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return _current_log_task_id.get() == self.task_id
+
+
+def _can_admit_task(slot: ExecutionSlot) -> bool:
+    """Whether ``slot`` may take a task now.
+
+    A task always runs when no other slot is busy, exactly as a single-slot
+    child would. Otherwise the container needs CHILD_SLOT_MIN_FREE_MEMORY_MB of
+    cgroup headroom, since each extra task brings its own Chrome and worker.
+    """
+    if not any(s.task_running for s in slots if s is not slot):
+        return True
+    used_mb, total_mb = SystemInfo.get_effective_memory_mb()
+    return total_mb - used_mb >= settings.CHILD_SLOT_MIN_FREE_MEMORY_MB
+
+
+async def restart_slot_browser(slot: ExecutionSlot, reason: str) -> None:
+    logger.warning("Restarting actual browser for slot %s: %s", slot.index, reason)
+    if slot.actual_browser is not None:
         try:
-            await _global_actual_browser.stop(graceful=True)
+            await slot.actual_browser.stop(graceful=True)
         except Exception as e:
             logger.warning("Error stopping browser during restart: %s", e)
-        _global_actual_browser = None
+        slot.actual_browser = None
+
+
+def _new_actual_browser(task: Task, slot: ExecutionSlot, lane: int) -> ActualBrowser:
+    assert task.automation is not None, f"Task {task.task_id} has no automation"
+    return ActualBrowser(
+        channel=task.automation.browser_channel,
+        unique_child_arn=unique_child_arn,
+        port=slot.cdp_port(lane),
+        headless=False,
+        is_dedicated=task.is_dedicated,
+        use_proxy=task.use_proxy,
+        proxy_session_id=task.proxy_session_id(
+            settings.PROXY_PROVIDER if task.use_proxy else None
+        ),
+        os_emulation=task.automation.os_emulation,
+        allow_cookies=task.automation.allow_cookies,
+        slot_index=slot.index,
+        user_data_suffix=f"_lane{lane}" if lane else "",
+    )
+
+
+def _spare_key(task: Task) -> tuple | None:
+    """Launch options a hot spare must share to stand in for ``task``'s browser.
+
+    None when the task never runs on a spare: dedicated browsers are reused
+    as-is, browser-use and rdp are not local Chrome, and oxylabs proxy sessions
+    are sticky per task.
+    """
+    if not settings.BROWSER_HOT_SPARE or task.is_dedicated or task.automation is None:
+        return None
+    if task.automation.browser_channel in ("browser-use", "rdp"):
+        return None
+    if task.use_proxy and settings.PROXY_PROVIDER == "oxylabs":
+        return None
+    return (
+        task.automation.browser_channel,
+        task.use_proxy,
+        task.proxy_session_id(settings.PROXY_PROVIDER if task.use_proxy else None),
+        task.automation.os_emulation,
+        task.automation.allow_cookies,
+    )
+
+
+async def _wait_for_teardown(slot: ExecutionSlot, lane: int) -> None:
+    teardown = slot.teardowns.pop(lane, None)
+    if teardown is not None:
+        try:
+            await teardown
+        except Exception as e:
+            logger.warning("Error stopping browser on lane %s: %s", lane, e)
+
+
+def _retire_browser(slot: ExecutionSlot, browser: ActualBrowser, lane: int) -> None:
+    """Stop ``browser`` in the background; ``lane`` is reused only after."""
+
+    async def _stop():
+        await browser.stop(graceful=True)
+
+    slot.teardowns[lane] = asyncio.create_task(_stop())
+
+
+def _discard_spare_browser(slot: ExecutionSlot) -> None:
+    spare, slot.spare, slot.spare_key = slot.spare, None, None
+    if spare is None:
+        return
+    lane = 1 - slot.browser_lane
+
+    async def _stop():
+        try:
+            browser = await spare
+        except Exception:
+            return
+        await browser.stop(graceful=False)
 
+    slot.teardowns[lane] = asyncio.create_task(_stop())
 
-async def setup_browser(task: Task, unique_child_arn: str, child_process_id: int):
+
+async def _launch_spare_browser(
+    slot: ExecutionSlot, task: Task, lane: int
+) -> ActualBrowser:
+    await _wait_for_teardown(slot, lane)
+    browser = _new_actual_browser(task, slot, lane)
+    start = datetime.now(timezone.utc)
+    try:
+        await browser.start()
+    except Exception:
+        try:
+            await browser.stop(graceful=False)
+        except Exception:
+            pass
+        raise
+    logger.info(
+        "Hot spare browser ready for slot %s on port %s in %.1fs",
+        slot.index,
+        browser.port,
+        (datetime.now(timezone.utc) - start).total_seconds(),
+    )
+    return browser
+
+
+def _schedule_spare_browser(slot: ExecutionSlot, task: Task) -> None:
+    """Boot the next browser for this slot while ``task`` runs on the current one."""
+    key = _spare_key(task)
+    if key is None or slot.spare is not None:
+        return
+    used_mb, total_mb = SystemInfo.get_effective_memory_mb()
+    if total_mb - used_mb < settings.CHILD_SLOT_MIN_FREE_MEMORY_MB:
+        logger.info(
+            "Skipping hot spare browser for slot %s: %.0f MB free",
+            slot.index,
+            total_mb - used_mb,
+        )
+        return
+    slot.spare_key = key
+    slot.spare = asyncio.create_task(
+        _launch_spare_browser(slot, task, 1 - slot.browser_lane)
+    )
+
+
+async def _take_spare_browser(slot: ExecutionSlot, task: Task) -> None:
+    """Make the slot's spare its current browser if it suits ``task``."""
+    spare, key = slot.spare, slot.spare_key
+    if spare is None:
+        return
+    if key != _spare_key(task):
+        logger.info("Hot spare for slot %s does not match task; discarding", slot.index)
+        _discard_spare_browser(slot)
+        return
+    slot.spare, slot.spare_key = None, None
+    lane = 1 - slot.browser_lane
+    try:
+        browser = await spare
+    except Exception as e:
+        logger.warning(
+            "Hot spare browser for slot %s failed to start: %s", slot.index, e
+        )
+        return
+    if not await browser.check_browser_alive(timeout=2):
+        logger.info("Hot spare browser for slot %s is not alive", slot.index)
+        _retire_browser(slot, browser, lane)
+        return
+    logger.info("Using hot spare browser for slot %s", slot.index)
+    slot.actual_browser = browser
+    slot.browser_lane = lane
+
+
+async def setup_browser(
+    task: Task, unique_child_arn: str, child_process_id: int, slot: ExecutionSlot
+):
     assert task.automation is not None, f"Task {task.task_id} has no automation"
-    global _global_actual_browser
     system_info = SystemInfo()
     memory_exceeded = (
         system_info.total_system_memory_used / system_info.total_system_memory > 0.6
@@ -133,8 +518,8 @@ async def setup_browser(task: Task, unique_child_arn: str, child_process_id: int
     # Drain any pending restart flag first so it can't leak into a subsequent task
     # if the global browser was already nulled out (e.g. by the outer-finally restart
     # after WORKER_CRASHED / timeout, or by the retry path in _run_attempt).
-    restart_reason = consume_browser_restart_request(child_process_id)
-    if restart_reason and _global_actual_browser is None:
+    restart_reason = consume_browser_restart_request(child_process_id, slot.index)
+    if restart_reason and slot.actual_browser is None:
         logger.info(
             "Discarding stale browser restart request (browser already absent): %s",
             restart_reason[:500],
@@ -148,73 +533,71 @@ async def setup_browser(task: Task, unique_child_arn: str, child_process_id: int
         task.is_dedicated and task.automation.reuse_page_if_already_on_url
     )
 
-    if _global_actual_browser is not None:
-        restart_browser = False
+    if slot.actual_browser is not None:
+        # Why the browser is restarted; the first entry labels the metric.
+        restart_causes: list[str] = []
         if restart_reason:
             logger.info(
                 "Worker requested browser restart before task: %s", restart_reason[:500]
             )
-            restart_browser = True
+            restart_causes.append("restart_flag")
 
-        if not await _global_actual_browser.check_browser_alive(
+        if not await slot.actual_browser.check_browser_alive(
             preserve_page=preserve_page
         ):
             logger.info("CDP is not alive, restarting browser")
-            restart_browser = True
+            restart_causes.append("cdp_unreachable")
 
-        if task.is_dedicated and not restart_browser:
-            if not await _global_actual_browser.check_browser_session_healthy(
+        if task.is_dedicated and not restart_causes:
+            if not await slot.actual_browser.check_browser_session_healthy(
                 preserve_page=preserve_page
             ):
                 logger.info("Dedicated browser session unhealthy, restarting browser")
-                restart_browser = True
+                restart_causes.append("unhealthy")
 
         if memory_exceeded:
             logger.info("Memory exceeded, restarting browser")
-            restart_browser = True
+            restart_causes.append("memory")
 
         if not task.is_dedicated:
             logger.info("Previous browser was not dedicated, restarting browser")
-            restart_browser = True
+            restart_causes.append("non_dedicated")
 
-        if restart_browser:
-            await restart_global_actual_browser(
-                restart_reason or "setup_browser health check"
+        if restart_causes:
+            metrics.inc(metrics.BROWSER_RESTARTS_TOTAL, reason=restart_causes[0])
+            await restart_slot_browser(
+                slot, restart_reason or "setup_browser health check"
             )
 
-    if _global_actual_browser is None:
-        logger.info("Starting new actual browser")
-        _global_actual_browser = ActualBrowser(
-            channel=task.automation.browser_channel,
-            unique_child_arn=unique_child_arn,
-            port=9222 + child_process_id,
-            headless=False,
-            is_dedicated=task.is_dedicated,
-            use_proxy=task.use_proxy,
-            proxy_session_id=task.proxy_session_id(
-                settings.PROXY_PROVIDER if task.use_proxy else None
-            ),
-            os_emulation=task.automation.os_emulation,
-            allow_cookies=task.automation.allow_cookies,
-        )
+    if slot.actual_browser is None:
+        await _take_spare_browser(slot, task)
+
+    if slot.actual_browser is None:
+        logger.info("Starting new actual browser for slot %s", slot.index)
+        if _spare_key(task) is None:
+            # Dedicated profiles must keep living at the historical path.
+            slot.browser_lane = 0
+        await _wait_for_teardown(slot, slot.browser_lane)
+        slot.actual_browser = _new_actual_browser(task, slot, slot.browser_lane)
         try:
-            await _global_actual_browser.start()
+            await slot.actual_browser.start()
         except Exception:
             logger.exception(
                 "Failed to start actual browser; resetting browser instance"
             )
-            _global_actual_browser = None
+            slot.actual_browser = None
             raise
 
+    _schedule_spare_browser(slot, task)
+
 
 async def run_automation_in_process(
-    task: Task, unique_child_arn: str, child_process_id: int
+    task: Task, unique_child_arn: str, child_process_id: int, slot: ExecutionSlot
 ):
-
-    global _global_actual_browser
-
+    _current_log_task_id.set(task.task_id)
     file_handler = logging.FileHandler(str(task.log_file_path))
     file_handler.setLevel(logging.DEBUG)
+    file_handler.addFilter(_TaskLogFilter(task.task_id))
     file_handler.setFormatter(
         logging.Formatter(
             "%(asctime)s [%(levelname)s] %(name)s.%(funcName)s: %(message)s"
@@ -227,45 +610,54 @@ async def run_automation_in_process(
         f"---------- Starting to run automation for task {task.task_id} ----------\n"
     )
     assert task.automation is not None, f"Task {task.task_id} has no automation"
-    worker_path = pathlib.Path(__file__).parent / "worker.py"
     total_attempts = max(1, int(task.automation.max_retries) + 1)
     returncode: int | None = None
 
     async def _run_attempt(attempt_index: int) -> int | None:
-        global _global_actual_browser
         nonlocal returncode
 
         attempts_left = total_attempts - attempt_index
         task.retry_count = attempt_index
 
         log_system_info("Memory info before starting browser")
-        await setup_browser(task, unique_child_arn, child_process_id)
+        setup_start = time.monotonic()
+        await setup_browser(task, unique_child_arn, child_process_id, slot)
+        metrics.observe(metrics.BROWSER_SETUP_SECONDS, time.monotonic() - setup_start)
         log_system_info("Memory info after starting browser")
 
-        if _global_actual_browser is None:
+        if slot.actual_browser is None:
             raise ValueError("Browser is not setup")
-        _cdp_url = _global_actual_browser.cdp_url
+        _cdp_url = slot.actual_browser.cdp_url
         if _cdp_url is None:
             raise ValueError("CDP URL is not setup")
 
         logger.info(
-            f"Starting worker attempt {attempt_index + 1}/{total_attempts} (attempts_left={attempts_left})"
+            f"Starting worker attempt {attempt_index + 1}/{total_attempts} "
+            f"(attempts_left={attempts_left}) on slot {slot.index}"
         )
 
-        proc = await asyncio.create_subprocess_exec(
-            sys.executable,
-            worker_path,
-            task.model_dump_json(),
-            unique_child_arn,
-            str(child_process_id),
-            str(_cdp_url),
-            str(attempts_left),
-            preexec_fn=os.setsid,
-            env={
-                **os.environ,
-                "CHILD_FASTAPI_PORT": str(_child_fastapi_port),
-                "CHILD_PROCESS_ID": str(child_process_id),
+        spawn_start = time.monotonic()
+        if worker_pool is not None:
+            worker = await worker_pool.acquire()
+        else:
+            worker = await spawn_worker(_worker_env())
+        metrics.observe(
+            metrics.WORKER_SPAWN_SECONDS,
+            time.monotonic() - spawn_start,
+            pooled=worker_pool is not None,
+        )
+        attempt_start = time.monotonic()
+        proc = worker.proc
+        wait_for_worker = worker.run_task(
+            task,
+            {
+                "unique_child_arn": unique_child_arn,
+                "child_process_id": child_process_id,
+                "cdp_url": str(_cdp_url),
+                "max_tries": attempts_left,
+                "slot_index": slot.index,
             },
+            on_progress=slot.record_progress,
         )
         running_task_processes[task.task_id] = proc
 
@@ -273,7 +665,7 @@ async def run_automation_in_process(
             try:
                 logger.debug("Waiting for automation to finish")
                 returncode = await asyncio.wait_for(
-                    proc.wait(), timeout=task.max_timeout_in_minutes * 60
+                    wait_for_worker, timeout=task.max_timeout_in_minutes * 60
                 )
                 logger.info(f"Worker finished with return code {returncode}")
             except asyncio.TimeoutError:
@@ -298,6 +690,14 @@ async def run_automation_in_process(
                 returncode = -1
         finally:
             running_task_processes.pop(task.task_id, None)
+            metrics.observe(metrics.ATTEMPT_SECONDS, time.monotonic() - attempt_start)
+            metrics.inc(
+                metrics.ATTEMPT_EXIT_CODES_TOTAL, code=_exit_code_label(returncode)
+            )
+            if worker_pool is not None:
+                await worker_pool.release(worker)
+            else:
+                await worker.kill()
 
         # If the task was cancelled (via /kill_task) while the worker was running,
         # the subprocess has been killed from under us. Report cancellation and
@@ -326,12 +726,13 @@ async def run_automation_in_process(
         await asyncio.sleep(sleep_time)
 
         # Force a browser restart before the next attempt (helps with crashed/poisoned sessions).
-        if _global_actual_browser is not None:
+        if slot.actual_browser is not None:
+            metrics.inc(metrics.BROWSER_RESTARTS_TOTAL, reason="retry")
             try:
-                await _global_actual_browser.stop(graceful=True)
+                await slot.actual_browser.stop(graceful=True)
             except Exception:
                 pass
-            _global_actual_browser = None
+            slot.actual_browser = None
 
         return await _run_attempt(attempt_index + 1)
 
@@ -347,18 +748,29 @@ async def run_automation_in_process(
         if (
             task.is_dedicated
             and returncode in (ExitCodes.WORKER_CRASHED.value, -1)
-            and _global_actual_browser is not None
+            and slot.actual_browser is not None
         ):
             reason = "timeout" if returncode == -1 else "worker crash"
-            await restart_global_actual_browser(
-                f"dedicated browser restart after {reason} on task {task.task_id}"
+            metrics.inc(metrics.BROWSER_RESTARTS_TOTAL, reason=reason.replace(" ", "_"))
+            await restart_slot_browser(
+                slot,
+                f"dedicated browser restart after {reason} on task {task.task_id}",
             )
 
-        if _global_actual_browser is not None and not task.is_dedicated:
+        if (
+            slot.actual_browser is not None
+            and not task.is_dedicated
+            and settings.BROWSER_HOT_SPARE
+        ):
+            # The next task starts on the spare, so nothing waits on this stop.
+            logger.debug("Retiring actual browser in background as not dedicated")
+            _retire_browser(slot, slot.actual_browser, slot.browser_lane)
+            slot.actual_browser = None
+        elif slot.actual_browser is not None and not task.is_dedicated:
             logger.debug("Stopping actual browser as not dedicated")
             try:
-                await _global_actual_browser.stop(graceful=True)
-                _global_actual_browser = None
+                await slot.actual_browser.stop(graceful=True)
+                slot.actual_browser = None
             except Exception as e:
                 logger.error(f"Error stopping actual browser: {e}")
 
@@ -372,14 +784,32 @@ async def run_automation_in_process(
         await delete_local_data(task)
 
 
-async def task_processor():
-    """Background worker that processes tasks from the queue one at a time."""
-    global task_running, last_task_start_time, current_task_timeout_minutes
-    logger.info("Task processor started")
+async def task_processor(slot: ExecutionSlot):
+    """Background worker that processes tasks from the queue one at a time.
+
+    One runs per execution slot; all slots share ``task_queue``.
+    """
+    logger.info("Task processor started for slot %s", slot.index)
 
     while True:
         try:
-            *_, task = await task_queue.get()
+            # Wait for work without holding the lock, then check admission
+            # against a fresh reading; a task that cannot be admitted yet goes
+            # back on the queue (keeping its priority and FIFO position).
+            entry = await task_queue.get()
+            async with _admission_lock:
+                admitted = _can_admit_task(slot)
+                if admitted:
+                    # Reserve the slot before releasing the lock so the next
+                    # admission check already counts this task.
+                    slot.task_running = True
+            if not admitted:
+                task_queue.put_nowait(entry)
+                await asyncio.sleep(settings.CHILD_SLOT_ADMISSION_POLL_SECONDS)
+                continue
+            *_, task = entry
+            if persistent_queue is not None:
+                persistent_queue.remove(task.task_id)
             if task.task_id in tasks_to_kill:
                 logger.info(f"Task {task.task_id} has been killed")
                 tasks_to_kill.remove(task.task_id)
@@ -388,51 +818,41 @@ async def task_processor():
             # Fetch fresh automation from server just before running so any
             # workflow changes after allocation are picked up. Client errors
             # (<500) retry 3x with 3s wait; 5xx / unreachable use up to 4 min
-            # exponential backoff.
-            recording_url = settings.GET_RECORDING_ENDPOINT.format(
-                recording_id=task.recording_id
-            )
-            fetch_url = f"{settings.SERVER_URL.rstrip('/')}/{recording_url}"
-            fetch_success = False
-            response, attempt = await request_with_backoff(
-                fetch_url,
-                headers={"x-api-key": task.api_key},
+            # exponential backoff. A recently validated (or prefetched) copy
+            # skips the request entirely; an older one is revalidated by ETag.
+            cached, attempt = await recording_cache.get(
+                task.recording_id,
+                task.api_key,
                 log_label=f"automation fetch for task {task.task_id}",
             )
-            if response is not None:
-                try:
-                    data = response.json()
-                    task.automation = Automation.model_validate(data["automation"])
-                    # Use recording/workspace callback_url only if no per-task
-                    # override exists on either field (task_callback_url takes
-                    # priority; task.callback_url may have been set via x-callback-url
-                    # header and must not be overwritten).
-                    if (
-                        task.callback_url is None
-                        and not task.task_callback_url
-                        and data.get("callback_url")
-                    ):
-                        from optexity.schema.task import CallbackUrl
-
-                        try:
-                            task.callback_url = CallbackUrl.model_validate(
-                                data["callback_url"]
-                            )
-                        except Exception as cb_err:
-                            logger.warning(
-                                f"Failed to parse callback_url for task "
-                                f"{task.task_id}: {cb_err}"
-                            )
-                    fetch_success = True
-                    logger.info(
-                        f"Fetched fresh automation for task {task.task_id} "
-                        f"(recording {task.recording_id})"
-                    )
-                except Exception as parse_err:
-                    logger.warning(
-                        f"Failed to parse automation response for task "
-                        f"{task.task_id}: {parse_err}"
-                    )
+            _prefetch_wakeup.set()
+            fetch_success = cached is not None
+            if cached is not None:
+                task.automation = cached.automation
+                # Use recording/workspace callback_url only if no per-task
+                # override exists on either field (task_callback_url takes
+                # priority; task.callback_url may have been set via x-callback-url
+                # header and must not be overwritten).
+                if (
+                    task.callback_url is None
+                    and not task.task_callback_url
+                    and cached.callback_url
+                ):
+                    from optexity.schema.task import CallbackUrl
+
+                    try:
+                        task.callback_url = CallbackUrl.model_validate(
+                            cached.callback_url
+                        )
+                    except Exception as cb_err:
+                        logger.warning(
+                            f"Failed to parse callback_url for task "
+                            f"{task.task_id}: {cb_err}"
+                        )
+                logger.info(
+                    f"Fetched fresh automation for task {task.task_id} "
+                    f"(recording {task.recording_id})"
+                )
             if not fetch_success:
                 if task.automation is not None:
                     logger.warning(
@@ -458,20 +878,23 @@ async def task_processor():
                         )
                     continue
 
-            task_running = True
-            last_task_start_time = datetime.now(timezone.utc)
-            current_task_timeout_minutes = task.max_timeout_in_minutes
-            await run_automation_in_process(task, unique_child_arn, child_process_id)
+            if task.allocated_at is not None:
+                metrics.observe(
+                    metrics.QUEUE_WAIT_SECONDS,
+                    (datetime.now(timezone.utc) - task.allocated_at).total_seconds(),
+                )
+            slot.mark_started(task)
+            await run_automation_in_process(
+                task, unique_child_arn, child_process_id, slot
+            )
 
         except asyncio.CancelledError:
-            logger.info("Task processor cancelled")
+            logger.info("Task processor for slot %s cancelled", slot.index)
             break
         except Exception as e:
-            logger.error(f"Error in task processor: {e}")
+            logger.error(f"Error in task processor for slot {slot.index}: {e}")
         finally:
-            task_running = False
-            last_task_start_time = None
-            current_task_timeout_minutes = None
+            slot.mark_idle()
 
 
 async def register_with_master():
@@ -524,11 +947,12 @@ def get_app_with_endpoints(is_aws: bool, child_id: int, port: int = -1):
     global child_process_id, _child_fastapi_port
     child_process_id = child_id
     _child_fastapi_port = port
+    slots[:] = [ExecutionSlot(i) for i in range(settings.CHILD_EXECUTION_SLOTS)]
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        global _global_actual_browser
         """Lifespan context manager for startup and shutdown."""
+        global worker_pool, persistent_queue
         # Startup
 
         if is_aws:
@@ -542,36 +966,85 @@ def get_app_with_endpoints(is_aws: bool, child_id: int, port: int = -1):
         else:
             logger.info("Not running on AWS, skipping master registration")
 
-        asyncio.create_task(task_processor())
-        logger.info("Task processor background task started")
+        if settings.WORKER_POOL_SIZE > 0:
+            worker_pool = WorkerPool(settings.WORKER_POOL_SIZE, _worker_env())
+            worker_pool.start()
+            logger.info(f"Warm worker pool started (size={worker_pool.size})")
+
+        if settings.CHILD_PERSISTENT_QUEUE:
+            persistent_queue = PersistentTaskQueue(
+                Path(settings.CHILD_QUEUE_DIR) / f"task_queue_{child_id}.sqlite3"
+            )
+            _replay_persistent_queue()
+
+        if settings.RECORDING_PREFETCH_DEPTH > 0:
+            asyncio.create_task(recording_prefetcher())
+
+        for slot in slots:
+            asyncio.create_task(task_processor(slot))
+        logger.info(f"Task processor background tasks started ({len(slots)} slot(s))")
         yield
         # Shutdown (if needed in the future)
         logger.info("Shutting down task processor")
 
-        if _global_actual_browser is not None:
-            logger.debug("Stopping actual browser on lifecycle end")
-            await _global_actual_browser.stop(graceful=True)
-            _global_actual_browser = None
-            logger.debug("Actual browser stopped on lifecycle end")
+        for slot in slots:
+            if slot.actual_browser is not None:
+                logger.debug("Stopping actual browser for slot %s", slot.index)
+                await slot.actual_browser.stop(graceful=True)
+                slot.actual_browser = None
+            _discard_spare_browser(slot)
+            for lane in list(slot.teardowns):
+                await _wait_for_teardown(slot, lane)
+        logger.debug("Actual browsers stopped on lifecycle end")
+
+        if worker_pool is not None:
+            await worker_pool.close()
+            worker_pool = None
+
+        if persistent_queue is not None:
+            persistent_queue.close()
+            persistent_queue = None
 
         logger.info("Lifecycle ended")
 
     app = FastAPI(title="Optexity Inference", lifespan=lifespan)
 
     @app.get("/is_task_running", tags=["info"])
-    async def is_task_running():
-        """Is task running endpoint."""
-        return task_running
+    async def is_task_running(per_slot: bool = False):
+        """Is task running endpoint.
+
+        Returns whether any slot is running a task, or each slot's state when
+        ``per_slot`` is set.
+        """
+        if per_slot:
+            return [slot.status() for slot in slots]
+        return any(slot.task_running for slot in slots)
 
     @app.post("/human_in_loop_completed")
     async def human_in_loop_completed_child(body: HumanInLoopCompletedBody = Body(...)):
         """Called by opcloud when the human has finished the HITL step."""
         hitl_completed_tasks.add(body.task_id)
+        event = _hitl_events.get(body.task_id)
+        if event is not None:
+            event.set()
         return JSONResponse({"success": True})
 
     @app.get("/hitl_status")
-    async def hitl_status(task_id: str):
-        """Polled by the worker subprocess every 5 seconds during HITL pause."""
+    async def hitl_status(task_id: str, wait_seconds: float = 0.0):
+        """Asked by the worker subprocess during a HITL pause.
+
+        With ``wait_seconds`` the request is held open until the human completes
+        the step or the wait runs out, so the worker resumes immediately and
+        sends nothing while it waits.
+        """
+        if task_id not in hitl_completed_tasks and wait_seconds > 0:
+            event = _hitl_events.setdefault(task_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), timeout=wait_seconds)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                _hitl_events.pop(task_id, None)
         completed = task_id in hitl_completed_tasks
         if completed:
             hitl_completed_tasks.discard(task_id)
@@ -589,6 +1062,12 @@ def get_app_with_endpoints(is_aws: bool, child_id: int, port: int = -1):
         for task_id in task_ids:
             tasks_to_kill.add(task_id)
             hitl_completed_tasks.discard(task_id)
+            if persistent_queue is not None:
+                persistent_queue.remove(task_id)
+            # Release a pending /hitl_status long-poll; it answers not-completed.
+            hitl_event = _hitl_events.get(task_id)
+            if hitl_event is not None:
+                hitl_event.set()
             proc = running_task_processes.get(task_id)
             if proc is not None and proc.returncode is None:
                 try:
@@ -611,34 +1090,43 @@ def get_app_with_endpoints(is_aws: bool, child_id: int, port: int = -1):
             status_code=200,
         )
 
+    @app.get("/metrics", tags=["info"])
+    async def get_metrics():
+        """Prometheus metrics for this child, including those its workers report."""
+        return PlainTextResponse(
+            metrics.render_latest(), media_type="text/plain; version=0.0.4"
+        )
+
     @app.get("/health", tags=["info"])
     async def health():
         """Health check endpoint.
 
-        Returns 503 if a task has been running longer than its
+        Returns 503 if any slot's task has been running longer than its
         ``max_timeout_in_minutes`` (default 15). Valid long runs stay healthy
         until that task-specific limit.
         """
-        timeout_minutes = current_task_timeout_minutes or 15
-        if (
-            task_running
-            and last_task_start_time is not None
-            and datetime.now(timezone.utc) - last_task_start_time
-            > timedelta(minutes=timeout_minutes)
-        ):
-            return JSONResponse(
-                status_code=503,
-                content={
-                    "status": "unhealthy",
-                    "message": (f"Task not finished within {timeout_minutes} minutes"),
-                },
-            )
+        slot_states = [slot.status() for slot in slots]
+        for slot in slots:
+            if slot.is_overdue():
+                timeout_minutes = slot.timeout_minutes()
+                return JSONResponse(
+                    status_code=503,
+                    content={
+                        "status": "unhealthy",
+                        "message": (
+                            f"Task on slot {slot.index} not finished within "
+                            f"{timeout_minutes} minutes"
+                        ),
+                        "slots": slot_states,
+                    },
+                )
         return JSONResponse(
             status_code=200,
             content={
                 "status": "healthy",
-                "task_running": task_running,
+                "task_running": any(slot.task_running for slot in slots),
                 "queued_tasks": task_queue.qsize(),
+                "slots": slot_states,
             },
         )
 
@@ -656,6 +1144,9 @@ def get_app_with_endpoints(is_aws: bool, child_id: int, port: int = -1):
     @app.post("/allocate_task")
     async def allocate_task(tasks: list[Task] = Body(...)):
         """Bulk allocate tasks onto this child's local priority queue."""
+        rejection = _queue_rejection(len(tasks))
+        if rejection is not None:
+            return rejection
         try:
             for task in tasks:
                 _enqueue_task(task)
@@ -676,6 +1167,9 @@ def get_app_with_endpoints(is_aws: bool, child_id: int, port: int = -1):
 
         @app.post("/inference")
         async def inference(inference_request: InferenceRequest = Body(...)):
+            rejection = _queue_rejection(1)
+            if rejection is not None:
+                return rejection
             response_data: dict | None = None
             try:
                 async with httpx.AsyncClient(timeout=30.0) as client:
@@ -0,0 +1,295 @@
+"""Axtree reduction before index prediction.
+
+``get_index_from_prompt`` used to send ``dom_state.llm_representation()``
+verbatim, which on large portals is tens of thousands of tokens per click. When
+an automation sets ``axtree_reduction``, the serialized tree is parsed back into
+its indentation hierarchy and run through the configured stages before it goes
+into the prompt. Stages only remove (or shorten) lines, never renumber them, so
+an index the LLM returns still addresses the same element in the selector map.
+
+Built-in stages:
+
+- ``region``: keep only the subtrees whose line contains ``region``.
+- ``viewport``: drop elements more than ``viewport_margin`` viewport heights
+  above or below the visible area.
+- ``repeated_rows``: keep the first ``max_repeated_rows`` of a run of
+  same-shaped siblings (table rows, list items).
+- ``relevance``: keep the ``max_elements`` interactive elements that share the
+  most words with the goal.
+- ``attributes``: truncate long attribute values and text.
+
+Elements whose text matches the goal are never dropped by the first four.
+Further stages can be added with ``register_axtree_reducer``.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from optexity.schema.automation import AxtreeReduction
+
+logger = logging.getLogger(__name__)
+
+_ELEMENT_RE = re.compile(r"\[(\d+)\]<([\w-]+)")
+_ATTRIBUTE_NAME_RE = re.compile(r"\s([\w-]+)=")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Words every goal uses that say nothing about which element it means.
+_STOPWORDS = set(
+    "the and for with into from that this then click select enter type button "
+    "field option element page".split()
+)
+
+
+@dataclass
+class AxtreeNode:
+    line: str
+    index: int | None = None
+    tag: str | None = None
+    children: list["AxtreeNode"] = field(default_factory=list)
+
+    def text(self) -> str:
+        """This line plus the text of its non-interactive descendants."""
+        parts = [self.line]
+        for child in self.children:
+            if child.index is None:
+                parts.append(child.text())
+        return " ".join(parts)
+
+    def contains_interactive(self) -> bool:
+        return self.index is not None or any(
+            child.contains_interactive() for child in self.children
+        )
+
+
+@dataclass
+class ReductionContext:
+    goal: str
+    config: AxtreeReduction
+    # index -> browser-use DOM node, for element positions
+    selector_map: dict[int, Any]
+    # visible area in document coordinates: (top, bottom), when known
+    viewport: tuple[float, float] | None = None
+    goal_words: set[str] = field(init=False)
+
+    def __post_init__(self):
+        self.goal_words = _words(self.goal)
+
+    def relevance(self, node: AxtreeNode) -> float:
+        if not self.goal_words:
+            return 0.0
+        return len(self.goal_words & _words(node.text())) / len(self.goal_words)
+
+    def protected(self, node: AxtreeNode) -> bool:
+        return self.relevance(node) >= 0.6
+
+
+AxtreeReducer = Callable[[AxtreeNode, ReductionContext], None]
+
+_reducers: dict[str, AxtreeReducer] = {}
+
+
+def register_axtree_reducer(name: str, reducer: AxtreeReducer) -> None:
+    """Add a stage that can be named in ``AxtreeReduction.stages``. A reducer
+    edits the tree in place and must not change any element's index."""
+    if name in _reducers:
+        raise ValueError(f"axtree reducer {name!r} is already registered")
+    _reducers[name] = reducer
+
+
+def _words(text: str) -> set[str]:
+    return {
+        word
+        for word in _WORD_RE.findall(text.lower())
+        if (len(word) >= 3 or word.isdigit()) and word not in _STOPWORDS
+    }
+
+
+def parse_axtree(axtree: str) -> AxtreeNode:
+    root = AxtreeNode(line="")
+    stack: list[tuple[int, AxtreeNode]] = [(-1, root)]
+    for raw in axtree.splitlines():
+        if not raw.strip():
+            continue
+        content = raw.lstrip("\t")
+        depth = len(raw) - len(content)
+        match = _ELEMENT_RE.search(content)
+        node = AxtreeNode(
+            line=content,
+            index=int(match.group(1)) if match else None,
+            tag=match.group(2) if match else None,
+        )
+        while stack[-1][0] >= depth:
+            stack.pop()
+        stack[-1][1].children.append(node)
+        stack.append((depth, node))
+    return root
+
+
+def render_axtree(root: AxtreeNode) -> str:
+    lines: list[str] = []
+
+    def _render(node: AxtreeNode, depth: int) -> None:
+        lines.append("\t" * depth + node.line)
+        for child in node.children:
+            _render(child, depth + 1)
+
+    for child in root.children:
+        _render(child, 0)
+    return "\n".join(lines)
+
+
+def _drop_elements(root: AxtreeNode, keep: Callable[[AxtreeNode], bool]) -> None:
+    """Remove interactive nodes for which ``keep`` is False. Their text goes with
+    them; interactive descendants that are kept move up to the parent."""
+
+    def _filter(node: AxtreeNode) -> list[AxtreeNode]:
+        children = [kept for child in node.children for kept in _filter(child)]
+        if node.index is None or keep(node):
+            node.children = children
+            return [node]
+        return [child for child in children if child.contains_interactive()]
+
+    root.children = [kept for child in root.children for kept in _filter(child)]
+
+
+def _walk(node: AxtreeNode):
+    for child in node.children:
+        yield child
+        yield from _walk(child)
+
+
+def _reduce_region(root: AxtreeNode, context: ReductionContext) -> None:
+    region = context.config.region
+    if not region:
+        return
+    needle = region.lower()
+    matches: list[AxtreeNode] = []
+
+    def _find(node: AxtreeNode) -> None:
+        for child in node.children:
+            if needle in child.line.lower():
+                matches.append(child)
+            else:
+                _find(child)
+
+    _find(root)
+    if matches:
+        root.children = matches
+    else:
+        logger.debug(f"Axtree region {region!r} not found, keeping the whole tree")
+
+
+def _reduce_viewport(root: AxtreeNode, context: ReductionContext) -> None:
+    if context.viewport is None:
+        return
+    top, bottom = context.viewport
+    margin = (bottom - top) * context.config.viewport_margin
+    top, bottom = top - margin, bottom + margin
+
+    def _keep(node: AxtreeNode) -> bool:
+        element = context.selector_map.get(node.index)
+        rect = getattr(element, "absolute_position", None)
+        if rect is None:
+            return True
+        try:
+            y, height = float(rect.y), float(rect.height)
+        except Exception:
+            return True
+        return (y + height >= top and y <= bottom) or context.protected(node)
+
+    _drop_elements(root, _keep)
+
+
+def _shape(node: AxtreeNode) -> tuple | None:
+    if node.index is None:
+        return None
+    return (node.tag, tuple(sorted(set(_ATTRIBUTE_NAME_RE.findall(node.line)))))
+
+
+def _reduce_repeated_rows(root: AxtreeNode, context: ReductionContext) -> None:
+    limit = context.config.max_repeated_rows
+
+    def _reduce(node: AxtreeNode) -> None:
+        children: list[AxtreeNode] = []
+        run_shape, run_length, omitted = None, 0, 0
+        for child in node.children:
+            shape = _shape(child)
+            if shape is not None and shape == run_shape:
+                run_length += 1
+            else:
+                if omitted:
+                    children.append(AxtreeNode(f"... {omitted} similar rows omitted"))
+                run_shape, run_length, omitted = shape, 1, 0
+            if run_length > limit and not any(
+                context.protected(n) for n in [child, *_walk(child)]
+            ):
+                omitted += 1
+                continue
+            _reduce(child)
+            children.append(child)
+        if omitted:
+            children.append(AxtreeNode(f"... {omitted} similar rows omitted"))
+        node.children = children
+
+    _reduce(root)
+
+
+def _reduce_relevance(root: AxtreeNode, context: ReductionContext) -> None:
+    elements = [node for node in _walk(root) if node.index is not None]
+    if len(elements) <= context.config.max_elements:
+        return
+    # Stable sort: equally relevant elements keep document order.
+    ranked = sorted(elements, key=context.relevance, reverse=True)
+    keep = {id(node) for node in ranked[: context.config.max_elements]}
+    _drop_elements(root, lambda node: id(node) in keep)
+
+
+def _truncate(value: str, limit: int) -> str:
+    return value if len(value) <= limit else value[: limit - 3] + "..."
+
+
+def _reduce_attributes(root: AxtreeNode, context: ReductionContext) -> None:
+    attribute_limit = context.config.max_attribute_length
+    value_re = re.compile(r"=(\S{%d,})" % (attribute_limit + 1))
+    for node in _walk(root):
+        if node.index is not None:
+            node.line = value_re.sub(
+                lambda m: "=" + _truncate(m.group(1), attribute_limit), node.line
+            )
+        else:
+            node.line = _truncate(node.line, context.config.max_text_length)
+
+
+register_axtree_reducer("region", _reduce_region)
+register_axtree_reducer("viewport", _reduce_viewport)
+register_axtree_reducer("repeated_rows", _reduce_repeated_rows)
+register_axtree_reducer("relevance", _reduce_relevance)
+register_axtree_reducer("attributes", _reduce_attributes)
+
+
+def viewport_bounds(browser_state_summary: Any) -> tuple[float, float] | None:
+    """Visible area (top, bottom) in document coordinates, if browser-use
+    reported the page's scroll position."""
+    page_info = getattr(browser_state_summary, "page_info", None)
+    if page_info is None:
+        return None
+    try:
+        top = float(page_info.scroll_y)
+        return top, top + float(page_info.viewport_height)
+    except Exception:
+        return None
+
+
+def reduce_axtree(axtree: str, context: ReductionContext) -> str:
+    root = parse_axtree(axtree)
+    for name in context.config.stages:
+        reducer = _reducers.get(name)
+        if reducer is None:
+            logger.warning(f"Unknown axtree reducer {name!r}, skipping")
+            continue
+        try:
+            reducer(root, context)
+        except Exception as e:
+            logger.warning(f"Axtree reducer {name!r} failed, skipping: {e}")
+    return render_axtree(root)
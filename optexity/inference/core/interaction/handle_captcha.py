@@ -82,11 +82,12 @@ async def _solve_grid(
     # logger.debug(f"Captcha screenshot saved to {screenshot_path}")
 
     # Ask LLM to solve the grid
-    response, token_usage = llm_model.get_model_response_with_structured_output(
+    response, token_usage = await llm_model.aget_model_response_with_structured_output(
         prompt=CAPTCHA_PROMPT,
         response_schema=CaptchaBoxes,
         screenshot=screenshot_b64,
         system_instruction="You are a captcha solver.",
+        agent_name="captcha_solver",
     )
     memory.token_usage += token_usage
 
@@ -171,11 +172,12 @@ async def _solve_and_click(
 
         # Ask LLM if new images appeared after clicking
         refresh_response, token_usage = (
-            llm_model.get_model_response_with_structured_output(
+            await llm_model.aget_model_response_with_structured_output(
                 prompt=CAPTCHA_REFRESH_PROMPT,
                 response_schema=CaptchaRefreshCheck,
                 screenshot=post_click_screenshot_b64,
                 system_instruction="You are a captcha checker.",
+                agent_name="captcha_refresh_check",
             )
         )
         memory.token_usage += token_usage
@@ -7,6 +7,7 @@ from optexity.inference.core.interaction.handle_command import (
 from optexity.inference.core.interaction.utils import (
     LocatorExtraction,
     get_index_from_prompt,
+    settle_index_memo,
     update_screenshot_with_highlight,
 )
 from optexity.inference.infra.browser import Browser
@@ -75,9 +76,12 @@ async def check_element_index(
         await LocatorExtraction.log_interacted_locator(
             browser, index, ".check()", memory
         )
+        await settle_index_memo(memory, succeeded=True)
     except ElementNotFoundInAxtreeException as e:
+        await settle_index_memo(memory, succeeded=False)
         raise e
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in check_element_index: {e}")
         return
 
@@ -139,8 +143,11 @@ async def uncheck_element_index(
         await LocatorExtraction.log_interacted_locator(
             browser, index, ".uncheck()", memory
         )
+        await settle_index_memo(memory, succeeded=True)
     except ElementNotFoundInAxtreeException as e:
+        await settle_index_memo(memory, succeeded=False)
         raise e
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in uncheck_element_index: {e}")
         return
@@ -12,6 +12,7 @@ from optexity.inference.core.interaction.utils import (
     LocatorExtraction,
     get_index_from_prompt,
     handle_download,
+    settle_index_memo,
     update_screenshot_with_highlight,
 )
 from optexity.inference.infra.browser import Browser
@@ -112,12 +113,15 @@ async def click_element_index(
                 index=index,
                 original_error=e,
             )
+        await settle_index_memo(memory, succeeded=True)
     except (
         ElementNotFoundInAxtreeException,
         AxtreeIndexActionFailedException,
         ExpectedDownloadFailedException,
     ):
+        await settle_index_memo(memory, succeeded=False)
         raise
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in click_element_index: {e}")
         return
@@ -10,6 +10,7 @@ from optexity.inference.core.interaction.handle_command import (
 from optexity.inference.core.interaction.utils import (
     LocatorExtraction,
     get_index_from_prompt,
+    settle_index_memo,
     update_screenshot_with_highlight,
 )
 from optexity.inference.infra.browser import Browser
@@ -107,8 +108,11 @@ async def hover_element_index(
                 index=index,
                 original_error=e,
             )
+        await settle_index_memo(memory, succeeded=True)
     except (ElementNotFoundInAxtreeException, AxtreeIndexActionFailedException):
+        await settle_index_memo(memory, succeeded=False)
         raise
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in hover_element_index: {e}")
         return
@@ -14,6 +14,7 @@ from optexity.inference.core.interaction.handle_command import (
 from optexity.inference.core.interaction.utils import (
     LocatorExtraction,
     get_index_from_prompt,
+    settle_index_memo,
     update_screenshot_with_highlight,
 )
 from optexity.inference.infra.browser import Browser
@@ -54,7 +55,7 @@ async def llm_input_text_prediction(
         if memory.browser_states[-1].axtree is None:
             logger.error("Axtree is None, cannot predict action")
             return None
-        final_prompt, response, token_usage = _get_input_text_prediction_agent(
+        final_prompt, response, token_usage = await _get_input_text_prediction_agent(
             task
         ).predict_input_text(
             prompt_instructions,
@@ -174,8 +175,11 @@ async def input_text_index(
                 index=index,
                 original_error=e,
             )
+        await settle_index_memo(memory, succeeded=True)
     except (ElementNotFoundInAxtreeException, AxtreeIndexActionFailedException):
+        await settle_index_memo(memory, succeeded=False)
         raise
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in input_text_index: {e}")
         return
@@ -21,6 +21,7 @@ from optexity.inference.core.interaction.utils import (
     LocatorExtraction,
     get_index_from_prompt,
     handle_download,
+    settle_index_memo,
     update_screenshot_with_highlight,
 )
 from optexity.inference.infra.browser import Browser
@@ -61,7 +62,7 @@ async def llm_select_option_prediction(
         if memory.browser_states[-1].axtree is None:
             logger.error("Axtree is None, cannot predict action")
             return None
-        final_prompt, response, token_usage = _get_select_option_prediction_agent(
+        final_prompt, response, token_usage = await _get_select_option_prediction_agent(
             task
         ).predict_select_option(
             prompt_instructions,
@@ -257,12 +258,15 @@ async def select_option_index(
                 index=index,
                 original_error=e,
             )
+        await settle_index_memo(memory, succeeded=True)
     except (
         ElementNotFoundInAxtreeException,
         AxtreeIndexActionFailedException,
         ExpectedDownloadFailedException,
     ):
+        await settle_index_memo(memory, succeeded=False)
         raise
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in select_option_index: {e}")
         return
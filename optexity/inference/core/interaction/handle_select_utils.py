@@ -31,10 +31,10 @@ class SelectOptionValue(BaseModel):
     label: str
 
 
-def llm_select_match(
+async def llm_select_match(
     options: list[SelectOptionValue], patterns: list[str], memory: Memory, task: Task
 ) -> list[str]:
-    final_prompt, response, token_usage = _get_select_prediction_agent(
+    final_prompt, response, token_usage = await _get_select_prediction_agent(
         task
     ).predict_select_value([o.model_dump() for o in options], patterns)
     memory.token_usage += token_usage
@@ -145,7 +145,7 @@ async def smart_select(
                     matched_values.append(best_value)
 
     if len(matched_values) == 0:
-        matched_values = llm_select_match(options, patterns, memory, task)
+        matched_values = await llm_select_match(options, patterns, memory, task)
 
     if len(matched_values) == 0:
         matched_values = patterns
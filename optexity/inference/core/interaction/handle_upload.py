@@ -12,6 +12,7 @@ from optexity.inference.core.interaction.handle_command import (
 from optexity.inference.core.interaction.utils import (
     LocatorExtraction,
     get_index_from_prompt,
+    settle_index_memo,
     update_screenshot_with_highlight,
 )
 from optexity.inference.infra.browser import Browser
@@ -148,8 +149,11 @@ async def upload_file_index(
             f".set_input_files({upload_file_action.file_path!r})",
             memory,
         )
+        await settle_index_memo(memory, succeeded=True)
     except ElementNotFoundInAxtreeException as e:
+        await settle_index_memo(memory, succeeded=False)
         raise e
     except Exception as e:
+        await settle_index_memo(memory, succeeded=False)
         logger.error(f"Error in upload_file_index: {e}")
         return
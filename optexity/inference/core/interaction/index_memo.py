@@ -0,0 +1,87 @@
+"""Cross-run memo of the element the index predictor picked for a goal.
+
+Axtree indexes are renumbered on every page load, but the element a prompt
+resolves to rarely changes. After the LLM picks an index, the element's
+fingerprint (tag, role, name, test ids and its stable locator candidates, as
+built by ``LocatorExtraction``) is stored under (recording_id, node index,
+goal) once the action on it has succeeded. On later runs
+``get_index_from_prompt`` first looks for that fingerprint in the current DOM
+and only asks the LLM when it does not resolve to exactly one element. A
+memoized element whose action fails is forgotten.
+
+Enabled by setting ``AXTREE_INDEX_MEMO_PATH``; automations opt out with
+``axtree_index_memo=False``.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+
+from optexity.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IndexMemo:
+    def __init__(self, path: Path, ttl_seconds: float):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        # Shared by every worker on the host, like the LLM response cache.
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS index_memo ("
+            "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> dict | None:
+        row = self._conn.execute(
+            "SELECT fingerprint, updated_at FROM index_memo WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        fingerprint, updated_at = row
+        if time.time() - updated_at > self.ttl_seconds:
+            self.forget(key)
+            return None
+        return json.loads(fingerprint)
+
+    def put(self, key: str, fingerprint: dict) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO index_memo (key, fingerprint, updated_at) "
+            "VALUES (?, ?, ?)",
+            (key, json.dumps(fingerprint), time.time()),
+        )
+
+    def forget(self, key: str) -> None:
+        self._conn.execute("DELETE FROM index_memo WHERE key = ?", (key,))
+
+
+_memo: IndexMemo | None = None
+_memo_initialized = False
+
+
+def get_index_memo() -> IndexMemo | None:
+    global _memo, _memo_initialized
+    if not _memo_initialized:
+        _memo_initialized = True
+        if settings.AXTREE_INDEX_MEMO_PATH:
+            try:
+                _memo = IndexMemo(
+                    Path(settings.AXTREE_INDEX_MEMO_PATH),
+                    ttl_seconds=settings.AXTREE_INDEX_MEMO_TTL_SECONDS,
+                )
+            except Exception as e:
+                logger.warning(f"Axtree index memo disabled: {e}")
+    return _memo
+
+
+def index_memo_key(recording_id: str, node: int, goal: str) -> str:
+    payload = json.dumps([recording_id, node, goal])
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -4,6 +4,7 @@ import math
 import os
 import re
 import shutil
+import time
 import uuid
 from pathlib import Path
 from types import SimpleNamespace
@@ -20,6 +21,15 @@ from optexity.exceptions import (
 from optexity.inference.agents.index_prediction.action_prediction_locator_axtree import (
     ActionPredictionLocatorAxtree,
 )
+from optexity.inference.core.interaction.axtree_reduction import (
+    ReductionContext,
+    reduce_axtree,
+    viewport_bounds,
+)
+from optexity.inference.core.interaction.index_memo import (
+    get_index_memo,
+    index_memo_key,
+)
 from optexity.inference.infra.browser import Browser
 from optexity.inference.models import get_llm_model_with_fallback
 from optexity.schema.memory import BrowserState, Memory
@@ -212,6 +222,8 @@ class LocatorExtraction:
     _UUID_RE = re.compile(
         r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
     )
+    # Purpose-built test hooks, in order of preference.
+    _TEST_ID_ATTRS = ("data-testid", "data-test-id", "data-test", "data-cy", "data-qa")
 
     # Pulls the signals build_playwright_locator needs (attributes, tag, implicit
     # role, accessible name, text, xpath) off a live element via Playwright so the
@@ -339,7 +351,7 @@ class LocatorExtraction:
         candidates: list[tuple[int, str, str]] = []
 
         # Purpose-built test hooks: most stable thing a page can expose.
-        for attr in ("data-testid", "data-test-id", "data-test", "data-cy", "data-qa"):
+        for attr in cls._TEST_ID_ATTRS:
             val = (attrs.get(attr) or "").strip()
             if val and not cls._looks_dynamic(val):
                 if attr == "data-testid":
@@ -477,6 +489,46 @@ class LocatorExtraction:
             ]
         return []
 
+    @classmethod
+    def element_fingerprint(cls, element) -> dict | None:
+        """Identity of an element that survives re-renders: tag, role, accessible
+        name, stable test ids and its non-positional locator candidates
+        (best-first). None when only a positional xpath is available, since that
+        says nothing about *which* element it was."""
+        locators = [
+            loc for _, kind, loc in cls._scored_candidates(element) if kind != "xpath"
+        ]
+        if not locators:
+            return None
+        attrs = getattr(element, "attributes", None) or {}
+        ax = getattr(element, "ax_node", None)
+        return {
+            "tag": (getattr(element, "tag_name", "") or "").lower(),
+            "role": (ax.role or "").strip() if ax and ax.role else "",
+            "name": (ax.name or "").strip() if ax and ax.name else "",
+            "test_ids": {
+                attr: attrs[attr].strip()
+                for attr in cls._TEST_ID_ATTRS
+                if (attrs.get(attr) or "").strip()
+                and not cls._looks_dynamic(attrs[attr].strip())
+            },
+            "locators": locators,
+        }
+
+    @classmethod
+    def matches_fingerprint(cls, element, fingerprint: dict) -> bool:
+        """Same tag, role and test ids, and the element still exposes the
+        fingerprint's best locator."""
+        current = cls.element_fingerprint(element)
+        if current is None:
+            return False
+        return (
+            current["tag"] == fingerprint["tag"]
+            and current["role"] == fingerprint["role"]
+            and current["test_ids"] == fingerprint["test_ids"]
+            and fingerprint["locators"][0] in current["locators"]
+        )
+
     @staticmethod
     def record_locator_candidates(
         memory: Memory | None, candidates: list[dict] | None
@@ -540,6 +592,110 @@ def _get_index_prediction_agent(task: "Task") -> ActionPredictionLocatorAxtree:
     return _index_prediction_cache[cache_key]
 
 
+def _index_memo_key(task: Task, memory: Memory, prompt_instructions: str) -> str | None:
+    """The memo key for this step, or None when memoization is off."""
+    if not task.automation.axtree_index_memo or get_index_memo() is None:
+        return None
+    return index_memo_key(
+        task.recording_id, memory.automation_state.step_index, prompt_instructions
+    )
+
+
+async def _memoized_index(
+    memo_key: str, selector_map: dict, browser: Browser
+) -> int | None:
+    """Resolve a memoized fingerprint against the current DOM. Returns the index
+    only when exactly one interactive element matches the fingerprint and its
+    best locator matches exactly one element on the page."""
+    memo = get_index_memo()
+    if memo is None:
+        return None
+    fingerprint = await asyncio.to_thread(memo.get, memo_key)
+    if fingerprint is None:
+        return None
+    matches = [
+        index
+        for index, element in selector_map.items()
+        if LocatorExtraction.matches_fingerprint(element, fingerprint)
+    ]
+    if len(matches) != 1:
+        logger.debug(
+            f"Memoized element matched {len(matches)} axtree elements, asking the LLM"
+        )
+        return None
+    try:
+        locator = await browser.get_locator_from_command(fingerprint["locators"][0])
+        if locator is None or await locator.count() != 1:
+            return None
+    except Exception as e:
+        logger.debug(f"Memoized locator did not resolve: {type(e).__name__}: {e}")
+        return None
+    return matches[0]
+
+
+def _index_fingerprint(selector_map: dict, index: int) -> dict | None:
+    element = selector_map.get(index)
+    if element is None:
+        return None
+    try:
+        return LocatorExtraction.element_fingerprint(element)
+    except Exception as e:
+        logger.warning(f"Failed to fingerprint axtree index {index}: {e}")
+        return None
+
+
+async def settle_index_memo(memory: Memory, succeeded: bool) -> None:
+    """Called by the prompt-based handlers once the action on the index from
+    get_index_from_prompt has run. An LLM pick is memoized only when its action
+    succeeded; a memoized pick whose action failed is forgotten, so the retry
+    and later runs ask the LLM again."""
+    pending, memory.pending_index_memo = memory.pending_index_memo, None
+    memo = get_index_memo()
+    if pending is None or memo is None:
+        return
+    memo_key, fingerprint = pending
+    try:
+        if fingerprint is None:
+            if not succeeded:
+                await asyncio.to_thread(memo.forget, memo_key)
+        elif succeeded:
+            await asyncio.to_thread(memo.put, memo_key, fingerprint)
+    except Exception as e:
+        logger.warning(f"Failed to update the axtree index memo: {e}")
+
+
+def _reduce_axtree_for_prompt(
+    axtree: str,
+    prompt_instructions: str,
+    browser_state_summary,
+    task: Task,
+    memory: Memory,
+) -> str:
+    """Apply the automation's AxtreeReduction and record both sizes on the
+    current browser state. Falls back to the full axtree on error."""
+    start = time.perf_counter()
+    try:
+        reduced = reduce_axtree(
+            axtree,
+            ReductionContext(
+                goal=prompt_instructions,
+                config=task.automation.axtree_reduction,
+                selector_map=browser_state_summary.dom_state.selector_map,
+                viewport=viewport_bounds(browser_state_summary),
+            ),
+        )
+    except Exception as e:
+        logger.warning(f"Axtree reduction failed, sending the full axtree: {e}")
+        return axtree
+    memory.browser_states[-1].axtree_original_size = len(axtree)
+    memory.browser_states[-1].axtree_reduced_size = len(reduced)
+    logger.debug(
+        f"Axtree reduced from {len(axtree)} to {len(reduced)} chars in "
+        f"{(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    return reduced
+
+
 async def get_index_from_prompt(
     memory: Memory, prompt_instructions: str, browser: Browser, task: Task
 ):
@@ -552,16 +708,37 @@ async def get_index_from_prompt(
             remove_empty_nodes=task.automation.remove_empty_nodes_in_axtree
         ),
     )
+    selector_map = browser_state_summary.dom_state.selector_map
+    memory.pending_index_memo = None
 
     try:
         if memory.browser_states[-1].axtree is None:
             logger.error("Axtree is None, cannot predict action")
             return None
-        final_prompt, response, token_usage = _get_index_prediction_agent(
+
+        memo_key = _index_memo_key(task, memory, prompt_instructions)
+        if memo_key is not None:
+            index = await _memoized_index(memo_key, selector_map, browser)
+            if index is not None:
+                logger.info(
+                    f"Resolved '{prompt_instructions}' to index {index} from the index memo"
+                )
+                memory.browser_states[-1].llm_response = {
+                    "index": index,
+                    "source": "index_memo",
+                }
+                memory.pending_index_memo = (memo_key, None)
+                return index
+        axtree = memory.browser_states[-1].axtree
+        if task.automation.axtree_reduction is not None:
+            axtree = _reduce_axtree_for_prompt(
+                axtree, prompt_instructions, browser_state_summary, task, memory
+            )
+        final_prompt, response, token_usage = await _get_index_prediction_agent(
             task
         ).predict_action(
             prompt_instructions,
-            memory.browser_states[-1].axtree,
+            axtree,
             can_return_negative_index=task.version == "v2",
         )
         memory.token_usage += token_usage
@@ -584,6 +761,10 @@ async def get_index_from_prompt(
                 command=prompt_instructions,
             )
 
+        if memo_key is not None:
+            fingerprint = _index_fingerprint(selector_map, response.index)
+            if fingerprint is not None:
+                memory.pending_index_memo = (memo_key, fingerprint)
         return response.index
     except ElementNotFoundInAxtreeException as e:
         raise e
@@ -13,6 +13,8 @@ from urllib.parse import urljoin
 import aiofiles
 import httpx
 
+from optexity.inference import metrics
+from optexity.inference.models.telemetry import drain_llm_call_records
 from optexity.schema.automation import ActionNode, PrivateNode
 from optexity.schema.memory import Memory
 from optexity.schema.task import Task
@@ -247,6 +249,14 @@ async def save_downloads_in_server(task: Task, memory: Memory):
                     )
                     put_response.raise_for_status()
                     uploaded_filenames.append(filename)
+                    metrics.inc(
+                        metrics.UPLOAD_BYTES_TOTAL, len(content), kind="download"
+                    )
+                    metrics.observe(
+                        metrics.UPLOAD_SECONDS,
+                        time.monotonic() - put_start,
+                        kind="download",
+                    )
                     logger.info(
                         f"[save_downloads_in_server] task={task.task_id} "
                         f"uploaded {filename!r} ({len(content)} bytes) in "
@@ -352,6 +362,12 @@ async def save_trajectory_in_server(task: Task):
 
             response.raise_for_status()
             response_json = response.json()
+            metrics.inc(metrics.UPLOAD_BYTES_TOTAL, tar_size, kind="trajectory")
+            metrics.observe(
+                metrics.UPLOAD_SECONDS,
+                time.monotonic() - upload_start,
+                kind="trajectory",
+            )
             logger.info(
                 f"[save_trajectory_in_server] task={task.task_id} "
                 f"upload succeeded in {time.monotonic() - upload_start:.2f}s, "
@@ -542,6 +558,7 @@ async def save_latest_memory_state_locally(
                 downloaded_file.name for downloaded_file in memory.downloads
             ],
             "token_usage": memory.token_usage.model_dump(),
+            "resource_policy_stats": memory.resource_policy_stats.model_dump(),
             "unique_child_arn": memory.unique_child_arn,
             "system_info": browser_state.system_info.model_dump(mode="json"),
         }
@@ -557,6 +574,18 @@ async def save_latest_memory_state_locally(
             async with aiofiles.open(step_directory / "final_prompt.txt", "w") as f:
                 await f.write(browser_state.final_prompt)
 
+        llm_calls = [
+            record.model_dump(mode="json") for record in drain_llm_call_records()
+        ]
+        if llm_calls:
+            # Retries of a step share its directory, so keep earlier tries' calls.
+            llm_calls_path = step_directory / "llm_calls.json"
+            if llm_calls_path.exists():
+                async with aiofiles.open(llm_calls_path) as f:
+                    llm_calls = json.loads(await f.read()) + llm_calls
+            async with aiofiles.open(llm_calls_path, "w") as f:
+                await f.write(json.dumps(llm_calls, indent=4))
+
         if browser_state.llm_response:
             async with aiofiles.open(step_directory / "llm_response.json", "w") as f:
                 await f.write(json.dumps(browser_state.llm_response, indent=4))
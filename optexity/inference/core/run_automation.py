@@ -52,6 +52,9 @@ from optexity.inference.core.script_context import ScriptContext
 from optexity.inference.core.variable_resolver import resolve_api_variables_in_node
 from optexity.inference.infra.browser import Browser
 from optexity.inference.models import normalize_model
+from optexity.inference.models.response_cache import set_response_cache_enabled
+from optexity.inference.models.telemetry import start_llm_call_log
+from optexity.inference.worker_channel import report_progress
 from optexity.private_nodes import HandlerRegistry
 from optexity.schema.actions.interaction_action import DownloadUrlAsPdfAction
 from optexity.schema.automation import (
@@ -135,6 +138,7 @@ async def run_automation(
     child_process_id: int,
     cdp_url: str,
     max_tries: int = 1,
+    slot_index: int = 0,
 ):
     assert task.automation is not None, f"Task {task.task_id} has no automation"
     file_handler = logging.FileHandler(str(task.log_file_path))
@@ -145,6 +149,9 @@ async def run_automation(
     logging.getLogger("browser_use").setLevel(logging.INFO)
 
     logger.info(f"Task {task.task_id} started running")
+    report_progress(task.task_id, "running")
+    set_response_cache_enabled(task.automation.llm_response_cache)
+    start_llm_call_log()
     memory = None
     browser = None
     in_browser_setup = False
@@ -162,6 +169,9 @@ async def run_automation(
                 memory=memory,
                 cdp_url=cdp_url,
                 llm_model=normalize_model(task.llm_provider, task.llm_model_name),
+                slot_index=slot_index,
+                network_capture=task.automation.network_capture,
+                resource_policy=task.automation.resource_policy,
             )
 
         browser = _get_browser()
@@ -257,7 +267,7 @@ async def run_automation(
                 if is_browser_setup_failure
                 else "browser session poisoned"
             )
-            request_browser_restart(child_process_id, f"{reason}: {e}")
+            request_browser_restart(child_process_id, f"{reason}: {e}", slot_index)
         logger.error(f"Error running automation: {traceback.format_exc()}")
         task.error = str(e)
         task.status = "failed"
@@ -279,6 +289,7 @@ async def run_automation(
                 logger.error(f"Error/timeout stopping browser after automation: {e}")
 
     logger.info(f"Task {task.task_id} completed with status {task.status}")
+    report_progress(task.task_id, task.status)
     file_handler.flush()
     file_handler.close()
     logging.getLogger(current_module).removeHandler(file_handler)
@@ -422,6 +433,7 @@ async def run_action_node(
 
     memory.automation_state.step_index += 1
     memory.automation_state.try_index = 0
+    report_progress(task.task_id, task.status, memory.automation_state.step_index)
 
     await action_node.replace_variables(task.input_parameters)
     await action_node.replace_variables(
@@ -502,7 +514,9 @@ async def run_action_node(
                 f"No new tab found after {action_node.max_new_tab_wait_time} seconds, even though expect_new_tab is True"
             )
         else:
-            logger.debug(f"Switched to new tab after {total_time} seconds, as expected")
+            logger.debug(
+                f"Switched to new tab after {total_time:.2f} seconds, as expected"
+            )
 
     else:
         await sleep_for_page_to_load(browser, action_node.end_sleep_time)
@@ -546,6 +560,7 @@ async def run_private_node(
 
     memory.automation_state.step_index += 1
     memory.automation_state.try_index = 0
+    report_progress(task.task_id, task.status, memory.automation_state.step_index)
 
     await private_node.replace_variables(task.input_parameters)
     await private_node.replace_variables(
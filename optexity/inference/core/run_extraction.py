@@ -12,6 +12,7 @@ from optexity.inference.core.script_context import ScriptContext, call_script_fn
 from optexity.inference.infra.browser import Browser
 from optexity.inference.infra.browser_health import fetch_browser_state_for_classifier
 from optexity.inference.models import get_llm_model_with_fallback
+from optexity.inference.models.pdf_input import extract_text_layer, write_page_subset
 from optexity.schema.actions.extraction_action import (
     APICallExtraction,
     ExtractionAction,
@@ -277,11 +278,15 @@ async def handle_llm_extraction(
     [/INPUT]
     """
 
-        response, token_usage = llm_model.get_model_response_with_structured_output(
-            prompt=prompt,
-            response_schema=llm_extraction.build_model(),
-            screenshot=screenshot,
-            system_instruction=system_instruction,
+        response, token_usage = (
+            await llm_model.aget_model_response_with_structured_output(
+                prompt=prompt,
+                response_schema=llm_extraction.build_model(),
+                screenshot=screenshot,
+                system_instruction=system_instruction,
+                agent_name="llm_extraction",
+                axtree=axtree,
+            )
         )
         response_dict = response.model_dump()
         memory.token_usage += token_usage
@@ -315,7 +320,7 @@ async def handle_llm_extraction(
 
         axtree_for_classifier = memory.browser_states[-1].axtree or ""
         shot = memory.browser_states[-1].screenshot
-        _, eh_response, eh_usage = _get_error_handler(task).classify_error(
+        _, eh_response, eh_usage = await _get_error_handler(task).classify_error(
             llm_extraction.extraction_instructions,
             axtree_for_classifier,
             shot,
@@ -465,13 +470,25 @@ async def handle_network_call_extraction(
     unique_identifier: str | None = None,
 ):
 
-    for network_call in browser.network_calls:
-        if network_call_extraction.url_pattern not in network_call.url:
-            continue
+    capture = browser.network_capture
+    if network_call_extraction.wait_timeout_seconds is not None:
+        await capture.wait_for_response(
+            network_call_extraction.url_pattern,
+            network_call_extraction.method,
+            network_call_extraction.status,
+            timeout=network_call_extraction.wait_timeout_seconds,
+        )
 
+    for entry in capture.query(
+        network_call_extraction.url_pattern,
+        network_call_extraction.method,
+        network_call_extraction.status,
+    ):
+        network_call = entry.call
         if network_call_extraction.download_from == "request" and isinstance(
             network_call, NetworkRequest
         ):
+            await capture.resolve_request(entry)
             await download_request(
                 network_call, network_call_extraction.download_filename, task, memory
             )
@@ -483,6 +500,7 @@ async def handle_network_call_extraction(
             network_call_extraction.extract_from == "response"
             and isinstance(network_call, NetworkResponse)
         ):
+            await capture.complete(entry)
             memory.variables.output_data.append(
                 OutputData(
                     unique_identifier=unique_identifier,
@@ -598,12 +616,43 @@ async def handle_pdf_extraction(
     llm_model = get_llm_model_with_fallback(provider, model_name_str, True)
 
     system_instruction = "Extract the information from the PDF file and return it in the format specified by the instructions."
-    response, token_usage = llm_model.get_model_response_with_structured_output(
-        prompt=pdf_extraction.extraction_instructions,
-        response_schema=pdf_extraction.build_model(),
-        pdf_url=pdf_file,
-        system_instruction=system_instruction,
-    )
+    prompt = pdf_extraction.extraction_instructions
+    pdf_url = pdf_file
+    text_layer = None
+    if pdf_extraction.use_text_layer:
+        text_layer = await asyncio.to_thread(
+            extract_text_layer, pdf_file, pdf_extraction.pages
+        )
+    if text_layer is not None:
+        # Text is a fraction of the tokens of the rendered file.
+        logger.info(f"Extracting from the text layer of {pdf_file.name}")
+        pages_text = "\n".join(
+            f"--- Page {page} ---\n{text}" for page, text in text_layer
+        )
+        prompt = f"{prompt}\n\n[PDF TEXT]\n{pages_text}\n[/PDF TEXT]"
+        pdf_url = None
+
+    subset = None
+    if text_layer is None and pdf_extraction.pages:
+        subset = await asyncio.to_thread(
+            write_page_subset, pdf_file, pdf_extraction.pages
+        )
+        if subset is not None:
+            pdf_url = subset
+
+    try:
+        response, token_usage = (
+            await llm_model.aget_model_response_with_structured_output(
+                prompt=prompt,
+                response_schema=pdf_extraction.build_model(),
+                pdf_url=pdf_url,
+                system_instruction=system_instruction,
+                agent_name="pdf_extraction",
+            )
+        )
+    finally:
+        if subset is not None:
+            subset.unlink(missing_ok=True)
     response_dict = response.model_dump()
     output_data = OutputData(
         unique_identifier=str(pdf_file.name), json_data=response_dict
@@ -23,8 +23,8 @@ async def run_human_in_loop_action(
     Pause the automation for human takeover.
 
     1. Notifies opcloud (which emails the task owner a link to the live stream).
-    2. Polls child_process.py's /hitl_status endpoint every 2 seconds until
-       the human signals completion or max_wait_time elapses.
+    2. Long-polls child_process.py's /hitl_status endpoint, which answers as
+       soon as the human signals completion or the wait runs out.
     3. Raises HumanInLoopTimeoutException if no completion signal arrives in
        time (the caller's retry/fail logic then handles the task outcome).
     """
@@ -35,26 +35,30 @@ async def run_human_in_loop_action(
     )
     status_url = f"http://localhost:{child_fastapi_port}/hitl_status"
 
-    elapsed = 0.0
-    interval = 2.0
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + human_in_loop_action.max_wait_time
+    started = loop.time()
     async with httpx.AsyncClient(timeout=5.0) as client:
-        while elapsed < human_in_loop_action.max_wait_time:
+        while (remaining := deadline - loop.time()) > 0:
             try:
-                resp = await client.get(status_url, params={"task_id": task.task_id})
+                resp = await client.get(
+                    status_url,
+                    params={"task_id": task.task_id, "wait_seconds": remaining},
+                    timeout=remaining + 5.0,
+                )
                 if resp.json().get("completed"):
                     logger.info(
                         "HITL completed for task %s after %.0f s",
                         task.task_id,
-                        elapsed,
+                        loop.time() - started,
                     )
                     return
             except Exception as e:
                 logger.warning(
                     "HITL status poll error for task %s: %s", task.task_id, e
                 )
-
-            await asyncio.sleep(interval)
-            elapsed += interval
+                # Don't spin on a parent that is refusing connections.
+                await asyncio.sleep(min(2.0, max(0.0, deadline - loop.time())))
 
     raise HumanInLoopTimeoutException(
         f"Human-in-loop timeout: no completion signal received after "
@@ -380,7 +380,9 @@ async def handle_assert_locator_presence_error(
             )
             raise error
 
-        final_prompt, response, token_usage = _get_error_handler(task).classify_error(
+        final_prompt, response, token_usage = await _get_error_handler(
+            task
+        ).classify_error(
             error.command,
             memory.browser_states[-1].axtree,
             memory.browser_states[-1].screenshot,
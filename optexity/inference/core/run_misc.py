@@ -115,10 +115,13 @@ async def run_llm_query_action(
         raise
 
     try:
-        response, token_usage = llm_model.get_model_response_with_structured_output(
-            prompt=llm_query_action.prompt_instructions,
-            response_schema=llm_query_action.build_model(),
-            system_instruction=system_instruction,
+        response, token_usage = (
+            await llm_model.aget_model_response_with_structured_output(
+                prompt=llm_query_action.prompt_instructions,
+                response_schema=llm_query_action.build_model(),
+                system_instruction=system_instruction,
+                agent_name="llm_query",
+            )
         )
     except Exception as e:
         logger.error(
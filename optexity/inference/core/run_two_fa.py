@@ -59,9 +59,9 @@ async def run_two_fa_action(two_fa_action: TwoFAAction, memory: Memory, task: Ta
             two_fa_action.end_2fa_time_offset_minutes,
         )
         if messages and len(messages) > 0:
-            final_prompt, response, token_usage = _get_two_fa_agent(task).extract_code(
-                two_fa_action.instructions, messages
-            )
+            final_prompt, response, token_usage = await _get_two_fa_agent(
+                task
+            ).extract_code(two_fa_action.instructions, messages)
             memory.token_usage += token_usage
             code = None
             if response.code is not None:
@@ -7,11 +7,19 @@ import platform
 import shutil
 import signal
 import time
+import uuid
 from typing import Literal
 
 import aiohttp
 from playwright.async_api import ProxySettings
 
+from optexity.inference.infra.profile_template import (
+    TEMPLATE_ROOT,
+    clone_profile,
+    profile_template_dir,
+    profile_template_key,
+    publish_profile_template,
+)
 from optexity.inference.infra.utils import _download_extension, _extract_extension
 from optexity.utils.settings import settings
 
@@ -22,6 +30,17 @@ DISPLAY = os.environ.get("DISPLAY", ":99")
 IN_DOCKER = os.path.exists("/.dockerenv")
 
 
+def temp_downloads_dir_for(slot_index: int = 0) -> str:
+    """Chrome's download/print directory for an execution slot.
+
+    Each slot gets its own so concurrent tasks in one child never pick up each
+    other's files; slot 0 keeps the historical path.
+    """
+    if slot_index == 0:
+        return "/tmp/temp_downloads"
+    return f"/tmp/temp_downloads_{slot_index}"
+
+
 def find_chrome_binary(channel: Literal["chrome", "chromium"]) -> str:
     system = platform.system()
 
@@ -87,15 +106,25 @@ class ActualBrowser:
         proxy_session_id: str | None = None,
         os_emulation: OsEmulation = None,
         allow_cookies: bool = False,
+        slot_index: int = 0,
+        user_data_suffix: str = "",
     ):
         # self.chrome_path = find_chrome_binary(channel)
         self.user_data_dir = f"/tmp/userdata_{unique_child_arn}"
+        if slot_index > 0:
+            self.user_data_dir += f"_slot{slot_index}"
+        # A hot spare runs next to the slot's current browser, so it needs a
+        # profile directory of its own.
+        self.user_data_dir += user_data_suffix
+        self.slot_index = slot_index
+        self.temp_downloads_dir = temp_downloads_dir_for(slot_index)
         self.port = port
         self.headless = headless
         self.is_dedicated = is_dedicated
         self.use_proxy = use_proxy
         self.proxy_session_id = proxy_session_id
         self.os_emulation = os_emulation
+        self._baking_profile_template = False
         self.playwright = None
         self.context = None
         self.proc = None
@@ -150,7 +179,7 @@ class ActualBrowser:
         except Exception:
             existing = {}
 
-        download_dir = "/tmp/temp_downloads"
+        download_dir = self.temp_downloads_dir
         os.makedirs(download_dir, exist_ok=True)
 
         app_state = json.dumps(
@@ -176,6 +205,72 @@ class ActualBrowser:
             f"Seeded print prefs at {prefs_path} -> save PDFs to {download_dir}"
         )
 
+    async def _prepare_user_data_dir(self) -> None:
+        """Materialize the profile a launch starts from, then seed print prefs.
+
+        With BROWSER_PROFILE_TEMPLATES a non-dedicated browser starts from a
+        clone of the baked template for its launch options instead of an empty
+        directory; dedicated profiles are never touched.
+        """
+        if (
+            settings.BROWSER_PROFILE_TEMPLATES
+            and not self.is_dedicated
+            and not self._baking_profile_template
+        ):
+            template_dir = await self._get_profile_template()
+            if template_dir is not None:
+                try:
+                    clone_profile(template_dir, self.user_data_dir)
+                except Exception as e:
+                    logger.warning(f"Failed to clone profile template: {e}")
+                    shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+        self._seed_print_preferences()
+
+    async def _get_profile_template(self) -> pathlib.Path | None:
+        key = profile_template_key(
+            "playwright" if settings.USE_PLAYWRIGHT_BROWSER else "native",
+            self.channel,
+            [ext["id"] for ext in self.extensions],
+            self.os_emulation,
+        )
+        template_dir = profile_template_dir(key)
+        if template_dir.exists():
+            return template_dir
+
+        try:
+            await self._bake_profile_template(template_dir)
+        except Exception as e:
+            logger.warning(f"Failed to bake profile template {template_dir}: {e}")
+            return None
+        return template_dir if template_dir.exists() else None
+
+    async def _bake_profile_template(self, template_dir: pathlib.Path) -> None:
+        """Boot this browser once on a scratch profile and keep the result.
+
+        Runs before this browser's real launch, on the same port, so it costs
+        one extra cold start the first time a key is seen in this container.
+        """
+        TEMPLATE_ROOT.mkdir(parents=True, exist_ok=True)
+        staging_dir = TEMPLATE_ROOT / f"{template_dir.name}.staging-{uuid.uuid4().hex}"
+        logger.info(f"Baking browser profile template {template_dir}")
+        user_data_dir = self.user_data_dir
+        self.user_data_dir = str(staging_dir)
+        self._baking_profile_template = True
+        try:
+            if settings.USE_PLAYWRIGHT_BROWSER:
+                await self.start_playwright_browser()
+                await self.stop_playwright_browser(graceful=True)
+            else:
+                await self.start_native_browser()
+                await self.stop_native_browser(graceful=True)
+            publish_profile_template(staging_dir, template_dir)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self.user_data_dir = user_data_dir
+            self._baking_profile_template = False
+            self.cdp_url = None
+
     def get_args(self) -> list[str]:
         args = [
             # ---- security / isolation (Playwright parity)
@@ -274,7 +369,7 @@ class ActualBrowser:
             if not self.is_dedicated:
                 shutil.rmtree(self.user_data_dir, ignore_errors=True)
 
-            self._seed_print_preferences()
+            await self._prepare_user_data_dir()
 
             self.chrome_path = find_chrome_binary(self.channel)
             env = {**os.environ, "DISPLAY": DISPLAY}
@@ -322,7 +417,7 @@ class ActualBrowser:
                     )
 
                 env = {**os.environ, "DISPLAY": DISPLAY}
-                self._seed_print_preferences()
+                await self._prepare_user_data_dir()
                 self.context = await launch_persistent_context_async(
                     # humanize=True,
                     channel=self.channel,
@@ -1,6 +1,5 @@
 import asyncio
 import base64
-import json
 import logging
 import os
 import re
@@ -16,7 +15,11 @@ from patchright._impl._errors import TimeoutError as PatchrightTimeoutError
 from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import Download, Locator, Page, Request, Response
 
+from optexity.inference.infra.actual_browser import temp_downloads_dir_for
+from optexity.inference.infra.network_capture import NetworkCaptureStore
+from optexity.inference.infra.resource_policy import ResourcePolicyEnforcer
 from optexity.inference.models.chat_litellm import build_agent_llm
+from optexity.schema.automation import NetworkCapture, ResourcePolicy
 from optexity.schema.memory import Memory, NetworkRequest, NetworkResponse
 from optexity.utils.settings import settings
 
@@ -31,6 +34,9 @@ class Browser:
         stealth: bool = True,
         backend: Literal["browser-use", "browserbase"] = "browser-use",
         llm_model: str | None = None,
+        slot_index: int = 0,
+        network_capture: NetworkCapture | None = None,
+        resource_policy: ResourcePolicy | None = None,
     ):
 
         self.stealth = stealth
@@ -54,12 +60,19 @@ class Browser:
         self.memory = memory
         self.page_to_target_id = []
         self.previous_total_pages = 0
+        # Set when a page target appears, so handle_new_tabs wakes immediately.
+        self.new_page_event = asyncio.Event()
         self.active_downloads = 0
         self.all_active_downloads_done = asyncio.Event()
         self.all_active_downloads_done.set()
 
-        self.network_calls: list[NetworkResponse | NetworkRequest] = []
-        self.temp_downloads_dir = f"/tmp/temp_downloads"
+        self.network_capture = NetworkCaptureStore(network_capture)
+        self.resource_policy = (
+            ResourcePolicyEnforcer(resource_policy, memory.resource_policy_stats)
+            if resource_policy is not None
+            else None
+        )
+        self.temp_downloads_dir = temp_downloads_dir_for(slot_index)
         self._download_cdp_session = None
 
     async def start(self):
@@ -99,6 +112,19 @@ class Browser:
                 lambda dialog: asyncio.create_task(_safe_handle_dialog(dialog)),
             )
 
+            if self.resource_policy is not None:
+                context = self.context
+                for page in context.pages:
+                    await self.resource_policy.attach(context, page)
+                context.on(
+                    "page",
+                    lambda p: asyncio.create_task(
+                        self.resource_policy.attach(context, p)
+                    ),
+                )
+
+            self.network_capture.cookie_source = self.context.cookies
+            self.context.on("page", lambda p: self.new_page_event.set())
             self.context.on("request", lambda req: self.log_request(req))
             self.context.on("response", lambda resp: self.log_response(resp))
             self.context.on(
@@ -141,6 +167,20 @@ class Browser:
             )
             logger.info(f"CDP download behavior set to: {self.temp_downloads_dir}")
 
+            # Target.targetCreated fires as soon as a tab opens, before
+            # Playwright has attached it and emitted the context "page" event.
+            self._download_cdp_session.on(
+                "Target.targetCreated",
+                lambda params: (
+                    self.new_page_event.set()
+                    if params.get("targetInfo", {}).get("type") == "page"
+                    else None
+                ),
+            )
+            await self._download_cdp_session.send(
+                "Target.setDiscoverTargets", {"discover": True}
+            )
+
             tabs = await self.backend_agent.browser_session.get_tabs()
 
             for tab in tabs[::-1]:
@@ -207,13 +247,23 @@ class Browser:
         if self.context is None or self.backend_agent is None:
             return False, 0
 
-        total_time = 0
-        while total_time < max_wait_time:
-            pages = self.context.pages
-            if len(pages) > self.previous_total_pages:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while len(self.context.pages) <= self.previous_total_pages:
+            remaining = max_wait_time - (loop.time() - start)
+            if remaining <= 0:
+                break
+            self.new_page_event.clear()
+            # A page may have been attached between the check and the clear.
+            if len(self.context.pages) > self.previous_total_pages:
+                break
+            try:
+                # After a Target.targetCreated this loops once more until
+                # Playwright lists the page.
+                await asyncio.wait_for(self.new_page_event.wait(), remaining)
+            except asyncio.TimeoutError:
                 break
-            await asyncio.sleep(1)
-            total_time += 1
+        total_time = loop.time() - start
 
         pages = self.context.pages
         if len(pages) == self.previous_total_pages:
@@ -405,23 +455,21 @@ class Browser:
             self.all_active_downloads_done.set()
 
     async def log_request(self, req: Request):
+        if not self.network_capture.wants_url(req.url):
+            return
         try:
-            body = req.post_data  # this is None for GET/HEAD
-            # Rebuild cookies exactly like curl -b
-            cookies = await req.frame.page.context.cookies()
-            cookie_header = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
-
-            # Rebuild headers
+            # The cookie header is added when the request is consumed
+            # (NetworkCaptureStore.resolve_request), not for every request.
             headers = dict(req.headers)
-            headers["cookie"] = cookie_header
 
-            # Body as raw bytes
+            # Body as raw bytes (None for GET/HEAD)
             body = req.post_data
 
-            self.network_calls.append(
+            self.network_capture.add_request(
                 NetworkRequest(
                     url=req.url, method=req.method, headers=headers, body=body
-                )
+                ),
+                req,
             )
 
         except Exception as e:
@@ -429,45 +477,28 @@ class Browser:
             pass
 
     async def log_response(self, response: Response):
-        try:
-            body = await response.json()
-        except Exception:
-            try:
-                body = await response.text()
-            except Exception:
-                body = None
-
-        # Try to enrich response with request method and content length
+        """Records metadata only; bodies are loaded when an extraction reads
+        them (see NetworkCaptureStore.load_body)."""
+        self.network_capture.invalidate_cookies()
+        if not self.network_capture.wants_url(response.url):
+            return
         method = None
         try:
             # Playwright provides request object for a response
             method = response.request.method
         except Exception:
             pass
-
-        content_length = 0
         try:
-            if body is not None:
-                if isinstance(body, (str, bytes)):
-                    content_length = len(body)
-                elif isinstance(body, dict):
-                    content_length = len(json.dumps(body))
-        except Exception:
-            pass
+            self.network_capture.add_response(response, method)
+        except Exception as e:
+            logger.debug(f"Could not record response {response.url}: {e}")
 
-        self.network_calls.append(
-            NetworkResponse(
-                url=response.url,
-                method=method,
-                status=response.status,
-                headers=response.headers,
-                body=body,
-                content_length=content_length,
-            )
-        )
+    @property
+    def network_calls(self) -> list[NetworkResponse | NetworkRequest]:
+        return self.network_capture.calls()
 
     async def clear_network_calls(self):
-        self.network_calls.clear()
+        self.network_capture.clear()
 
     async def get_screenshot(self, full_page: bool = False) -> str | None:
         try:
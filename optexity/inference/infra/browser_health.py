@@ -48,32 +48,51 @@ def get_child_process_id_from_env() -> int | None:
         return None
 
 
-def get_browser_restart_flag_path(child_process_id: int) -> Path:
-    return Path(f"/tmp/optexity_browser_restart_{child_process_id}")
+def get_slot_index_from_env() -> int:
+    val = os.environ.get("CHILD_SLOT_INDEX")
+    if val is None:
+        return 0
+    try:
+        return int(val)
+    except ValueError:
+        return 0
 
 
-def request_browser_restart(child_process_id: int, reason: str) -> None:
+def get_browser_restart_flag_path(child_process_id: int, slot_index: int = 0) -> Path:
+    # Slot 0 keeps the historical path so a single-slot child is unchanged.
+    if slot_index == 0:
+        return Path(f"/tmp/optexity_browser_restart_{child_process_id}")
+    return Path(f"/tmp/optexity_browser_restart_{child_process_id}_{slot_index}")
+
+
+def request_browser_restart(
+    child_process_id: int, reason: str, slot_index: int = 0
+) -> None:
     # Best-effort signal to the parent; a write failure must never propagate and
     # mask the caller's original error (e.g. inside an except handler).
-    path = get_browser_restart_flag_path(child_process_id)
+    path = get_browser_restart_flag_path(child_process_id, slot_index)
     try:
         path.write_text(reason[:2000])
     except Exception as e:
         logger.warning(
-            "Failed to write browser restart flag (child_process_id=%s): %s",
+            "Failed to write browser restart flag (child_process_id=%s, slot=%s): %s",
             child_process_id,
+            slot_index,
             e,
         )
         return
     logger.warning(
-        "Requested dedicated browser restart (child_process_id=%s): %s",
+        "Requested dedicated browser restart (child_process_id=%s, slot=%s): %s",
         child_process_id,
+        slot_index,
         reason[:500],
     )
 
 
-def consume_browser_restart_request(child_process_id: int) -> str | None:
-    path = get_browser_restart_flag_path(child_process_id)
+def consume_browser_restart_request(
+    child_process_id: int, slot_index: int = 0
+) -> str | None:
+    path = get_browser_restart_flag_path(child_process_id, slot_index)
     if not path.is_file():
         return None
     try:
@@ -123,5 +142,5 @@ async def fetch_browser_state_for_classifier(
             exc_info=True,
         )
         if child_process_id is not None and is_browser_session_poisoned_error(e):
-            request_browser_restart(child_process_id, str(e))
+            request_browser_restart(child_process_id, str(e), get_slot_index_from_env())
         return None
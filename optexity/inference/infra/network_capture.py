@@ -0,0 +1,302 @@
+"""Bounded store for the network traffic a Browser observes.
+
+Every request and response in the context used to be appended to an unbounded
+list, and each response's body was awaited (one CDP round trip, plus the body
+held in memory) whether or not anything read it. Now only metadata is recorded
+as traffic arrives:
+
+- entries outside the automation's ``network_capture`` URL and content-type
+  filters are skipped;
+- the store is a ring buffer capped by entry count and by the bytes it holds,
+  evicting the oldest entries first;
+- a response body is fetched from the browser only when an extraction asks
+  for it (``load_body``), and then counts towards the byte cap;
+- a request's curl-style cookie header is added only when the request is
+  consumed (``resolve_request``), from a cookie-jar snapshot shared by every
+  request consumed until the next response arrives (which may have set
+  cookies, and which every navigation produces).
+
+A body can only be fetched while the browser still holds it, which is the case
+for the calls of the current step that extractions read.
+
+Extractions look calls up with ``query`` rather than scanning the buffer: each
+URL pattern that has been queried keeps its own list of matching entries,
+updated as traffic arrives, and method/status filters run on that subset.
+Requests are paired with their responses, and ``wait_for_response`` resolves
+as soon as a matching response is captured.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from playwright.async_api import Request, Response
+
+from optexity.schema.automation import NetworkCapture
+from optexity.schema.memory import NetworkRequest, NetworkResponse
+from optexity.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CapturedCall:
+    call: NetworkRequest | NetworkResponse
+    # The live response, until its body has been loaded.
+    source: Response | None = None
+    size: int = 0
+    # A request whose cookie header has not been filled in yet.
+    cookies_pending: bool = False
+    # The request of a response, or the response of a request, when captured.
+    paired: "CapturedCall | None" = None
+    # The live request, while its response is pending.
+    request: Request | None = None
+
+    @property
+    def response(self) -> NetworkResponse | None:
+        if isinstance(self.call, NetworkResponse):
+            return self.call
+        return self.paired.call if self.paired else None
+
+    @property
+    def body_loaded(self) -> bool:
+        return self.source is None
+
+
+def _headers_size(headers: dict) -> int:
+    return sum(len(k) + len(str(v)) for k, v in headers.items())
+
+
+def _body_size(body: Any) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, (str, bytes)):
+        return len(body)
+    return len(json.dumps(body))
+
+
+class NetworkCaptureStore:
+    def __init__(self, policy: NetworkCapture | None = None):
+        policy = policy or NetworkCapture()
+        self.url_patterns = policy.url_patterns
+        self.content_types = [t.lower() for t in policy.content_types or []]
+        self.max_entries = policy.max_entries or settings.NETWORK_CAPTURE_MAX_ENTRIES
+        self.max_bytes = policy.max_bytes or settings.NETWORK_CAPTURE_MAX_BYTES
+        self._entries: deque[CapturedCall] = deque()
+        self._bytes = 0
+        # Set by the Browser to its context's cookies().
+        self.cookie_source: Callable[[], Awaitable[list[dict]]] | None = None
+        self._cookie_header: str | None = None
+        # URL pattern -> matching entries in capture order ("" = every entry).
+        self._by_pattern: dict[str, deque[CapturedCall]] = {}
+        # Captured requests still waiting for their response.
+        self._open_requests: dict[Request, CapturedCall] = {}
+        self._waiters: list[
+            tuple[str, str | None, int | None, asyncio.Future[CapturedCall]]
+        ] = []
+
+    def wants_url(self, url: str) -> bool:
+        return not self.url_patterns or any(p in url for p in self.url_patterns)
+
+    def wants_content_type(self, headers: dict) -> bool:
+        if not self.content_types:
+            return True
+        content_type = (headers.get("content-type") or "").lower()
+        return any(t in content_type for t in self.content_types)
+
+    def _add(self, entry: CapturedCall) -> None:
+        self._entries.append(entry)
+        self._bytes += entry.size
+        for pattern, matches in self._by_pattern.items():
+            if pattern in entry.call.url:
+                matches.append(entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            evicted = self._entries.popleft()
+            self._bytes -= evicted.size
+            # Every index is in capture order, so the evicted entry can only be
+            # at the head of each.
+            for matches in self._by_pattern.values():
+                if matches and matches[0] is evicted:
+                    matches.popleft()
+            if evicted.request is not None:
+                self._open_requests.pop(evicted.request, None)
+
+    def add_request(self, request: NetworkRequest, source: Request | None = None):
+        size = len(request.url) + _headers_size(request.headers)
+        entry = CapturedCall(
+            request,
+            size=size + _body_size(request.body),
+            cookies_pending=True,
+            request=source,
+        )
+        self._add(entry)
+        if source is not None:
+            self._open_requests[source] = entry
+
+    def invalidate_cookies(self) -> None:
+        """Called for every response, captured or not: Playwright hides
+        Set-Cookie from response.headers, so any of them may have changed the
+        jar."""
+        self._cookie_header = None
+
+    def add_response(self, response: Response, method: str | None) -> None:
+        headers = response.headers
+        if not self.wants_content_type(headers):
+            return
+        try:
+            content_length = int(headers.get("content-length") or 0)
+        except ValueError:
+            content_length = 0
+        call = NetworkResponse(
+            url=response.url,
+            method=method,
+            status=response.status,
+            headers=headers,
+            content_length=content_length,
+        )
+        entry = CapturedCall(
+            call, source=response, size=len(call.url) + _headers_size(headers)
+        )
+        try:
+            request_entry = self._open_requests.pop(response.request, None)
+        except Exception:
+            request_entry = None
+        if request_entry is not None:
+            request_entry.request = None
+            request_entry.paired = entry
+            entry.paired = request_entry
+        self._add(entry)
+        self._notify(entry)
+
+    @staticmethod
+    def _matches(entry: CapturedCall, method: str | None, status: int | None) -> bool:
+        if method and (entry.call.method or "").upper() != method.upper():
+            return False
+        if status is not None:
+            response = entry.response
+            return response is not None and response.status == status
+        return True
+
+    def query(
+        self,
+        url_pattern: str | None = None,
+        method: str | None = None,
+        status: int | None = None,
+    ) -> list[CapturedCall]:
+        """Captured calls whose URL contains ``url_pattern``, in capture order.
+        ``status`` matches responses and requests paired with such a response."""
+        pattern = url_pattern or ""
+        matches = self._by_pattern.get(pattern)
+        if matches is None:
+            matches = deque(e for e in self._entries if pattern in e.call.url)
+            self._by_pattern[pattern] = matches
+        return [e for e in matches if self._matches(e, method, status)]
+
+    def _notify(self, entry: CapturedCall) -> None:
+        if not self._waiters:
+            return
+        waiting = []
+        for pattern, method, status, future in self._waiters:
+            if future.done():
+                continue
+            if pattern in entry.call.url and self._matches(entry, method, status):
+                future.set_result(entry)
+            else:
+                waiting.append((pattern, method, status, future))
+        self._waiters = waiting
+
+    async def wait_for_response(
+        self,
+        url_pattern: str | None = None,
+        method: str | None = None,
+        status: int | None = None,
+        timeout: float | None = None,
+    ) -> CapturedCall | None:
+        """The latest captured matching response, else the next one to arrive
+        within ``timeout`` seconds (None on timeout)."""
+        for entry in reversed(self.query(url_pattern, method, status)):
+            if isinstance(entry.call, NetworkResponse):
+                return entry
+        future: asyncio.Future[CapturedCall] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append((url_pattern or "", method, status, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def load_body(self, entry: CapturedCall) -> None:
+        """Fetch a response's body (JSON if it parses, else text) into the entry."""
+        if entry.body_loaded:
+            return
+        response, entry.source = entry.source, None
+        try:
+            body = await response.json()
+        except Exception:
+            try:
+                body = await response.text()
+            except Exception as e:
+                logger.debug(f"Body of {response.url} is no longer available: {e}")
+                body = None
+        size = _body_size(body)
+        entry.call.body = body
+        entry.call.content_length = size or entry.call.content_length
+        self._grow(entry, size)
+
+    def _grow(self, entry: CapturedCall, size: int) -> None:
+        if any(e is entry for e in self._entries):
+            entry.size += size
+            self._bytes += size
+            self._evict()
+
+    async def _cookie_snapshot(self) -> str:
+        if self._cookie_header is None:
+            cookies = await self.cookie_source() if self.cookie_source else []
+            # Rebuild cookies exactly like curl -b
+            self._cookie_header = "; ".join(
+                f"{c['name']}={c['value']}" for c in cookies
+            )
+        return self._cookie_header
+
+    async def resolve_request(self, entry: CapturedCall) -> None:
+        """Add the cookie header to a captured request before it is replayed
+        or extracted."""
+        if not entry.cookies_pending:
+            return
+        entry.cookies_pending = False
+        try:
+            cookie_header = await self._cookie_snapshot()
+        except Exception as e:
+            logger.warning(f"Could not read cookies for {entry.call.url}: {e}")
+            return
+        entry.call.headers["cookie"] = cookie_header
+        self._grow(entry, len(cookie_header))
+
+    async def complete(self, entry: CapturedCall) -> None:
+        """Fill in whatever was deferred when the call was captured."""
+        if isinstance(entry.call, NetworkRequest):
+            await self.resolve_request(entry)
+        else:
+            await self.load_body(entry)
+
+    def entries(self) -> list[CapturedCall]:
+        return list(self._entries)
+
+    def calls(self) -> list[NetworkRequest | NetworkResponse]:
+        return [entry.call for entry in self._entries]
+
+    def clear(self) -> None:
+        """Forget captured calls; pending waiters keep waiting."""
+        self._entries.clear()
+        self._bytes = 0
+        self._by_pattern.clear()
+        self._open_requests.clear()
@@ -0,0 +1,111 @@
+"""Pre-baked Chrome profiles for non-dedicated browsers.
+
+A non-dedicated browser starts from an empty user-data-dir, so every launch
+repeats Chrome's first-run profile initialization and extension registration.
+A template is that initialized profile, baked once per container for a given
+launch mode, channel, extension set and os_emulation. Each launch then clones
+it into a fresh user-data-dir.
+
+Files are cloned with a copy-on-write reflink (``FICLONE``) where the
+filesystem supports it and plain-copied otherwise. Hardlinks are not used
+because Chrome updates its SQLite stores (Cookies, History, Web Data) in place,
+and a hardlinked write would change the template too.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import stat
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_ROOT = pathlib.Path("/tmp/optexity_profile_templates")
+
+# Linux ioctl asking the filesystem to share the source's extents (btrfs, xfs,
+# overlayfs over either); anything else raises and we copy.
+_FICLONE = 0x40049409
+
+# Process locks, crash dumps and caches that must not be carried into a clone.
+_TRANSIENT_ENTRIES = {
+    "SingletonLock",
+    "SingletonSocket",
+    "SingletonCookie",
+    "DevToolsActivePort",
+    "Crashpad",
+    "BrowserMetrics",
+    "ShaderCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "DawnCache",
+}
+
+
+def profile_template_key(
+    mode: str, channel: str, extension_ids: list[str], os_emulation: str | None
+) -> str:
+    payload = json.dumps(
+        {
+            "mode": mode,
+            "channel": channel,
+            "extensions": sorted(extension_ids),
+            "os_emulation": os_emulation,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def profile_template_dir(key: str) -> pathlib.Path:
+    return TEMPLATE_ROOT / key
+
+
+def _clone_file(src: str, dst: str) -> str:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return dst
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+    return dst
+
+
+def clone_profile(template_dir: pathlib.Path, user_data_dir: str) -> None:
+    """Replace ``user_data_dir`` with a writable clone of ``template_dir``."""
+    shutil.rmtree(user_data_dir, ignore_errors=True)
+    shutil.copytree(
+        template_dir, user_data_dir, symlinks=True, copy_function=_clone_file
+    )
+
+
+def publish_profile_template(
+    staging_dir: pathlib.Path, template_dir: pathlib.Path
+) -> None:
+    """Strip ``staging_dir`` of transient state and move it into place read-only.
+
+    Safe to race: if another slot published the same key first, its template
+    wins and ``staging_dir`` is dropped.
+    """
+    for root, dirs, files in os.walk(staging_dir, topdown=True):
+        for name in [d for d in dirs if d in _TRANSIENT_ENTRIES]:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            dirs.remove(name)
+        for name in files:
+            path = os.path.join(root, name)
+            if name in _TRANSIENT_ENTRIES or os.path.islink(path):
+                os.unlink(path)
+            else:
+                os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+    try:
+        os.rename(staging_dir, template_dir)
+        logger.info(f"Published browser profile template {template_dir}")
+    except OSError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
@@ -0,0 +1,199 @@
+"""Enforces an automation's ``resource_policy`` on every page of a context.
+
+Denied domains go to ``Network.setBlockedURLs`` and are dropped inside the
+browser at no cost to us. Blocked resource types and an allow list need a
+decision per request, so those requests are paused with ``Fetch`` (only the
+listed types, unless an allow list applies to everything) and failed or
+continued. With ``max_image_dimension`` images are also paused once their
+response arrives and re-encoded smaller before the page sees them.
+
+Outcomes are counted into ``Memory.resource_policy_stats``. Bytes saved are
+measured for downscaled images only: a blocked request is failed before it is
+sent, so the size it would have had is unknown and it is only counted.
+
+Downscaling uses Pillow, a direct dependency.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+from urllib.parse import urlparse
+
+from optexity.schema.automation import ResourcePolicy
+from optexity.schema.memory import ResourcePolicyStats
+
+logger = logging.getLogger(__name__)
+
+_DOWNSCALE_FORMATS = {"JPEG", "PNG", "WEBP"}
+
+
+def _host_matches(host: str, domains: list[str]) -> bool:
+    return any(host == d or host.endswith(f".{d}") for d in domains)
+
+
+def _downscaled(body: bytes, max_dimension: int) -> tuple[bytes, str] | None:
+    """(re-encoded image, content type) when that is smaller, else None."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(body)) as image:
+        image_format = image.format
+        if image_format not in _DOWNSCALE_FORMATS:
+            return None
+        if max(image.size) <= max_dimension:
+            return None
+        image.thumbnail((max_dimension, max_dimension))
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        out = io.BytesIO()
+        image.save(out, format=image_format, quality=80, optimize=True)
+    data = out.getvalue()
+    if len(data) >= len(body):
+        return None
+    return data, f"image/{image_format.lower()}"
+
+
+class ResourcePolicyEnforcer:
+    def __init__(self, policy: ResourcePolicy, stats: ResourcePolicyStats):
+        self.policy = policy
+        self.stats = stats
+        self.blocked_types = {t.lower() for t in policy.block_resource_types}
+
+    def _fetch_patterns(self) -> list[dict]:
+        patterns = []
+        if self.policy.allow_domains is not None:
+            patterns.append({"urlPattern": "*", "requestStage": "Request"})
+        else:
+            for resource_type in self.policy.block_resource_types:
+                patterns.append(
+                    {
+                        "urlPattern": "*",
+                        "resourceType": resource_type,
+                        "requestStage": "Request",
+                    }
+                )
+        if self.policy.max_image_dimension:
+            patterns.append(
+                {
+                    "urlPattern": "*",
+                    "resourceType": "Image",
+                    "requestStage": "Response",
+                }
+            )
+        return patterns
+
+    def block_reason(self, url: str, resource_type: str) -> str | None:
+        """The stats key a request is blocked under, or None to let it through."""
+        if resource_type.lower() in self.blocked_types:
+            return resource_type
+        host = urlparse(url).hostname
+        if not host:
+            # data:, blob: and the like never touch the network.
+            return None
+        if _host_matches(host, self.policy.deny_domains):
+            return resource_type
+        allow = self.policy.allow_domains
+        if allow is not None and not _host_matches(host, allow):
+            return resource_type
+        return None
+
+    async def attach(self, context, page) -> None:
+        try:
+            session = await context.new_cdp_session(page)
+            if self.policy.deny_domains:
+                session.on("Network.loadingFailed", self._on_loading_failed)
+                await session.send("Network.enable")
+                await session.send(
+                    "Network.setBlockedURLs",
+                    {
+                        "urls": [
+                            pattern
+                            for d in self.policy.deny_domains
+                            for pattern in (f"*://{d}/*", f"*://*.{d}/*")
+                        ]
+                    },
+                )
+            patterns = self._fetch_patterns()
+            if patterns:
+                session.on(
+                    "Fetch.requestPaused",
+                    lambda params: asyncio.create_task(
+                        self._on_request_paused(session, params)
+                    ),
+                )
+                await session.send("Fetch.enable", {"patterns": patterns})
+        except Exception as e:
+            logger.warning(f"Could not apply resource policy to {page.url}: {e}")
+
+    def _count_blocked(self, resource_type: str) -> None:
+        blocked = self.stats.blocked_requests
+        blocked[resource_type] = blocked.get(resource_type, 0) + 1
+
+    def _on_loading_failed(self, params: dict) -> None:
+        # setBlockedURLs failures are reported with blockedReason "inspector".
+        if params.get("blockedReason") == "inspector":
+            self._count_blocked(params.get("type", "Other"))
+
+    async def _on_request_paused(self, session, params: dict) -> None:
+        request_id = params["requestId"]
+        resource_type = params.get("resourceType", "Other")
+        try:
+            if "responseStatusCode" in params or "responseErrorReason" in params:
+                if await self._fulfill_downscaled(session, params):
+                    return
+            else:
+                reason = self.block_reason(params["request"]["url"], resource_type)
+                if reason is not None:
+                    self._count_blocked(reason)
+                    await session.send(
+                        "Fetch.failRequest",
+                        {"requestId": request_id, "errorReason": "BlockedByClient"},
+                    )
+                    return
+            await session.send("Fetch.continueRequest", {"requestId": request_id})
+        except Exception as e:
+            # The page may have closed or navigated away from this request.
+            logger.debug(f"Resource policy could not resolve {request_id}: {e}")
+
+    async def _fulfill_downscaled(self, session, params: dict) -> bool:
+        if params.get("responseStatusCode") != 200:
+            return False
+        request_id = params["requestId"]
+        response = await session.send(
+            "Fetch.getResponseBody", {"requestId": request_id}
+        )
+        body = response["body"]
+        if response.get("base64Encoded"):
+            body = base64.b64decode(body)
+        else:
+            body = body.encode()
+        try:
+            result = await asyncio.to_thread(
+                _downscaled, body, self.policy.max_image_dimension
+            )
+        except Exception as e:
+            logger.debug(f"Could not downscale {params['request']['url']}: {e}")
+            result = None
+        if result is None:
+            return False
+        data, content_type = result
+        # getResponseBody returns the decoded body, so drop content-encoding.
+        headers = [
+            h
+            for h in params.get("responseHeaders", [])
+            if h["name"].lower()
+            not in ("content-length", "content-type", "content-encoding")
+        ]
+        headers.append({"name": "Content-Type", "value": content_type})
+        await session.send(
+            "Fetch.fulfillRequest",
+            {
+                "requestId": request_id,
+                "responseCode": 200,
+                "responseHeaders": headers,
+                "body": base64.b64encode(data).decode("ascii"),
+            },
+        )
+        self.stats.images_downscaled += 1
+        self.stats.image_bytes_saved += len(body) - len(data)
+        return True
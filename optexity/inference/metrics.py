@@ -0,0 +1,188 @@
+"""Prometheus counters and histograms for the inference child, served at /metrics.
+
+Kept dependency-free: the handful of metric types here render the Prometheus
+text exposition format directly. Much of the interesting work (LLM calls,
+download uploads) happens inside worker subprocesses, so ``inc`` and
+``observe`` called in a worker are forwarded to the parent over the
+``worker_channel`` and applied there; outside a worker they apply locally.
+"""
+
+import math
+import threading
+from typing import Any
+
+from optexity.inference.worker_channel import forward_to_parent
+
+_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: dict[LabelKey, float] = {}
+
+    def apply(self, value: float, labels: dict[str, Any]) -> None:
+        key = _label_key(labels)
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...] = _DURATION_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label key -> (per-bucket counts, sum)
+        self._values: dict[LabelKey, tuple[list[int], float]] = {}
+
+    def apply(self, value: float, labels: dict[str, Any]) -> None:
+        key = _label_key(labels)
+        counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self._values[key] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, (counts, total) in self._values.items():
+            for bound, count in zip(self.buckets, counts):
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {counts[-1]}")
+        return lines
+
+
+_lock = threading.Lock()
+_registry: dict[str, Counter | Histogram] = {}
+
+
+def _register(metric: Counter | Histogram) -> Any:
+    _registry[metric.name] = metric
+    return metric
+
+
+QUEUE_WAIT_SECONDS = _register(
+    Histogram(
+        "optexity_queue_wait_seconds",
+        "Time from allocation to a slot starting the task.",
+        buckets=_DURATION_BUCKETS + (1800, 3600),
+    )
+)
+BROWSER_SETUP_SECONDS = _register(
+    Histogram("optexity_browser_setup_seconds", "Time spent in setup_browser.")
+)
+BROWSER_RESTARTS_TOTAL = _register(
+    Counter("optexity_browser_restarts_total", "Browser restarts by reason.")
+)
+WORKER_SPAWN_SECONDS = _register(
+    Histogram(
+        "optexity_worker_spawn_seconds",
+        "Time to obtain a worker subprocess for an attempt.",
+    )
+)
+ATTEMPT_SECONDS = _register(
+    Histogram("optexity_attempt_seconds", "Duration of one worker attempt.")
+)
+ATTEMPT_EXIT_CODES_TOTAL = _register(
+    Counter("optexity_attempt_exit_codes_total", "Worker attempts by exit code.")
+)
+UPLOAD_BYTES_TOTAL = _register(
+    Counter("optexity_upload_bytes_total", "Bytes uploaded to the server or S3.")
+)
+UPLOAD_SECONDS = _register(
+    Histogram("optexity_upload_seconds", "Latency of uploads to the server or S3.")
+)
+LLM_CALL_SECONDS = _register(
+    Histogram("optexity_llm_call_seconds", "Latency of a single LLM completion.")
+)
+LLM_TOKENS_TOTAL = _register(
+    Counter("optexity_llm_tokens_total", "LLM tokens by model and direction.")
+)
+LLM_RATE_LIMIT_WAIT_SECONDS = _register(
+    Histogram(
+        "optexity_llm_rate_limit_wait_seconds",
+        "Time an LLM call waited for the client-side rate limiter.",
+    )
+)
+LLM_HEDGES_TOTAL = _register(
+    Counter("optexity_llm_hedges_total", "Hedged LLM calls by winning leg.")
+)
+
+
+def _record(metric: Counter | Histogram, value: float, labels: dict[str, Any]):
+    message = {
+        "type": "metric",
+        "name": metric.name,
+        "value": value,
+        "labels": {k: str(v) for k, v in labels.items()},
+    }
+    if forward_to_parent(message):
+        return
+    apply_message(message)
+
+
+def inc(metric: Counter, amount: float = 1.0, **labels: Any) -> None:
+    _record(metric, amount, labels)
+
+
+def observe(metric: Histogram, value: float, **labels: Any) -> None:
+    _record(metric, value, labels)
+
+
+def apply_message(message: dict[str, Any]) -> None:
+    """Apply a metric update, e.g. one a worker forwarded over its channel."""
+    metric = _registry.get(message["name"])
+    if metric is None:
+        return
+    with _lock:
+        metric.apply(float(message["value"]), message.get("labels") or {})
+
+
+def render_latest() -> str:
+    with _lock:
+        lines: list[str] = []
+        for metric in _registry.values():
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
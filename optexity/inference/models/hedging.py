@@ -0,0 +1,36 @@
+"""Deadline for hedged LLM calls.
+
+With LLM_HEDGE_REQUESTS, a structured call that the primary model has not
+answered within its recent latency percentile is also sent to
+LLM_MODEL_FALLBACK, and whichever valid response arrives first wins. The
+deadline adapts per model from the latencies of completed calls in this
+process; until enough have been seen, LLM_HEDGE_DEFAULT_DELAY_SECONDS applies.
+"""
+
+import math
+import threading
+from collections import defaultdict, deque
+
+from optexity.utils.llm_settings import llm_settings
+
+_WINDOW = 200
+_MIN_SAMPLES = 20
+
+_lock = threading.Lock()
+_latencies: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_WINDOW))
+
+
+def record_latency(model: str, seconds: float) -> None:
+    with _lock:
+        _latencies[model].append(seconds)
+
+
+def hedge_delay_seconds(model: str) -> float:
+    """How long to wait on ``model`` before firing the fallback."""
+    with _lock:
+        samples = sorted(_latencies[model])
+    if len(samples) < _MIN_SAMPLES:
+        return llm_settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+    rank = math.ceil(llm_settings.LLM_HEDGE_PERCENTILE / 100 * len(samples)) - 1
+    delay = samples[min(max(rank, 0), len(samples) - 1)]
+    return max(delay, llm_settings.LLM_HEDGE_MIN_DELAY_SECONDS)
@@ -1,51 +1,25 @@
-import base64
+import asyncio
 import json
 import logging
+import time
 from pathlib import Path
 from typing import Any, Optional
 
-import httpx
 import litellm
 from pydantic import BaseModel
 
+from optexity.inference import metrics
 from optexity.utils.llm_settings import llm_settings, resolve_llm_api_key
-from optexity.utils.utils import is_local_path, is_url
 
+from . import rate_limit, replay
+from .hedging import hedge_delay_seconds, record_latency
 from .llm_model import LLMModel, TokenUsage
+from .pdf_input import apdf_base64, pdf_base64
+from .schema_cache import compile_schema
+from .telemetry import note_served_by
 
 logger = logging.getLogger(__name__)
 
-_SPACE_PLACEHOLDER = "_._"
-
-
-def _sanitize_schema_keys(obj):
-    """Recursively replace spaces in dict keys with _._
-
-    Anthropic rejects tool schemas with spaces in property names, and extraction
-    schemas come from user-authored workflow JSON where spaces are common.
-    """
-    if isinstance(obj, dict):
-        return {
-            k.replace(" ", _SPACE_PLACEHOLDER): _sanitize_schema_keys(v)
-            for k, v in obj.items()
-        }
-    elif isinstance(obj, list):
-        return [_sanitize_schema_keys(item) for item in obj]
-    return obj
-
-
-def _restore_schema_keys(obj):
-    """Recursively replace _._ in dict keys back to spaces."""
-    if isinstance(obj, dict):
-        return {
-            k.replace(_SPACE_PLACEHOLDER, " "): _restore_schema_keys(v)
-            for k, v in obj.items()
-        }
-    elif isinstance(obj, list):
-        return [_restore_schema_keys(item) for item in obj]
-    return obj
-
-
 # Gemini 3.x thinks by default. litellm has no thinking_level support, so this
 # goes through reasoning_effort, which it maps to a thinkingBudget: "minimal" is
 # 128 tokens and "disable"/"none" are 0, which Gemini 3.x rejects with a 400.
@@ -87,16 +61,6 @@ def litellm_fallbacks(model: str) -> list[dict[str, Any]]:
     ]
 
 
-def _pdf_to_base64(pdf_url: str | Path) -> str:
-    if is_local_path(pdf_url):
-        raw = Path(str(pdf_url)).read_bytes()
-    elif is_url(pdf_url):
-        raw = httpx.get(str(pdf_url)).content
-    else:
-        raise ValueError(f"Invalid pdf_url: {pdf_url}")
-    return base64.standard_b64encode(raw).decode("utf-8")
-
-
 class LiteLLMModel(LLMModel):
     """Single provider-agnostic backend. `model_name` is any litellm model string."""
 
@@ -106,7 +70,9 @@ class LiteLLMModel(LLMModel):
         system_instruction: Optional[str] = None,
         screenshot: Optional[str] = None,
         pdf_url: Optional[str | Path] = None,
+        pdf_data: Optional[str] = None,
     ) -> list[dict[str, Any]]:
+        """``pdf_data`` is the already-encoded ``pdf_url``, if the caller has it."""
 
         if pdf_url is not None and screenshot is not None:
             raise ValueError("Cannot use both screenshot and pdf_url")
@@ -122,15 +88,13 @@ class LiteLLMModel(LLMModel):
                 },
             )
         elif pdf_url is not None:
+            if pdf_data is None:
+                pdf_data = pdf_base64(pdf_url)
             content.insert(
                 0,
                 {
                     "type": "file",
-                    "file": {
-                        "file_data": (
-                            f"data:application/pdf;base64,{_pdf_to_base64(pdf_url)}"
-                        )
-                    },
+                    "file": {"file_data": (f"data:application/pdf;base64,{pdf_data}")},
                 },
             )
 
@@ -140,17 +104,23 @@ class LiteLLMModel(LLMModel):
         messages.append({"role": "user", "content": content})
         return messages
 
-    def _completion(self, messages: list[dict[str, Any]], **kwargs):
-        fallbacks = litellm_fallbacks(self.model_name)
-        if fallbacks:
-            # litellm only routes through its fallback path when this is present,
-            # and that path hops to a worker thread — skip it when unconfigured.
-            kwargs["fallbacks"] = fallbacks
-        kwargs.setdefault("reasoning_effort", reasoning_effort_for(self.model_name))
-        return litellm.completion(
-            model=self.model_name,
+    def _completion_kwargs(
+        self, messages: list[dict[str, Any]], model: str | None = None, **kwargs
+    ) -> dict[str, Any]:
+        """``model`` pins one model with no litellm fallback (a hedged leg)."""
+        if model is None:
+            model = self.model_name
+            fallbacks = litellm_fallbacks(model)
+            if fallbacks:
+                # litellm only routes through its fallback path when this is
+                # present, and that path hops to a worker thread — skip it when
+                # unconfigured.
+                kwargs["fallbacks"] = fallbacks
+        kwargs.setdefault("reasoning_effort", reasoning_effort_for(model))
+        return dict(
+            model=model,
             messages=messages,
-            api_key=resolve_llm_api_key(self.model_name),
+            api_key=resolve_llm_api_key(model),
             # LLMModel.get_model_response already retries 3x; letting litellm retry
             # too would multiply that out to 9 attempts.
             num_retries=0,
@@ -158,7 +128,133 @@ class LiteLLMModel(LLMModel):
             **kwargs,
         )
 
-    def _token_usage_from(self, response) -> TokenUsage:
+    def _record_call(self, response, start: float, model: str | None = None) -> None:
+        if model is None:
+            # litellm switches to LLM_MODEL_FALLBACK on its own; the response
+            # names the model that actually answered.
+            fallback = llm_settings.LLM_MODEL_FALLBACK
+            answered = str(getattr(response, "model", "") or "")
+            if (
+                fallback
+                and answered
+                and answered.split("/")[-1] == fallback.split("/")[-1]
+            ):
+                note_served_by(fallback)
+            else:
+                note_served_by(self.model_name)
+        model = model or self.model_name
+        elapsed = time.monotonic() - start
+        record_latency(model, elapsed)
+        metrics.observe(metrics.LLM_CALL_SECONDS, elapsed, model=model)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            for direction, tokens in (
+                ("input", getattr(usage, "prompt_tokens", 0)),
+                ("output", getattr(usage, "completion_tokens", 0)),
+            ):
+                metrics.inc(
+                    metrics.LLM_TOKENS_TOTAL,
+                    tokens or 0,
+                    model=model,
+                    direction=direction,
+                )
+
+    def _settle_rate_limit(self, model: str, reserved_tokens: int, response) -> None:
+        usage = getattr(response, "usage", None)
+        used_tokens = getattr(usage, "total_tokens", None) if usage else None
+        if used_tokens:
+            rate_limit.settle(model, reserved_tokens, used_tokens)
+
+    def _note_rate_limit_error(self, model: str, error: Exception) -> None:
+        retry_after = rate_limit.retry_after_seconds(error)
+        if retry_after:
+            rate_limit.block(model, retry_after)
+
+    def _completion(self, messages: list[dict[str, Any]], **kwargs):
+        model = self.model_name
+        fixture = replay.get_replay_fixture()
+        if fixture is not None and llm_settings.LLM_REPLAY_MODE == "replay":
+            start = time.monotonic()
+            entry = fixture.lookup(
+                replay.request_key(model, messages, **kwargs),
+                replay.response_stream(model, **kwargs),
+            )
+            time.sleep(replay.replay_latency_seconds(entry))
+            response = replay.replayed_response(entry)
+            self._record_call(response, start)
+            return response
+        reserved_tokens = rate_limit.estimate_tokens(messages)
+        with rate_limit.in_flight(model):
+            rate_limit.acquire(model, reserved_tokens)
+            start = time.monotonic()
+            try:
+                response = litellm.completion(
+                    **self._completion_kwargs(messages, **kwargs)
+                )
+            except Exception as e:
+                self._note_rate_limit_error(model, e)
+                raise
+        self._record_call(response, start)
+        self._settle_rate_limit(model, reserved_tokens, response)
+        if fixture is not None:
+            fixture.record(
+                replay.request_key(model, messages, **kwargs),
+                replay.response_stream(model, **kwargs),
+                time.monotonic() - start,
+                response,
+            )
+        return response
+
+    async def _acompletion(
+        self, messages: list[dict[str, Any]], model: str | None = None, **kwargs
+    ):
+        limited_model = model or self.model_name
+        fixture = replay.get_replay_fixture()
+        if fixture is not None and llm_settings.LLM_REPLAY_MODE == "replay":
+            start = time.monotonic()
+            entry = fixture.lookup(
+                replay.request_key(limited_model, messages, **kwargs),
+                replay.response_stream(limited_model, **kwargs),
+            )
+            await asyncio.sleep(replay.replay_latency_seconds(entry))
+            response = replay.replayed_response(entry)
+            self._record_call(response, start, model)
+            return response
+        reserved_tokens = rate_limit.estimate_tokens(messages)
+        async with rate_limit.ain_flight(limited_model):
+            await rate_limit.aacquire(limited_model, reserved_tokens)
+            start = time.monotonic()
+            try:
+                response = await litellm.acompletion(
+                    **self._completion_kwargs(messages, model, **kwargs)
+                )
+            except Exception as e:
+                self._note_rate_limit_error(limited_model, e)
+                raise
+        self._record_call(response, start, model)
+        self._settle_rate_limit(limited_model, reserved_tokens, response)
+        if fixture is not None:
+            fixture.record(
+                replay.request_key(limited_model, messages, **kwargs),
+                replay.response_stream(limited_model, **kwargs),
+                time.monotonic() - start,
+                response,
+            )
+        return response
+
+    async def _abuild_messages(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        screenshot: Optional[str] = None,
+        pdf_url: Optional[str | Path] = None,
+    ) -> list[dict[str, Any]]:
+        pdf_data = await apdf_base64(pdf_url) if pdf_url is not None else None
+        return self._build_messages(
+            prompt, system_instruction, screenshot, pdf_url, pdf_data
+        )
+
+    def _token_usage_from(self, response, model: str | None = None) -> TokenUsage:
         usage = getattr(response, "usage", None)
         if usage is None:
             return TokenUsage()
@@ -168,28 +264,12 @@ class LiteLLMModel(LLMModel):
             output_tokens=getattr(usage, "completion_tokens", 0),
             thoughts_tokens=getattr(details, "reasoning_tokens", 0) if details else 0,
             total_tokens=getattr(usage, "total_tokens", 0),
+            model_name=model,
         )
 
-    def _get_model_response(
-        self, prompt: str, system_instruction: Optional[str] = None
-    ) -> tuple[str, TokenUsage]:
-
-        response = self._completion(self._build_messages(prompt, system_instruction))
-        return (response.choices[0].message.content or ""), self._token_usage_from(
-            response
-        )
-
-    def _get_model_response_with_structured_output(
-        self,
-        prompt: str,
-        response_schema: type[BaseModel],
-        screenshot: Optional[str] = None,
-        pdf_url: Optional[str | Path] = None,
-        system_instruction: Optional[str] = None,
-    ) -> tuple[BaseModel | None, TokenUsage]:
-
-        messages = self._build_messages(prompt, system_instruction, screenshot, pdf_url)
-
+    def _structured_output_kwargs(
+        self, response_schema: type[BaseModel]
+    ) -> dict[str, Any]:
         kwargs: dict[str, Any] = {}
         if self.use_structured_output:
             # Pass the schema as a dict rather than the pydantic class so the
@@ -200,20 +280,21 @@ class LiteLLMModel(LLMModel):
                 "type": "json_schema",
                 "json_schema": {
                     "name": "structured_output",
-                    "schema": _sanitize_schema_keys(
-                        response_schema.model_json_schema()
-                    ),
+                    "schema": compile_schema(response_schema).sanitized_schema,
                     "strict": False,
                 },
             }
+        return kwargs
 
-        response = self._completion(messages, **kwargs)
-        token_usage = self._token_usage_from(response)
+    def _parse_structured_response(
+        self, response, response_schema: type[BaseModel], model: str | None = None
+    ) -> tuple[BaseModel | None, TokenUsage]:
+        token_usage = self._token_usage_from(response, model)
         content = response.choices[0].message.content or ""
 
         if self.use_structured_output:
             try:
-                restored = _restore_schema_keys(json.loads(content))
+                restored = compile_schema(response_schema).restore(json.loads(content))
                 return response_schema.model_validate(restored), token_usage
             except Exception as e:
                 logger.warning(
@@ -222,3 +303,153 @@ class LiteLLMModel(LLMModel):
                 )
 
         return self.parse_from_completion(content, response_schema), token_usage
+
+    def _get_model_response(
+        self, prompt: str, system_instruction: Optional[str] = None
+    ) -> tuple[str, TokenUsage]:
+
+        response = self._completion(self._build_messages(prompt, system_instruction))
+        return (response.choices[0].message.content or ""), self._token_usage_from(
+            response
+        )
+
+    async def _aget_model_response(
+        self, prompt: str, system_instruction: Optional[str] = None
+    ) -> tuple[str, TokenUsage]:
+
+        response = await self._acompletion(
+            self._build_messages(prompt, system_instruction)
+        )
+        return (response.choices[0].message.content or ""), self._token_usage_from(
+            response
+        )
+
+    def _get_model_response_with_structured_output(
+        self,
+        prompt: str,
+        response_schema: type[BaseModel],
+        screenshot: Optional[str] = None,
+        pdf_url: Optional[str | Path] = None,
+        system_instruction: Optional[str] = None,
+    ) -> tuple[BaseModel | None, TokenUsage]:
+
+        messages = self._build_messages(prompt, system_instruction, screenshot, pdf_url)
+        response = self._completion(
+            messages, **self._structured_output_kwargs(response_schema)
+        )
+        return self._parse_structured_response(response, response_schema)
+
+    async def _aget_model_response_with_structured_output(
+        self,
+        prompt: str,
+        response_schema: type[BaseModel],
+        screenshot: Optional[str] = None,
+        pdf_url: Optional[str | Path] = None,
+        system_instruction: Optional[str] = None,
+    ) -> tuple[BaseModel | None, TokenUsage]:
+
+        messages = await self._abuild_messages(
+            prompt, system_instruction, screenshot, pdf_url
+        )
+        fallback = llm_settings.LLM_MODEL_FALLBACK
+        if llm_settings.LLM_HEDGE_REQUESTS and fallback and fallback != self.model_name:
+            return await self._ahedged_structured_output(
+                messages, response_schema, fallback
+            )
+        response = await self._acompletion(
+            messages, **self._structured_output_kwargs(response_schema)
+        )
+        return self._parse_structured_response(response, response_schema)
+
+    def _abandoned_leg_usage(
+        self, messages: list[dict[str, Any]], model: str
+    ) -> TokenUsage:
+        """Estimated prompt cost of a hedged leg cancelled before it answered;
+        the provider may still bill the input it had already processed."""
+        try:
+            input_tokens = litellm.token_counter(model=model, messages=messages)
+        except Exception:
+            return TokenUsage()
+        return self.get_token_usage(input_tokens=input_tokens, model_name=model)
+
+    def _losing_leg_usage(
+        self, leg: asyncio.Task, messages: list[dict[str, Any]], model: str
+    ) -> TokenUsage:
+        """Usage litellm reported for a losing leg that finished, else cancel it
+        and charge its estimated prompt cost."""
+        if not leg.done():
+            leg.cancel()
+            return self._abandoned_leg_usage(messages, model)
+        if leg.cancelled() or leg.exception() is not None:
+            return TokenUsage()
+        _, token_usage = leg.result()
+        return token_usage
+
+    async def _ahedged_structured_output(
+        self,
+        messages: list[dict[str, Any]],
+        response_schema: type[BaseModel],
+        fallback: str,
+    ) -> tuple[BaseModel | None, TokenUsage]:
+        """Ask the primary; if it is slower than its hedge deadline (or fails),
+        ask ``fallback`` too and return the first valid response. The slower
+        leg is cancelled; token usage covers both."""
+        kwargs = self._structured_output_kwargs(response_schema)
+
+        async def _leg(model: str) -> tuple[BaseModel | None, TokenUsage]:
+            response = await self._acompletion(messages, model, **kwargs)
+            return self._parse_structured_response(response, response_schema, model)
+
+        legs: dict[asyncio.Task, str] = {
+            asyncio.create_task(_leg(self.model_name)): self.model_name
+        }
+
+        def _start_fallback() -> None:
+            if fallback not in legs.values():
+                legs[asyncio.create_task(_leg(fallback))] = fallback
+
+        total_token_usage = TokenUsage()
+        last_exception: Exception | None = None
+        delay = hedge_delay_seconds(self.model_name)
+        try:
+            done, _ = await asyncio.wait(legs, timeout=delay)
+            if not done:
+                logger.info(
+                    f"{self.model_name} has not answered in {delay:.1f}s, "
+                    f"hedging with {fallback}"
+                )
+                _start_fallback()
+            while legs:
+                done, _ = await asyncio.wait(legs, return_when=asyncio.FIRST_COMPLETED)
+                for leg in done:
+                    model = legs.pop(leg)
+                    try:
+                        parsed_response, token_usage = leg.result()
+                    except Exception as e:
+                        logger.warning(f"Hedged call to {model} failed: {e}")
+                        last_exception = e
+                        _start_fallback()
+                        continue
+                    total_token_usage += token_usage
+                    if parsed_response is None:
+                        _start_fallback()
+                        continue
+                    for loser, loser_model in legs.items():
+                        total_token_usage += self._losing_leg_usage(
+                            loser, messages, loser_model
+                        )
+                    legs.clear()
+                    note_served_by(model)
+                    metrics.inc(
+                        metrics.LLM_HEDGES_TOTAL,
+                        model=self.model_name,
+                        winner="primary" if model == self.model_name else "fallback",
+                    )
+                    return parsed_response, total_token_usage
+        finally:
+            for leg in legs:
+                leg.cancel()
+
+        if last_exception is not None:
+            raise last_exception
+        return None, total_token_usage
@@ -1,13 +1,27 @@
 import ast
+import asyncio
 import logging
+import random
 import re
 import time
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import litellm
 from pydantic import BaseModel
 
+from optexity.inference.models.response_cache import (
+    ResponseCache,
+    get_response_cache,
+    response_cache_key,
+)
+from optexity.inference.models.telemetry import (
+    LLMCallRecord,
+    note_served_by,
+    record_llm_call,
+    served_by,
+)
 from optexity.schema.token_usage import TokenUsage
 
 logger = logging.getLogger(__name__)
@@ -54,6 +68,66 @@ def parse_json_from_completion(
     raise ValueError("Could not parse response from completion.")
 
 
+def retry_delay_seconds(attempt: int) -> float:
+    """Backoff before retry ``attempt + 1``: 5 s doubling, with +/-50% jitter so
+    concurrent workers hitting the same provider error don't retry in lockstep."""
+    return 5 * 2**attempt * random.uniform(0.5, 1.5)
+
+
+class _Attempts:
+    """Retry, response-cache and telemetry bookkeeping for one public call.
+
+    The sync and async entry points share it and differ only in how they make
+    the completion call and wait between attempts."""
+
+    max_retries = 3
+
+    def __init__(
+        self,
+        label: str,
+        record_telemetry: Callable[..., None],
+        token_usage: Optional[TokenUsage] = None,
+        store: Optional[Callable[[BaseModel], None]] = None,
+    ):
+        self.label = label
+        self.record_telemetry = record_telemetry
+        self.token_usage = token_usage or TokenUsage()
+        self.store = store
+        self.last_exception = ""
+
+    def __iter__(self):
+        return iter(range(self.max_retries))
+
+    def succeeded(self, attempt: int, response, token_usage: TokenUsage) -> bool:
+        """Account for one completion; True when it produced a response."""
+        self.token_usage += token_usage
+        if response is None:
+            return False
+        if self.store is not None:
+            self.store(response)
+        self.record_telemetry(attempt + 1, self.token_usage)
+        return True
+
+    def failed(self, attempt: int, error: Exception) -> float:
+        """Note a failed attempt and return how long to wait before the next."""
+        logger.error(f"{self.label} Error during inference: {error}")
+        self.last_exception = str(error)
+        if attempt >= self.max_retries - 1:
+            return 0
+        logger.info(f"Retrying... {attempt + 1}/{self.max_retries}")
+        return retry_delay_seconds(attempt)
+
+    def exhausted(self) -> Exception:
+        self.record_telemetry(
+            self.max_retries,
+            self.token_usage,
+            error=self.last_exception or "no parseable response",
+        )
+        return Exception(
+            f"Max retries exceeded for {self.label}\n{self.last_exception}"
+        )
+
+
 class LLMModel:
     def __init__(self, model_name: str, use_structured_output: bool):
 
@@ -75,21 +149,171 @@ class LLMModel:
     ) -> tuple[BaseModel, TokenUsage]:
         raise NotImplementedError("This method should be implemented by subclasses.")
 
-    def get_model_response(
+    async def _aget_model_response(
         self, prompt: str, system_instruction: Optional[str] = None
     ) -> tuple[str, TokenUsage]:
+        # Subclasses without a native async client still keep the loop free.
+        return await asyncio.to_thread(
+            self._get_model_response, prompt, system_instruction
+        )
+
+    async def _aget_model_response_with_structured_output(
+        self,
+        prompt: str,
+        response_schema: type[BaseModel],
+        screenshot: Optional[str] = None,
+        pdf_url: Optional[str | Path] = None,
+        system_instruction: Optional[str] = None,
+    ) -> tuple[BaseModel | None, TokenUsage]:
+        return await asyncio.to_thread(
+            self._get_model_response_with_structured_output,
+            prompt,
+            response_schema,
+            screenshot,
+            pdf_url,
+            system_instruction,
+        )
+
+    def _lookup_cached_response(
+        self,
+        prompt: str,
+        response_schema: type[BaseModel],
+        screenshot: Optional[str],
+        pdf_url: Optional[str | Path],
+        system_instruction: Optional[str],
+    ) -> tuple[ResponseCache | None, str, BaseModel | None]:
+        """(cache, key, cached response); cache is None when caching is off."""
+        if pdf_url is not None:
+            return None, "", None
+        cache = get_response_cache()
+        if cache is None:
+            return None, "", None
+        key = response_cache_key(
+            self.model_name, prompt, response_schema, screenshot, system_instruction
+        )
+        try:
+            cached = cache.get(key)
+            if cached is not None:
+                logger.info(f"LLM response cache hit for {self.model_name}")
+                return cache, key, response_schema.model_validate_json(cached)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached LLM response: {e}")
+        return cache, key, None
+
+    def _store_cached_response(
+        self, cache: ResponseCache, key: str, response: BaseModel
+    ) -> None:
+        try:
+            cache.put(key, response.model_dump_json(by_alias=True))
+        except Exception as e:
+            logger.warning(f"Failed to cache LLM response: {e}")
+
+    def _begin_step_telemetry(
+        self,
+        agent_name: Optional[str],
+        prompt: str,
+        axtree: Optional[str] = None,
+        screenshot: Optional[str] = None,
+        pdf_url: Optional[str | Path] = None,
+    ) -> Callable[..., None]:
+        """Start timing a public call; the returned function records its
+        LLMCallRecord given (attempts, token_usage, error=, cache_hit=)."""
+        note_served_by(None)
+        return partial(
+            self._record_step_telemetry,
+            agent_name,
+            prompt,
+            axtree,
+            screenshot,
+            pdf_url,
+            time.monotonic(),
+        )
+
+    def _record_step_telemetry(
+        self,
+        agent_name: Optional[str],
+        prompt: str,
+        axtree: Optional[str],
+        screenshot: Optional[str],
+        pdf_url: Optional[str | Path],
+        started: float,
+        attempts: int,
+        token_usage: TokenUsage,
+        error: Optional[str] = None,
+        cache_hit: bool = False,
+    ) -> None:
+        served = served_by()
+        record_llm_call(
+            LLMCallRecord(
+                agent=agent_name,
+                model=self.model_name,
+                served_by=served if served != self.model_name else None,
+                fallback_used=served is not None and served != self.model_name,
+                cache_hit=cache_hit,
+                input_tokens=token_usage.input_tokens,
+                output_tokens=token_usage.output_tokens,
+                reasoning_tokens=token_usage.thoughts_tokens,
+                prompt_bytes=len(prompt.encode()),
+                axtree_bytes=len(axtree.encode()) if axtree else 0,
+                screenshot_bytes=len(screenshot) if screenshot else 0,
+                pdf=pdf_url is not None,
+                wall_seconds=time.monotonic() - started,
+                retries=max(attempts - 1, 0),
+                error=error,
+            )
+        )
 
-        max_retries = 3
-        for i in range(max_retries):
+    def _structured_attempts(
+        self,
+        prompt: str,
+        response_schema: type[BaseModel],
+        screenshot: Optional[str],
+        pdf_url: Optional[str | Path],
+        system_instruction: Optional[str],
+        agent_name: Optional[str],
+        axtree: Optional[str],
+    ) -> tuple["_Attempts", BaseModel | None]:
+        """Attempts for a structured call, and the cached response if any (then
+        already recorded as a cache hit)."""
+        record_telemetry = self._begin_step_telemetry(
+            agent_name, prompt, axtree, screenshot, pdf_url
+        )
+        cache, cache_key, cached = self._lookup_cached_response(
+            prompt, response_schema, screenshot, pdf_url, system_instruction
+        )
+        if cached is not None:
+            record_telemetry(0, TokenUsage(), cache_hit=True)
+        attempts = _Attempts(
+            "LLM with structured output",
+            record_telemetry,
+            TokenUsage(cache_misses=1 if cache is not None else 0),
+            store=(
+                partial(self._store_cached_response, cache, cache_key)
+                if cache is not None
+                else None
+            ),
+        )
+        return attempts, cached
+
+    def get_model_response(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        agent_name: Optional[str] = None,
+    ) -> tuple[str, TokenUsage]:
+        """``agent_name`` labels the call in the step's LLM telemetry."""
+
+        attempts = _Attempts("LLM", self._begin_step_telemetry(agent_name, prompt))
+        for i in attempts:
             try:
-                return self._get_model_response(prompt, system_instruction)
+                response, token_usage = self._get_model_response(
+                    prompt, system_instruction
+                )
+                if attempts.succeeded(i, response, token_usage):
+                    return response, attempts.token_usage
             except Exception as e:
-                logger.error(f"LLM Error during inference: {e}")
-                if i < max_retries - 1:
-                    logger.info(f"Retrying... {i + 1}/{max_retries}")
-                    time.sleep(5)
-                continue
-        raise Exception("Max retries exceeded for LLM")
+                time.sleep(attempts.failed(i, e))
+        raise attempts.exhausted()
 
     def get_model_response_with_structured_output(
         self,
@@ -98,14 +322,25 @@ class LLMModel:
         screenshot: Optional[str] = None,
         pdf_url: Optional[str | Path] = None,
         system_instruction: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        axtree: Optional[str] = None,
     ) -> tuple[BaseModel, TokenUsage]:
+        """``agent_name`` and ``axtree`` (the part of ``prompt`` that is the
+        page's axtree) only feed the step's LLM telemetry."""
 
-        total_token_usage = TokenUsage()
-        max_retries = 3
-        last_exception = ""
-        for i in range(max_retries):
+        attempts, cached = self._structured_attempts(
+            prompt,
+            response_schema,
+            screenshot,
+            pdf_url,
+            system_instruction,
+            agent_name,
+            axtree,
+        )
+        if cached is not None:
+            return cached, TokenUsage(cache_hits=1)
+        for i in attempts:
             try:
-                # raise Exception("Test error")
                 parsed_response, token_usage = (
                     self._get_model_response_with_structured_output(
                         prompt=prompt,
@@ -115,21 +350,71 @@ class LLMModel:
                         system_instruction=system_instruction,
                     )
                 )
-                total_token_usage += token_usage
-                if parsed_response is not None:
-                    return parsed_response, total_token_usage
+                if attempts.succeeded(i, parsed_response, token_usage):
+                    return parsed_response, attempts.token_usage
             except Exception as e:
-                logger.error(f"LLM with structured output Error during inference: {e}")
-                if i < max_retries - 1:
-                    logger.info(f"Retrying... {i + 1}/{max_retries}")
-                    time.sleep(5)
-                last_exception = str(e)
-
-        raise Exception(
-            "Max retries exceeded for LLM with structured output"
-            + "\n"
-            + last_exception
+                time.sleep(attempts.failed(i, e))
+        raise attempts.exhausted()
+
+    async def aget_model_response(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        agent_name: Optional[str] = None,
+    ) -> tuple[str, TokenUsage]:
+        """Async get_model_response: never blocks the event loop, even on retry."""
+
+        attempts = _Attempts("LLM", self._begin_step_telemetry(agent_name, prompt))
+        for i in attempts:
+            try:
+                response, token_usage = await self._aget_model_response(
+                    prompt, system_instruction
+                )
+                if attempts.succeeded(i, response, token_usage):
+                    return response, attempts.token_usage
+            except Exception as e:
+                await asyncio.sleep(attempts.failed(i, e))
+        raise attempts.exhausted()
+
+    async def aget_model_response_with_structured_output(
+        self,
+        prompt: str,
+        response_schema: type[BaseModel],
+        screenshot: Optional[str] = None,
+        pdf_url: Optional[str | Path] = None,
+        system_instruction: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        axtree: Optional[str] = None,
+    ) -> tuple[BaseModel, TokenUsage]:
+        """Async get_model_response_with_structured_output."""
+
+        attempts, cached = self._structured_attempts(
+            prompt,
+            response_schema,
+            screenshot,
+            pdf_url,
+            system_instruction,
+            agent_name,
+            axtree,
         )
+        if cached is not None:
+            return cached, TokenUsage(cache_hits=1)
+        for i in attempts:
+            try:
+                parsed_response, token_usage = (
+                    await self._aget_model_response_with_structured_output(
+                        prompt=prompt,
+                        response_schema=response_schema,
+                        screenshot=screenshot,
+                        pdf_url=pdf_url,
+                        system_instruction=system_instruction,
+                    )
+                )
+                if attempts.succeeded(i, parsed_response, token_usage):
+                    return parsed_response, attempts.token_usage
+            except Exception as e:
+                await asyncio.sleep(attempts.failed(i, e))
+        raise attempts.exhausted()
 
     def extract_json_objects(self, text):
         return extract_json_objects(text)
@@ -146,7 +431,10 @@ class LLMModel:
         tool_use_tokens: int | None = None,
         thoughts_tokens: int | None = None,
         total_tokens: Optional[int] = None,
+        model_name: Optional[str] = None,
     ) -> TokenUsage:
+        """Token counts priced for ``model_name`` (default: this model)."""
+        model_name = model_name or self.model_name
         if input_tokens is None:
             input_tokens = 0
         if output_tokens is None:
@@ -164,13 +452,13 @@ class LLMModel:
         tool_use_cost = thoughts_cost = 0.0
         try:
             input_cost, output_cost = litellm.cost_per_token(
-                model=self.model_name,
+                model=model_name,
                 prompt_tokens=input_tokens,
                 completion_tokens=output_tokens,
             )
         except Exception as e:
             logger.warning(
-                f"Model {self.model_name} has no litellm pricing data ({e}). "
+                f"Model {model_name} has no litellm pricing data ({e}). "
                 f"Cost will be reported as 0."
             )
             input_cost = output_cost = 0.0
@@ -0,0 +1,206 @@
+"""PDF inputs for LLM calls.
+
+A PDF used to be read whole into memory (or fetched with a blocking
+``httpx.get``) and base64-encoded on every attempt. Now:
+
+- URLs are streamed to disk with the async client, hashing as they arrive.
+  They are fetched on every call, so a document that changed behind its URL
+  is never served from the cache.
+- Encoded payloads are kept in a small in-memory cache keyed by the file's
+  SHA-256, so retries and repeated extractions of the same statement encode it
+  once (``LLM_PDF_PAYLOAD_CACHE_MAX_BYTES``).
+- ``extract_text_layer`` reads the PDF's embedded text locally so callers can
+  send that (optionally for selected pages only) instead of the binary. It needs
+  the optional ``pypdf`` package (``pip install optexity[pdf]``); without it,
+  or for scanned PDFs with no text layer, it returns None.
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+
+from optexity.utils.llm_settings import llm_settings
+from optexity.utils.utils import is_local_path, is_url
+
+logger = logging.getLogger(__name__)
+
+_DOWNLOAD_DIR = Path(tempfile.gettempdir()) / "optexity_pdf_downloads"
+# A multiple of 3 so chunk encodings concatenate into one valid base64 string.
+_CHUNK_BYTES = 3 * 1024 * 1024
+# Average characters per page for a PDF to count as having a text layer.
+_MIN_TEXT_CHARS_PER_PAGE = 100
+
+
+class _PayloadCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._payloads: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+
+    def get(self, digest: str) -> str | None:
+        with self._lock:
+            payload = self._payloads.get(digest)
+            if payload is not None:
+                self._payloads.move_to_end(digest)
+            return payload
+
+    def put(self, digest: str, payload: str) -> None:
+        max_bytes = llm_settings.LLM_PDF_PAYLOAD_CACHE_MAX_BYTES
+        if len(payload) > max_bytes:
+            return
+        with self._lock:
+            if digest in self._payloads:
+                return
+            self._payloads[digest] = payload
+            self._size += len(payload)
+            while self._size > max_bytes:
+                _, evicted = self._payloads.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_payload_cache = _PayloadCache()
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_file(path: Path) -> str:
+    parts: list[str] = []
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_BYTES):
+            parts.append(base64.standard_b64encode(chunk).decode("ascii"))
+    return "".join(parts)
+
+
+def _download_path() -> Path:
+    _DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    return _DOWNLOAD_DIR / f"{uuid.uuid4().hex}.pdf"
+
+
+async def adownload_pdf(url: str) -> tuple[Path, str]:
+    """Stream ``url`` to a temporary file; returns (path, sha256)."""
+    path = _download_path()
+    digest = hashlib.sha256()
+    async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            with open(path, "wb") as f:
+                async for chunk in response.aiter_bytes(_CHUNK_BYTES):
+                    digest.update(chunk)
+                    f.write(chunk)
+    return path, digest.hexdigest()
+
+
+def download_pdf(url: str) -> tuple[Path, str]:
+    path = _download_path()
+    digest = hashlib.sha256()
+    with httpx.stream("GET", url, follow_redirects=True, timeout=60.0) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_bytes(_CHUNK_BYTES):
+                digest.update(chunk)
+                f.write(chunk)
+    return path, digest.hexdigest()
+
+
+def _encoded(path: Path, digest: str) -> str:
+    payload = _payload_cache.get(digest)
+    if payload is None:
+        payload = _encode_file(path)
+        _payload_cache.put(digest, payload)
+    return payload
+
+
+async def apdf_base64(pdf_url: str | Path) -> str:
+    """Base64 of a local PDF or URL, without blocking the event loop."""
+    if is_local_path(pdf_url):
+        path = Path(str(pdf_url)).expanduser()
+        digest = await asyncio.to_thread(_hash_file, path)
+        return await asyncio.to_thread(_encoded, path, digest)
+    if is_url(pdf_url):
+        path, digest = await adownload_pdf(str(pdf_url))
+        try:
+            return await asyncio.to_thread(_encoded, path, digest)
+        finally:
+            path.unlink(missing_ok=True)
+    raise ValueError(f"Invalid pdf_url: {pdf_url}")
+
+
+def pdf_base64(pdf_url: str | Path) -> str:
+    if is_local_path(pdf_url):
+        path = Path(str(pdf_url)).expanduser()
+        return _encoded(path, _hash_file(path))
+    if is_url(pdf_url):
+        path, digest = download_pdf(str(pdf_url))
+        try:
+            return _encoded(path, digest)
+        finally:
+            path.unlink(missing_ok=True)
+    raise ValueError(f"Invalid pdf_url: {pdf_url}")
+
+
+def _selected(page_count: int, pages: list[int] | None) -> list[int]:
+    """0-based page numbers for 1-based ``pages`` (None = all)."""
+    if not pages:
+        return list(range(page_count))
+    return [p - 1 for p in pages if 1 <= p <= page_count]
+
+
+def extract_text_layer(
+    path: Path, pages: list[int] | None = None
+) -> list[tuple[int, str]] | None:
+    """[(1-based page number, text)] from the PDF's embedded text, or None when
+    pypdf is unavailable or the document looks scanned."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    try:
+        reader = PdfReader(path)
+        selected = _selected(len(reader.pages), pages)
+        texts = [(i + 1, reader.pages[i].extract_text() or "") for i in selected]
+    except Exception as e:
+        logger.warning(f"Could not read the text layer of {path}: {e}")
+        return None
+    if not texts:
+        return None
+    chars = sum(len("".join(text.split())) for _, text in texts)
+    if chars / len(texts) < _MIN_TEXT_CHARS_PER_PAGE:
+        return None
+    return texts
+
+
+def write_page_subset(path: Path, pages: list[int]) -> Path | None:
+    """A copy of ``path`` holding only ``pages`` (1-based), next to the original;
+    None when pypdf is unavailable. The caller deletes it once sent."""
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        return None
+    try:
+        reader = PdfReader(path)
+        writer = PdfWriter()
+        for i in _selected(len(reader.pages), pages):
+            writer.add_page(reader.pages[i])
+        subset = path.with_name(
+            f"{path.stem}.pages-{'-'.join(map(str, pages))}{path.suffix}"
+        )
+        with open(subset, "wb") as f:
+            writer.write(f)
+        return subset
+    except Exception as e:
+        logger.warning(f"Could not extract pages {pages} from {path}: {e}")
+        return None
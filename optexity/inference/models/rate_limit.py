@@ -0,0 +1,300 @@
+"""Client-side rate limiting and concurrency governor for LLM calls.
+
+Every completion used to go straight to the provider, so raising concurrency
+(more children, parallel extractions) turned into 429s that were retried
+blindly. ``LLM_RATE_LIMITS`` configures token buckets for requests and tokens
+per minute, keyed by litellm model string or by provider prefix::
+
+    LLM_RATE_LIMITS='{"gemini": {"rpm": 1000, "tpm": 4000000},
+                      "anthropic/claude-sonnet-4-6": {"rpm": 50, "concurrency": 8}}'
+
+A call reserves one request and its estimated tokens before it is sent and
+waits until both buckets cover it; the estimate is corrected from the
+response's usage. A 429 with Retry-After blocks the model for that long.
+Models with no configured limits skip the buckets and only honour such a
+block, recorded in the process.
+
+``concurrency`` caps the calls to a model that are in flight in this process
+at once; further calls wait for a slot before reserving from the buckets.
+
+Buckets live in the process by default. With ``LLM_RATE_LIMIT_STATE_DIR`` they
+are kept in small JSON files guarded by ``flock``, so every worker and child on
+the host draws from the same budget.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any
+
+from optexity.inference import metrics
+from optexity.utils.llm_settings import llm_settings
+
+logger = logging.getLogger(__name__)
+
+# Tokens assumed for an image or PDF part when estimating a request up front.
+_ATTACHMENT_TOKENS = 1500
+# How often an async call waiting for an in-flight slot checks again.
+_SLOT_POLL_SECONDS = 0.05
+
+
+def rate_limits_for(model: str) -> dict[str, float] | None:
+    """The configured limits for a model: exact model string first, then its
+    provider prefix."""
+    limits = llm_settings.LLM_RATE_LIMITS
+    if model in limits:
+        return limits[model]
+    provider = model.split("/")[0] if "/" in model else ""
+    return limits.get(provider) if provider else None
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough prompt size (4 characters per token) used for the reservation."""
+    tokens = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += len(content) // 4
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                tokens += len(part.get("text", "")) // 4
+            else:
+                tokens += _ATTACHMENT_TOKENS
+    return tokens
+
+
+def _refill(state: dict, limits: dict[str, float], now: float) -> None:
+    elapsed = max(0.0, now - state.get("updated_at", now))
+    for kind in ("rpm", "tpm"):
+        capacity = limits.get(kind)
+        if not capacity:
+            continue
+        level = state.get(kind, capacity)
+        state[kind] = min(capacity, level + elapsed * capacity / 60)
+    state["updated_at"] = now
+
+
+def _reserve(state: dict, limits: dict[str, float], tokens: int, now: float) -> float:
+    """Take one request and ``tokens`` from the buckets, going into debt if
+    needed, and return how long the caller must wait for the debt to clear."""
+    _refill(state, limits, now)
+    wait = max(0.0, state.get("blocked_until", 0.0) - now)
+    for kind, amount in (("rpm", 1), ("tpm", tokens)):
+        capacity = limits.get(kind)
+        if not capacity:
+            continue
+        state[kind] -= amount
+        if state[kind] < 0:
+            wait = max(wait, -state[kind] * 60 / capacity)
+    return wait
+
+
+class _LocalBuckets:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: dict[str, dict] = {}
+
+    def update(self, model: str, change) -> Any:
+        with self._lock:
+            return change(self._states.setdefault(model, {}))
+
+
+class _SharedBuckets:
+    """Bucket state in ``<dir>/<model>.json``, one ``flock`` per update."""
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+
+    def update(self, model: str, change) -> Any:
+        path = self.directory / (model.replace("/", "__") + ".json")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "r+") as f:
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                result = change(state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+            return result
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+_buckets: _LocalBuckets | _SharedBuckets | None = None
+# Retry-After deadlines of models without configured limits.
+_blocked_until: dict[str, float] = {}
+
+
+def _get_buckets() -> _LocalBuckets | _SharedBuckets:
+    global _buckets
+    if _buckets is None:
+        if llm_settings.LLM_RATE_LIMIT_STATE_DIR:
+            _buckets = _SharedBuckets(Path(llm_settings.LLM_RATE_LIMIT_STATE_DIR))
+        else:
+            _buckets = _LocalBuckets()
+    return _buckets
+
+
+_slots: dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+
+def _in_flight_slots(model: str) -> threading.BoundedSemaphore | None:
+    limits = rate_limits_for(model)
+    concurrency = int(limits.get("concurrency") or 0) if limits else 0
+    if concurrency <= 0:
+        return None
+    with _slots_lock:
+        if model not in _slots:
+            _slots[model] = threading.BoundedSemaphore(concurrency)
+        return _slots[model]
+
+
+@contextmanager
+def in_flight(model: str):
+    """Hold one of ``model``'s in-flight slots for the duration of a call."""
+    slots = _in_flight_slots(model)
+    if slots is None:
+        yield
+        return
+    start = time.monotonic()
+    slots.acquire()
+    _log_slot_wait(model, time.monotonic() - start)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+@asynccontextmanager
+async def ain_flight(model: str):
+    # Shared with sync callers in worker threads, so the event loop polls the
+    # semaphore instead of blocking on it.
+    slots = _in_flight_slots(model)
+    if slots is None:
+        yield
+        return
+    start = time.monotonic()
+    while not slots.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_SECONDS)
+    _log_slot_wait(model, time.monotonic() - start)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def _log_slot_wait(model: str, wait: float) -> None:
+    if wait > 1:
+        logger.info(f"{model} at its in-flight limit: waited {wait:.1f}s")
+
+
+def _blocked_wait(model: str) -> float:
+    return max(0.0, _blocked_until.get(model, 0.0) - time.time())
+
+
+def _reservation_wait(
+    model: str, tokens: int, limits: dict[str, float]
+) -> float | None:
+    try:
+        return _get_buckets().update(
+            model, lambda state: _reserve(state, limits, tokens, time.time())
+        )
+    except Exception as e:
+        logger.warning(f"LLM rate limiter unavailable for {model}: {e}")
+        return None
+
+
+def _log_wait(model: str, wait: float) -> None:
+    metrics.observe(metrics.LLM_RATE_LIMIT_WAIT_SECONDS, wait, model=model)
+    if wait > 1:
+        logger.info(f"Rate limiting {model}: waiting {wait:.1f}s")
+
+
+def acquire(model: str, tokens: int) -> None:
+    """Block until ``model`` has budget for one request of ``tokens``."""
+    limits = rate_limits_for(model)
+    if limits:
+        wait = _reservation_wait(model, tokens, limits)
+    else:
+        wait = _blocked_wait(model)
+    if wait is None:
+        return
+    _log_wait(model, wait)
+    if wait > 0:
+        time.sleep(wait)
+
+
+async def aacquire(model: str, tokens: int) -> None:
+    limits = rate_limits_for(model)
+    if limits:
+        wait = await asyncio.to_thread(_reservation_wait, model, tokens, limits)
+    else:
+        wait = _blocked_wait(model)
+    if wait is None:
+        return
+    _log_wait(model, wait)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+def settle(model: str, reserved_tokens: int, used_tokens: int) -> None:
+    """Return (or charge) the difference between the estimate and actual usage."""
+    limits = rate_limits_for(model)
+    if not limits or not limits.get("tpm") or used_tokens == reserved_tokens:
+        return
+
+    def _settle(state: dict) -> None:
+        _refill(state, limits, time.time())
+        state["tpm"] = min(limits["tpm"], state["tpm"] + reserved_tokens - used_tokens)
+
+    try:
+        _get_buckets().update(model, _settle)
+    except Exception as e:
+        logger.warning(f"LLM rate limiter unavailable for {model}: {e}")
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Retry-After from a provider error, if it carried one."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        headers = getattr(error, "litellm_response_headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def block(model: str, seconds: float) -> None:
+    """Hold every call to ``model`` for ``seconds`` (a provider's Retry-After).
+    Applies to unconfigured models too, so a 429 is honoured everywhere."""
+    until = time.time() + seconds
+
+    def _block(state: dict) -> None:
+        state["blocked_until"] = max(state.get("blocked_until", 0.0), until)
+
+    logger.info(f"{model} asked to retry after {seconds:.0f}s")
+    if not rate_limits_for(model):
+        _blocked_until[model] = max(_blocked_until.get(model, 0.0), until)
+        return
+    try:
+        _get_buckets().update(model, _block)
+    except Exception as e:
+        logger.warning(f"LLM rate limiter unavailable for {model}: {e}")
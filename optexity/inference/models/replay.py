@@ -0,0 +1,145 @@
+"""Record/replay of LLM completions, for benchmarking the runner offline.
+
+With ``LLM_REPLAY_MODE=record`` every completion made through
+``LiteLLMModel`` is appended to ``LLM_REPLAY_FIXTURE_PATH`` (JSON lines: request
+key, model, response schema, observed latency, raw response). With
+``LLM_REPLAY_MODE=replay`` no request leaves the process: each completion is
+answered from the fixture after a synthetic delay — the recorded latency
+scaled by ``LLM_REPLAY_LATENCY_SCALE``, or a fixed ``LLM_REPLAY_LATENCY_SECONDS``
+— so full automations can be profiled and load-tested with no network or API
+keys.
+
+Requests are matched on a hash of model, messages and response format. Pages
+rarely render byte-identical axtrees and screenshots twice, so a request with
+no exact match is answered with the next recorded response for the same model
+and response schema, in recorded order. Repeated requests walk through their
+recorded responses and then keep returning the last one.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+import litellm
+
+from optexity.utils.llm_settings import llm_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMissError(RuntimeError):
+    """The fixture holds no response for a request made in replay mode."""
+
+
+def _hashed_attachments(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Messages with inline images/PDFs replaced by their digest."""
+    hashed = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            parts = []
+            for part in content:
+                if part.get("type") != "text":
+                    blob = json.dumps(part, sort_keys=True).encode()
+                    part = {
+                        "type": part.get("type"),
+                        "sha256": hashlib.sha256(blob).hexdigest(),
+                    }
+                parts.append(part)
+            message = {**message, "content": parts}
+        hashed.append(message)
+    return hashed
+
+
+def request_key(model: str, messages: list[dict[str, Any]], **kwargs) -> str:
+    payload = {
+        "model": model,
+        "messages": _hashed_attachments(messages),
+        "response_format": kwargs.get("response_format"),
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def response_stream(model: str, **kwargs) -> str:
+    """The sequence a request falls back to when it has no exact match."""
+    response_format = kwargs.get("response_format") or {}
+    schema = response_format.get("json_schema", {}).get("schema", {})
+    return f"{model}:{schema.get('title', 'text')}"
+
+
+class ReplayFixture:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_key: dict[str, list[dict]] = {}
+        self._by_stream: dict[str, list[dict]] = {}
+        self._cursors: dict[str, int] = {}
+        if path.exists():
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def _index(self, entry: dict) -> None:
+        self._by_key.setdefault(entry["key"], []).append(entry)
+        self._by_stream.setdefault(entry["stream"], []).append(entry)
+
+    def _next(self, name: str, entries: list[dict]) -> dict:
+        cursor = self._cursors.get(name, 0)
+        self._cursors[name] = cursor + 1
+        return entries[min(cursor, len(entries) - 1)]
+
+    def lookup(self, key: str, stream: str) -> dict:
+        with self._lock:
+            if key in self._by_key:
+                return self._next(f"key:{key}", self._by_key[key])
+            if stream in self._by_stream:
+                logger.debug(f"No exact replay match, replaying next {stream}")
+                return self._next(f"stream:{stream}", self._by_stream[stream])
+        raise ReplayMissError(f"No recorded LLM response for {stream} in {self.path}")
+
+    def record(self, key: str, stream: str, latency_seconds: float, response) -> None:
+        entry = {
+            "key": key,
+            "stream": stream,
+            "latency_seconds": latency_seconds,
+            "response": response.model_dump(mode="json"),
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._index(entry)
+            with open(self.path, "a") as f:
+                f.write(line)
+
+
+_fixture: ReplayFixture | None = None
+
+
+def get_replay_fixture() -> ReplayFixture | None:
+    """The fixture for the configured mode, or None when replay is off."""
+    global _fixture
+    if not llm_settings.LLM_REPLAY_MODE:
+        return None
+    if _fixture is None:
+        if not llm_settings.LLM_REPLAY_FIXTURE_PATH:
+            raise ValueError("LLM_REPLAY_MODE requires LLM_REPLAY_FIXTURE_PATH")
+        path = Path(llm_settings.LLM_REPLAY_FIXTURE_PATH).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _fixture = ReplayFixture(path)
+        logger.info(f"LLM {llm_settings.LLM_REPLAY_MODE} mode using {path}")
+    return _fixture
+
+
+def replay_latency_seconds(entry: dict) -> float:
+    if llm_settings.LLM_REPLAY_LATENCY_SECONDS is not None:
+        return llm_settings.LLM_REPLAY_LATENCY_SECONDS
+    return entry.get("latency_seconds", 0.0) * llm_settings.LLM_REPLAY_LATENCY_SCALE
+
+
+def replayed_response(entry: dict) -> litellm.ModelResponse:
+    return litellm.ModelResponse(**entry["response"])
@@ -0,0 +1,178 @@
+"""Content-addressed cache of structured LLM responses.
+
+Recurring workflows often send byte-identical prompts (same axtree, goal and
+screenshot) run after run. A response is cached under a hash of everything that
+determines it (model, system instruction, prompt, screenshot, response schema),
+so a hit costs a local lookup instead of a completion. PDF prompts are never
+cached.
+
+The backend is pluggable through ``set_response_cache``; the default is a local
+SQLite file (``LLM_RESPONSE_CACHE_PATH``) with a TTL and a total-size cap that
+evicts least-recently-used entries. Automations opt out with
+``llm_response_cache=False``, which the task runner applies through
+``set_response_cache_enabled``.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from optexity.inference.models.schema_cache import compile_schema
+from optexity.utils.llm_settings import llm_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Backend interface: values are the serialized response model."""
+
+    def get(self, key: str) -> str | None:
+        raise NotImplementedError("This method should be implemented by subclasses.")
+
+    def put(self, key: str, value: str) -> None:
+        raise NotImplementedError("This method should be implemented by subclasses.")
+
+
+class SQLiteResponseCache(ResponseCache):
+    # Re-check the size cap every this many writes rather than on each one.
+    _EVICT_EVERY = 50
+
+    def __init__(self, path: Path, ttl_seconds: float, max_bytes: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._writes = 0
+        # Shared by every worker on the host; WAL lets readers and the writer
+        # proceed concurrently and the timeout rides out brief write locks.
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        now = time.time()
+        if now - created_at > self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        self._conn.execute(
+            "UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key)
+        )
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, created_at, last_used_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._writes += 1
+        if self._writes % self._EVICT_EVERY == 0:
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale: list[str] = []
+        for key, size in self._conn.execute(
+            "SELECT key, LENGTH(value) FROM responses ORDER BY last_used_at"
+        ):
+            stale.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany(
+            "DELETE FROM responses WHERE key = ?", [(k,) for k in stale]
+        )
+        logger.info(f"Evicted {len(stale)} cached LLM responses ({freed} bytes)")
+
+
+_cache: ResponseCache | None = None
+_cache_initialized = False
+_cache_enabled: ContextVar[bool] = ContextVar(
+    "llm_response_cache_enabled", default=True
+)
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Install a custom backend (or None to disable caching)."""
+    global _cache, _cache_initialized
+    _cache = cache
+    _cache_initialized = True
+
+
+def set_response_cache_enabled(enabled: bool) -> None:
+    """Per-automation opt-out; applies to the current task's context."""
+    _cache_enabled.set(enabled)
+
+
+def get_response_cache() -> ResponseCache | None:
+    """The active backend, or None when caching is off for this call."""
+    global _cache, _cache_initialized
+    if not _cache_enabled.get():
+        return None
+    if not _cache_initialized:
+        _cache_initialized = True
+        if llm_settings.LLM_RESPONSE_CACHE_PATH:
+            try:
+                _cache = SQLiteResponseCache(
+                    Path(llm_settings.LLM_RESPONSE_CACHE_PATH),
+                    ttl_seconds=llm_settings.LLM_RESPONSE_CACHE_TTL_SECONDS,
+                    max_bytes=llm_settings.LLM_RESPONSE_CACHE_MAX_BYTES,
+                )
+            except Exception as e:
+                logger.warning(f"LLM response cache disabled: {e}")
+    return _cache
+
+
+def _digest(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def response_cache_key(
+    model_name: str,
+    prompt: str,
+    response_schema: type[BaseModel],
+    screenshot: Optional[str] = None,
+    system_instruction: Optional[str] = None,
+) -> str:
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "system_instruction": _digest(system_instruction),
+            "prompt": _digest(prompt),
+            "screenshot": _digest(screenshot),
+            "schema": compile_schema(response_schema).json_schema,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,75 @@
+"""Per-class cache of the JSON schemas sent with structured LLM calls.
+
+``model_json_schema()`` and the space-in-key sanitization used to run on every
+call. Extraction response models are now shared across identical
+``extraction_format``s (see ``optexity.utils.utils.build_model``), so keying
+on the class lets a for-loop over hundreds of rows compile its schema once.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+
+_SPACE_PLACEHOLDER = "_._"
+
+
+def _sanitize_schema_keys(obj):
+    """Recursively replace spaces in dict keys with _._
+
+    Anthropic rejects tool schemas with spaces in property names, and extraction
+    schemas come from user-authored workflow JSON where spaces are common.
+    """
+    if isinstance(obj, dict):
+        return {
+            k.replace(" ", _SPACE_PLACEHOLDER): _sanitize_schema_keys(v)
+            for k, v in obj.items()
+        }
+    elif isinstance(obj, list):
+        return [_sanitize_schema_keys(item) for item in obj]
+    return obj
+
+
+def _sanitized_keys(obj, mapping: dict[str, str]) -> None:
+    """Collect {sanitized: original} for every key of the schema that changes."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if " " in k:
+                mapping[k.replace(" ", _SPACE_PLACEHOLDER)] = k
+            _sanitized_keys(v, mapping)
+    elif isinstance(obj, list):
+        for item in obj:
+            _sanitized_keys(item, mapping)
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    json_schema: dict[str, Any]
+    sanitized_schema: dict[str, Any]
+    # sanitized key -> original key, only for keys that contained spaces
+    restore_keys: dict[str, str]
+
+    def restore(self, obj):
+        """Undo the key sanitization on a response parsed from JSON."""
+        if not self.restore_keys:
+            return obj
+        if isinstance(obj, dict):
+            return {
+                self.restore_keys.get(k, k): self.restore(v) for k, v in obj.items()
+            }
+        elif isinstance(obj, list):
+            return [self.restore(item) for item in obj]
+        return obj
+
+
+@lru_cache(maxsize=256)
+def compile_schema(response_schema: type[BaseModel]) -> CompiledSchema:
+    json_schema = response_schema.model_json_schema()
+    restore_keys: dict[str, str] = {}
+    _sanitized_keys(json_schema, restore_keys)
+    return CompiledSchema(
+        json_schema=json_schema,
+        sanitized_schema=_sanitize_schema_keys(json_schema),
+        restore_keys=restore_keys,
+    )
@@ -0,0 +1,72 @@
+"""Per-call LLM telemetry.
+
+``memory.token_usage`` only holds totals. Every public ``LLMModel`` call also
+emits an ``LLMCallRecord`` (agent, model, tokens, prompt/axtree/screenshot
+sizes, wall time, retries, fallback) into the current task's call log. The task
+runner opens the log with ``start_llm_call_log`` and drains it after each step
+into ``llm_calls.json`` next to ``final_prompt.txt``.
+
+The log is a ContextVar holding a list, so calls made from tasks spawned by the
+runner land in the same log; outside a run records are dropped.
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+
+class LLMCallRecord(BaseModel):
+    agent: str | None = None
+    model: str
+    # The model that produced the answer when it was not ``model``.
+    served_by: str | None = None
+    fallback_used: bool = False
+    cache_hit: bool = False
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reasoning_tokens: int = 0
+    prompt_bytes: int = 0
+    axtree_bytes: int = 0
+    screenshot_bytes: int = 0
+    pdf: bool = False
+    wall_seconds: float = 0.0
+    retries: int = 0
+    error: str | None = None
+    started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+_call_log: ContextVar[list[LLMCallRecord] | None] = ContextVar(
+    "llm_call_log", default=None
+)
+_served_by: ContextVar[str | None] = ContextVar("llm_served_by", default=None)
+
+
+def start_llm_call_log() -> None:
+    """Collect records for the current task (and tasks it spawns)."""
+    _call_log.set([])
+
+
+def record_llm_call(record: LLMCallRecord) -> None:
+    log = _call_log.get()
+    if log is not None:
+        log.append(record)
+
+
+def drain_llm_call_records() -> list[LLMCallRecord]:
+    """Records since the last drain; the log itself stays installed."""
+    log = _call_log.get()
+    if not log:
+        return []
+    records = list(log)
+    log.clear()
+    return records
+
+
+def note_served_by(model: str | None) -> None:
+    """Set by the backend once it knows which model answered."""
+    _served_by.set(model)
+
+
+def served_by() -> str | None:
+    return _served_by.get()
@@ -0,0 +1,71 @@
+"""On-disk journal of the child's allocated-but-unstarted tasks.
+
+``task_queue`` lives in memory, so a uvicorn restart (supervisord
+``autorestart``) used to drop every queued task until the master noticed by
+timeout. With CHILD_PERSISTENT_QUEUE each allocation is also written to a small
+SQLite database in WAL mode and removed again once a slot dequeues the task or
+``/kill_task`` cancels it; on startup the remaining rows are replayed.
+
+Tasks are removed when they start, not when they finish: a task that was
+running when the process died is not run a second time.
+
+Rows hold the full task, api_key and parameters included, so the directory is
+kept owner-only (0700) and the database, and the WAL files SQLite derives from
+it, owner-read/write (0600).
+"""
+
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+from optexity.schema.task import Task
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentTaskQueue:
+    def __init__(self, path: Path):
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        os.chmod(path.parent, 0o700)
+        # Created up front so SQLite never makes it with the umask default;
+        # the -wal and -shm files copy its mode.
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+        self.path = path
+        # Only touched from the event loop thread; autocommit so each write is
+        # durable on return without explicit transactions.
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_tasks ("
+            "task_id TEXT PRIMARY KEY, seq INTEGER NOT NULL, task_json TEXT NOT NULL)"
+        )
+
+    def add(self, task: Task, seq: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pending_tasks (task_id, seq, task_json) "
+            "VALUES (?, ?, ?)",
+            (task.task_id, seq, task.model_dump_json()),
+        )
+
+    def remove(self, task_id: str) -> None:
+        self._conn.execute("DELETE FROM pending_tasks WHERE task_id = ?", (task_id,))
+
+    def load(self) -> list[tuple[int, Task]]:
+        """Pending tasks with their sequence numbers; unreadable rows are dropped."""
+        pending: list[tuple[int, Task]] = []
+        rows = self._conn.execute(
+            "SELECT task_id, seq, task_json FROM pending_tasks ORDER BY seq"
+        ).fetchall()
+        for task_id, seq, task_json in rows:
+            try:
+                pending.append((seq, Task.model_validate_json(task_json)))
+            except Exception as e:
+                logger.warning(f"Dropping unreadable queued task {task_id}: {e}")
+                self.remove(task_id)
+        return pending
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,155 @@
+"""Validated-``Automation`` cache for the recordings tasks run against.
+
+The child fetches each task's recording just before running it so workflow edits
+made after allocation are picked up. That fetch and the ``Automation`` parse sit
+on the critical path between tasks, so entries are cached by ``recording_id``:
+an entry validated within ``RECORDING_CACHE_TTL_SECONDS`` is used without any
+request, and an older one is revalidated with ``If-None-Match`` so an unchanged
+recording costs a 304 instead of a download and a re-parse.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from optexity.schema.automation import Automation
+from optexity.utils.http import request_with_backoff
+from optexity.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedRecording:
+    # Shared by every task on this recording. The parent only reads and
+    # serializes it; nodes run (and mutate their copy) inside the worker.
+    automation: Automation
+    callback_url: Any
+    etag: str | None
+    # Recordings are fetched per API key; an entry is only reused for the
+    # same key so one workspace's fetch never serves another's task.
+    api_key: str
+    validated_at: float
+
+
+class RecordingCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedRecording] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def _fresh_entry(self, recording_id: str, api_key: str) -> CachedRecording | None:
+        entry = self._entries.get(recording_id)
+        if entry is None or entry.api_key != api_key:
+            return None
+        if time.monotonic() - entry.validated_at > self.ttl_seconds:
+            return None
+        self._entries.move_to_end(recording_id)
+        return entry
+
+    async def get(
+        self, recording_id: str, api_key: str, log_label: str
+    ) -> tuple[CachedRecording | None, int]:
+        """The recording for a task about to run, and the fetch attempts used.
+
+        Waits on a prefetch already in flight for the same recording; if that
+        prefetch failed, falls back to a full ``request_with_backoff`` fetch.
+        """
+        entry = self._fresh_entry(recording_id, api_key)
+        if entry is not None:
+            logger.info(f"Using cached automation for recording {recording_id}")
+            return entry, 0
+
+        inflight = self._inflight.get(recording_id)
+        if inflight is not None:
+            try:
+                entry, attempt = await asyncio.shield(inflight)
+            except Exception:
+                entry = None
+            if entry is not None and entry.api_key == api_key:
+                return entry, attempt
+
+        return await self._fetch(recording_id, api_key, log_label, prefetch=False)
+
+    async def prefetch(self, recording_id: str, api_key: str) -> None:
+        """Warm the cache for a queued task; never raises, never backs off."""
+        if self._fresh_entry(recording_id, api_key) is not None:
+            return
+        if recording_id in self._inflight:
+            return
+        fetch = asyncio.create_task(
+            self._fetch(
+                recording_id,
+                api_key,
+                f"automation prefetch for recording {recording_id}",
+                prefetch=True,
+            )
+        )
+        self._inflight[recording_id] = fetch
+        try:
+            await fetch
+        except Exception as e:
+            logger.warning(f"Prefetch of recording {recording_id} failed: {e}")
+        finally:
+            self._inflight.pop(recording_id, None)
+
+    async def _fetch(
+        self, recording_id: str, api_key: str, log_label: str, prefetch: bool
+    ) -> tuple[CachedRecording | None, int]:
+        recording_url = settings.GET_RECORDING_ENDPOINT.format(
+            recording_id=recording_id
+        )
+        fetch_url = f"{settings.SERVER_URL.rstrip('/')}/{recording_url}"
+
+        headers = {"x-api-key": api_key}
+        cached = self._entries.get(recording_id)
+        if cached is not None and cached.api_key == api_key and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
+        # A prefetch is opportunistic: one attempt, no backoff. The task that
+        # needs the recording does the full backoff if this one misses.
+        backoff_kwargs: dict[str, Any] = (
+            {"max_backoff_seconds": 0.0, "client_error_retries": 1} if prefetch else {}
+        )
+        response, attempt = await request_with_backoff(
+            fetch_url,
+            headers=headers,
+            log_label=log_label,
+            extra_ok_statuses=(304,),
+            **backoff_kwargs,
+        )
+        if response is None:
+            return None, attempt
+
+        if response.status_code == 304 and cached is not None:
+            cached.validated_at = time.monotonic()
+            self._entries[recording_id] = cached
+            self._entries.move_to_end(recording_id)
+            logger.info(f"Recording {recording_id} not modified; reusing cache")
+            return cached, attempt
+
+        try:
+            data = response.json()
+            entry = CachedRecording(
+                automation=Automation.model_validate(data["automation"]),
+                callback_url=data.get("callback_url"),
+                etag=response.headers.get("etag"),
+                api_key=api_key,
+                validated_at=time.monotonic(),
+            )
+        except Exception as parse_err:
+            logger.warning(
+                f"Failed to parse automation response for recording "
+                f"{recording_id}: {parse_err}"
+            )
+            return None, attempt
+
+        self._entries[recording_id] = entry
+        self._entries.move_to_end(recording_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry, attempt
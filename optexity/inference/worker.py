@@ -2,10 +2,20 @@ import asyncio
 import os
 import sys
 
+import psutil
+
 from optexity.inference.core.run_automation import run_automation
+from optexity.inference.worker_channel import (
+    open_stdin_reader,
+    read_frame,
+    read_message,
+    send_message,
+    set_progress_sink,
+)
 from optexity.private_nodes import load_plugins
 from optexity.schema.enums import ExitCodes
 from optexity.schema.task import Task
+from optexity.utils.settings import settings
 
 
 def _force_exit(code: int) -> None:
@@ -21,34 +31,80 @@ def _force_exit(code: int) -> None:
     os._exit(code)
 
 
-async def main():
+def _exit_code_for(task: Task) -> int:
+    if task.status == "success":
+        return ExitCodes.SUCCESS.value
+    if task.status == "killed":
+        return ExitCodes.AUTOMATION_KILLED.value
+    return ExitCodes.AUTOMATION_FAILED.value
+
+
+async def main(serve: bool):
+    """Run tasks handed over on stdin (see ``worker_channel``).
+
+    A cold worker runs one task and exits with its ExitCodes value. In warm-pool
+    mode (``--serve``) it keeps taking tasks, and exits after a crash, after
+    WORKER_POOL_MAX_TASKS_PER_WORKER tasks, or once its RSS passes
+    WORKER_POOL_RECYCLE_RSS_MB; the pool then replaces it.
+    """
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=0)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    set_progress_sink(channel)
+
     # Nodes execute in this process, so private_node handlers must be registered
     # here — registering them in the parent service would not reach the executor.
     load_plugins()
+    reader = await open_stdin_reader()
+    process = psutil.Process()
+    tasks_run = 0
 
-    task = Task.model_validate_json(sys.argv[1])
-    unique_child_arn = sys.argv[2]
-    child_process_id = int(sys.argv[3])
-    cdp_url = sys.argv[4]
-    max_tries = int(sys.argv[5]) if len(sys.argv) > 5 else 1
-
-    try:
-        await run_automation(
-            task,
-            unique_child_arn,
-            child_process_id,
-            cdp_url=cdp_url,
-            max_tries=max_tries,
-        )
-    except Exception:
-        _force_exit(ExitCodes.WORKER_CRASHED.value)
+    while True:
+        header = await read_message(reader)
+        payload = await read_frame(reader) if header is not None else None
+        if header is None or payload is None:
+            _force_exit(ExitCodes.SUCCESS.value)
 
-    if task.status == "success":
-        _force_exit(ExitCodes.SUCCESS.value)
-    if task.status == "killed":
-        _force_exit(ExitCodes.AUTOMATION_KILLED.value)
-    _force_exit(ExitCodes.AUTOMATION_FAILED.value)
+        task = Task.model_validate_json(payload)
+        # The parent can renumber itself via /set_child_process_id and tasks
+        # land on different slots, so the env browser_health reads is per task.
+        os.environ["CHILD_PROCESS_ID"] = str(header["child_process_id"])
+        os.environ["CHILD_SLOT_INDEX"] = str(header["slot_index"])
+
+        crashed = False
+        try:
+            await run_automation(
+                task,
+                header["unique_child_arn"],
+                header["child_process_id"],
+                cdp_url=header["cdp_url"],
+                max_tries=header["max_tries"],
+                slot_index=header["slot_index"],
+            )
+            returncode = _exit_code_for(task)
+        except Exception:
+            crashed = True
+            returncode = ExitCodes.WORKER_CRASHED.value
+
+        tasks_run += 1
+        rss_mb = process.memory_info().rss / (1024**2)
+        recycle = (
+            not serve
+            or crashed
+            or tasks_run >= settings.WORKER_POOL_MAX_TASKS_PER_WORKER
+            or rss_mb >= settings.WORKER_POOL_RECYCLE_RSS_MB
+        )
+        send_message(
+            channel,
+            {
+                "type": "result",
+                "returncode": returncode,
+                "rss_mb": rss_mb,
+                "recycle": recycle,
+            },
+        )
+        if recycle:
+            _force_exit(returncode)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(serve="--serve" in sys.argv[1:]))
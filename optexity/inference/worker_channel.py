@@ -0,0 +1,115 @@
+"""Length-prefixed frames between the child process and its worker subprocesses.
+
+Each frame is a 4-byte big-endian length followed by that many bytes. The parent
+writes to the worker's stdin and reads from its stdout; the worker points its own
+stdout at stderr first, so library prints never land in the channel.
+
+Parent -> worker:
+    {"type": "task", "unique_child_arn", "child_process_id", "cdp_url",
+     "max_tries", "slot_index"} followed by one frame holding the raw
+    ``Task.model_dump_json()`` bytes, so the task is parsed exactly once with
+    ``Task.model_validate_json`` and never appears in argv / ``ps``.
+
+Worker -> parent:
+    {"type": "progress", "task_id", "status", "step_index"} and
+    {"type": "metric", "name", "value", "labels"} any number of times, then
+    {"type": "result", "returncode", "rss_mb", "recycle"}.
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import sys
+import threading
+from typing import IO, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+def encode_frame(payload: bytes) -> bytes:
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME_BYTES}")
+    return _HEADER.pack(len(payload)) + payload
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    return encode_frame(json.dumps(message).encode())
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes | None:
+    """The next frame's payload, or None once the other side has gone away."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        (length,) = _HEADER.unpack(header)
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    frame = await read_frame(reader)
+    if frame is None:
+        return None
+    return json.loads(frame)
+
+
+async def open_stdin_reader() -> asyncio.StreamReader:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_FRAME_BYTES)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+    return reader
+
+
+# Worker-side sink for progress frames; None outside a worker (e.g. run_local),
+# which makes report_progress a no-op.
+_progress_sink: IO[bytes] | None = None
+# LLM calls can run in worker threads; keep their frames from interleaving.
+_sink_lock = threading.Lock()
+
+
+def set_progress_sink(sink: IO[bytes] | None) -> None:
+    global _progress_sink
+    _progress_sink = sink
+
+
+def send_message(sink: IO[bytes], message: dict[str, Any]) -> None:
+    sink.write(encode_message(message))
+    sink.flush()
+
+
+def forward_to_parent(message: dict[str, Any]) -> bool:
+    """Send ``message`` to the parent if running in a worker. Never raises.
+
+    Returns False outside a worker so the caller can handle it locally.
+    """
+    if _progress_sink is None:
+        return False
+    try:
+        with _sink_lock:
+            send_message(_progress_sink, message)
+    except Exception as e:
+        logger.debug(f"Failed to send {message.get('type')} message to parent: {e}")
+    return True
+
+
+def report_progress(task_id: str, status: str, step_index: int | None = None) -> None:
+    """Tell the parent how far the running task has got. Never raises."""
+    forward_to_parent(
+        {
+            "type": "progress",
+            "task_id": task_id,
+            "status": status,
+            "step_index": step_index,
+        }
+    )
+
+
+ProgressCallback = Callable[[dict[str, Any]], None]
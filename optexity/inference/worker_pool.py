@@ -0,0 +1,170 @@
+"""Worker subprocesses and the pre-forked pool of warm ones.
+
+A cold worker re-imports playwright, patchright, browser_use, litellm, boto3 and
+pydantic and re-runs ``load_plugins()`` before its first node, which costs
+seconds on every attempt. Pooled workers (``worker.py --serve``) pay that once
+while idle. Cold and warm workers alike take their task over stdin using the
+frames in ``worker_channel`` and report progress and the result on stdout.
+
+Each worker runs in its own process group, so ``/kill_task`` and the timeout
+path keep killing the whole group with ``os.killpg``; a killed or recycled
+pooled worker is simply replaced.
+"""
+
+import asyncio
+import logging
+import os
+import pathlib
+import signal
+import sys
+
+from optexity.inference import metrics
+from optexity.inference.worker_channel import (
+    ProgressCallback,
+    encode_frame,
+    encode_message,
+    read_message,
+)
+from optexity.schema.task import Task
+
+logger = logging.getLogger(__name__)
+
+WORKER_PATH = pathlib.Path(__file__).parent / "worker.py"
+
+
+class WorkerProcess:
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.tasks_run = 0
+        self.recycle = False
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def run_task(
+        self,
+        task: Task,
+        header: dict,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        """Hand one task to the worker and wait for its exit-code equivalent.
+
+        If the worker dies mid-task (killed by /kill_task, the timeout path, or
+        a crash) the process's own return code is returned, exactly as a cold
+        worker's ``proc.wait()`` would.
+        """
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self.tasks_run += 1
+        # Stays set unless the worker reports back, so a worker interrupted by
+        # the timeout path is never returned to the idle list.
+        self.recycle = True
+        self.proc.stdin.write(encode_message({"type": "task", **header}))
+        self.proc.stdin.write(encode_frame(task.model_dump_json().encode()))
+        await self.proc.stdin.drain()
+
+        while True:
+            message = await read_message(self.proc.stdout)
+            if message is None:
+                return await self.proc.wait()
+            if message["type"] == "progress":
+                if on_progress is not None:
+                    on_progress(message)
+                continue
+            if message["type"] == "metric":
+                metrics.apply_message(message)
+                continue
+            if message["type"] == "result":
+                break
+            logger.warning(f"Ignoring unknown worker message {message['type']!r}")
+
+        self.recycle = bool(message.get("recycle"))
+        logger.info(
+            "Worker %s finished task %s (rss=%.0f MB, recycle=%s)",
+            self.proc.pid,
+            self.tasks_run,
+            message.get("rss_mb", 0.0),
+            self.recycle,
+        )
+        return int(message["returncode"])
+
+    async def kill(self) -> None:
+        if self.alive:
+            try:
+                os.killpg(os.getpgid(self.proc.pid), signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await self.proc.wait()
+
+
+async def spawn_worker(env: dict[str, str], serve: bool = False) -> WorkerProcess:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        WORKER_PATH,
+        *(["--serve"] if serve else []),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        preexec_fn=os.setsid,
+        env=env,
+    )
+    return WorkerProcess(proc)
+
+
+class WorkerPool:
+    """Keeps ``size`` warm workers idle; hands one out per attempt."""
+
+    def __init__(self, size: int, env: dict[str, str]):
+        self.size = size
+        self.env = env
+        self._idle: list[WorkerProcess] = []
+        self._spawning = 0
+        self._closed = False
+
+    async def _top_up_one(self) -> None:
+        try:
+            worker = await spawn_worker(self.env, serve=True)
+            logger.info("Spawned warm worker %s", worker.proc.pid)
+        except Exception:
+            logger.exception("Failed to spawn warm worker")
+            return
+        finally:
+            self._spawning -= 1
+        if self._closed:
+            await worker.kill()
+            return
+        self._idle.append(worker)
+
+    def _top_up(self) -> None:
+        missing = self.size - len(self._idle) - self._spawning
+        for _ in range(max(0, missing)):
+            self._spawning += 1
+            asyncio.create_task(self._top_up_one())
+
+    def start(self) -> None:
+        self._top_up()
+
+    async def acquire(self) -> WorkerProcess:
+        """An idle warm worker, or a freshly spawned one if none is ready yet."""
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                self._top_up()
+                return worker
+            await worker.proc.wait()
+        self._top_up()
+        return await spawn_worker(self.env, serve=True)
+
+    async def release(self, worker: WorkerProcess) -> None:
+        if self._closed or not worker.alive or worker.recycle:
+            await worker.kill()
+        elif len(self._idle) < self.size:
+            self._idle.append(worker)
+        else:
+            await worker.kill()
+        self._top_up()
+
+    async def close(self) -> None:
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            await worker.kill()
@@ -65,6 +65,11 @@ class LLMExtraction(LLMAction):
 
 class NetworkCallExtraction(BaseModel):
     url_pattern: Optional[str] = None
+    method: Optional[str] = None
+    # Matches responses with this status, and requests paired with one.
+    status: Optional[int] = None
+    # Wait up to this long for a matching response when none is captured yet.
+    wait_timeout_seconds: Optional[float] = Field(default=None, gt=0)
     extract_from: None | Literal["request", "response"] = "response"
     download_from: None | Literal["request", "response"] = "response"
     download_filename: str | None = None
@@ -133,6 +138,11 @@ class PDFExtraction(BaseModel):
     extraction_instructions: str
     llm_provider: str | None = None
     llm_model_name: str | None = None
+    # 1-based pages to extract from; None sends the whole document.
+    pages: list[int] | None = None
+    # Send the PDF's embedded text instead of the file when it has one
+    # (requires pypdf); scanned documents still go as a file.
+    use_text_layer: bool = True
 
     def build_model(self):
         return build_model(self.extraction_format)
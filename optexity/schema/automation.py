@@ -641,6 +641,58 @@ class Parameters(BaseModel):
         return self
 
 
+class AxtreeReduction(BaseModel):
+    """Shrinks the axtree sent to the index predictor. Stages run in order and
+    only remove lines, so every remaining element keeps its original index."""
+
+    stages: list[str] = Field(
+        default_factory=lambda: [
+            "region",
+            "viewport",
+            "repeated_rows",
+            "relevance",
+            "attributes",
+        ]
+    )
+    # Keep only the subtrees whose line contains this text (e.g. a dialog title).
+    region: str | None = None
+    # Viewport heights kept above and below the visible area.
+    viewport_margin: float = 1.0
+    max_repeated_rows: int = 10
+    # Most-relevant interactive elements kept by the relevance stage.
+    max_elements: int = 300
+    max_attribute_length: int = 60
+    max_text_length: int = 200
+
+
+class NetworkCapture(BaseModel):
+    """Which network calls the browser keeps for network_call extractions.
+    Only metadata is recorded up front; bodies are fetched when extracted."""
+
+    # Substrings of the URLs to keep; None keeps every URL.
+    url_patterns: list[str] | None = None
+    # Substrings of the response content-type to keep, e.g. ["json"].
+    content_types: list[str] | None = None
+    # Caps for this automation; None uses NETWORK_CAPTURE_MAX_ENTRIES/_BYTES.
+    max_entries: int | None = Field(default=None, gt=0)
+    max_bytes: int | None = Field(default=None, gt=0)
+
+
+class ResourcePolicy(BaseModel):
+    """Requests the browser drops, or shrinks, before they cost bandwidth.
+    Enforced per page through CDP (Network.setBlockedURLs and Fetch)."""
+
+    # CDP resource types to block, e.g. ["Image", "Font", "Media"].
+    block_resource_types: list[str] = Field(default_factory=list)
+    # Hosts to block, subdomains included, e.g. ["doubleclick.net"].
+    deny_domains: list[str] = Field(default_factory=list)
+    # When set, only these hosts (and their subdomains) are loaded. Every
+    # request is then paused for a decision, so prefer deny_domains.
+    allow_domains: list[str] | None = None
+    # Re-encode images larger than this many pixels on either side.
+    max_image_dimension: int | None = Field(default=None, gt=0)
+
+
 ## TODO: fix expected downloads for ForLoop
 class Automation(BaseModel):
     browser_channel: Literal[
@@ -660,6 +712,21 @@ class Automation(BaseModel):
     # Any mismatch or health-check failure falls back to the normal cold flow.
     reuse_page_if_already_on_url: bool = False
     take_final_screenshot: bool = True
+    # Serve repeated structured LLM calls (same model, prompt, screenshot and
+    # schema) from the local response cache when LLM_RESPONSE_CACHE_PATH is set.
+    # Turn off for portals whose answers must be recomputed on every run.
+    llm_response_cache: bool = True
+    # Reuse the element a prompt resolved to on earlier runs (matched by its
+    # fingerprint) instead of asking the index predictor, when
+    # AXTREE_INDEX_MEMO_PATH is set.
+    axtree_index_memo: bool = True
+    # Prune the axtree before index prediction; None sends it verbatim.
+    axtree_reduction: AxtreeReduction | None = None
+    # Filters and caps for captured network traffic; None captures everything
+    # up to the global caps.
+    network_capture: NetworkCapture | None = None
+    # Block ads, analytics, fonts or images this workflow does not need.
+    resource_policy: ResourcePolicy | None = None
     parameters: Parameters
     nodes: list[
         Annotated[
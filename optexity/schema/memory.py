@@ -33,6 +33,15 @@ class NetworkResponse(BaseModel):
     content_length: int = Field(...)
 
 
+class ResourcePolicyStats(BaseModel):
+    # Requests failed by the automation's resource_policy, by CDP resource type.
+    blocked_requests: dict[str, int] = Field(default_factory=dict)
+    images_downscaled: int = 0
+    # Bytes saved by downscaling; blocked requests never reach the network, so
+    # their size is unknown and only counted above.
+    image_bytes_saved: int = 0
+
+
 class AutomationState(BaseModel):
     step_index: int = Field(default_factory=lambda: -1)
     try_index: int = Field(default_factory=lambda: -1)
@@ -116,6 +125,9 @@ class BrowserState(BaseModel):
     validation_ocr_results: list[dict] = Field(default_factory=list)
     html: str | None = Field(default=None)
     axtree: str | None = Field(default=None)
+    # Characters of axtree before and after AxtreeReduction, when it ran.
+    axtree_original_size: int | None = Field(default=None)
+    axtree_reduced_size: int | None = Field(default=None)
     final_prompt: str | None = Field(default=None)
     llm_response: str | dict | None = Field(default=None)
     locator_candidates: list[dict] | None = Field(default=None)
@@ -153,6 +165,9 @@ class Memory(BaseModel):
     automation_state: AutomationState = Field(default_factory=AutomationState)
     browser_states: list[BrowserState] = Field(default_factory=list)
     token_usage: TokenUsage = Field(default_factory=TokenUsage)
+    resource_policy_stats: ResourcePolicyStats = Field(
+        default_factory=ResourcePolicyStats
+    )
     download_lock: asyncio.Lock = Field(default_factory=asyncio.Lock)
     raw_downloads: dict[Path, tuple[bool, Download | None]] = Field(
         default_factory=dict
@@ -167,13 +182,16 @@ class Memory(BaseModel):
     # hands a work list to per-iteration nodes without a window.__foo round trip.
     # Holds arbitrary Python objects; never serialized.
     state: dict[str, Any] = Field(default_factory=dict)
+    # (memo key, fingerprint) of the index get_index_from_prompt returned, until
+    # the handler settles it; the fingerprint is None for a memoized index.
+    pending_index_memo: tuple[str, dict | None] | None = Field(default=None)
     final_screenshot: str | None = Field(default=None)
     system_info_tracking: list[SystemInfo] = Field(default_factory=list)
     unique_child_arn: str
 
     model_config = {
         "arbitrary_types_allowed": True,
-        "exclude": {"download_lock", "state"},
+        "exclude": {"download_lock", "state", "pending_index_memo"},
     }
 
     def update_system_info(self):
@@ -15,6 +15,10 @@ class TokenUsage(BaseModel):
     thoughts_cost: float = 0
     total_cost: float = 0
 
+    # Structured LLM calls answered from / missed in the response cache.
+    cache_hits: int = 0
+    cache_misses: int = 0
+
     def __add__(self, other: "TokenUsage") -> "TokenUsage":
         return TokenUsage(
             input_tokens=self.input_tokens + other.input_tokens,
@@ -29,6 +33,8 @@ class TokenUsage(BaseModel):
             tool_use_cost=self.tool_use_cost + other.tool_use_cost,
             thoughts_cost=self.thoughts_cost + other.thoughts_cost,
             total_cost=self.total_cost + other.total_cost,
+            cache_hits=self.cache_hits + other.cache_hits,
+            cache_misses=self.cache_misses + other.cache_misses,
         )
 
     def __sub__(self, other: "TokenUsage") -> "TokenUsage":
@@ -45,4 +51,6 @@ class TokenUsage(BaseModel):
             tool_use_cost=self.tool_use_cost - other.tool_use_cost,
             thoughts_cost=self.thoughts_cost - other.thoughts_cost,
             total_cost=self.total_cost - other.total_cost,
+            cache_hits=self.cache_hits - other.cache_hits,
+            cache_misses=self.cache_misses - other.cache_misses,
         )
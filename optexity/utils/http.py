@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Any, Literal
+from typing import Any, Collection, Literal
 
 import httpx
 
@@ -19,6 +19,7 @@ async def request_with_backoff(
     client_error_retries: int = 3,
     client_error_wait_seconds: float = 3.0,
     log_label: str = "request",
+    extra_ok_statuses: Collection[int] = (),
 ) -> tuple[httpx.Response | None, int]:
     """HTTP request with exponential backoff when the server is down.
 
@@ -27,7 +28,8 @@ async def request_with_backoff(
     < 500) are retried up to ``client_error_retries`` times with a fixed
     ``client_error_wait_seconds`` wait between attempts.
 
-    Returns ``(response, attempts)``. ``response`` is set only on 2xx success.
+    Returns ``(response, attempts)``. ``response`` is set only on 2xx success
+    or a status in ``extra_ok_statuses`` (e.g. 304 for conditional requests).
     """
     backoff_seconds = initial_backoff_seconds
     total_backoff = 0.0
@@ -39,6 +41,8 @@ async def request_with_backoff(
         try:
             async with httpx.AsyncClient(timeout=timeout) as client:
                 response = await client.request(method, url, headers=headers or {})
+                if response.status_code in extra_ok_statuses:
+                    return response, attempt
                 if response.status_code >= 500:
                     raise httpx.HTTPStatusError(
                         f"Server unavailable (HTTP {response.status_code})",
@@ -9,6 +9,7 @@ importing `optexity.utils.settings` would run `Settings()` and fail on both.
 
 import logging
 import os
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -38,6 +39,41 @@ class LLMSettings(BaseSettings):
     LLM_MODEL_FALLBACK: str | None = None
     LLM_MODEL_FALLBACK_API_KEY: str | None = None
 
+    # Content-addressed cache of structured responses (see
+    # optexity.inference.models.response_cache). Unset disables it; entries
+    # expire after the TTL and the least recently used are evicted past the cap.
+    LLM_RESPONSE_CACHE_PATH: str | None = None
+    LLM_RESPONSE_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    LLM_RESPONSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Hedge async structured calls (see optexity.inference.models.hedging): if
+    # LLM_MODEL has not answered within the LLM_HEDGE_PERCENTILE of its recent
+    # latencies, also ask LLM_MODEL_FALLBACK and keep the first valid answer.
+    LLM_HEDGE_REQUESTS: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 10.0
+
+    # Client-side token buckets and in-flight caps per litellm model string or
+    # provider prefix, e.g. {"gemini": {"rpm": 1000, "tpm": 4000000,
+    # "concurrency": 16}} (see optexity.inference.models.rate_limit). With a
+    # state dir the buckets are shared by every process on the host through
+    # flock'd files; the in-flight cap is always per process.
+    LLM_RATE_LIMITS: dict[str, dict[str, float]] = {}
+    LLM_RATE_LIMIT_STATE_DIR: str | None = None
+
+    # In-memory cache of base64-encoded PDFs keyed by content hash, so retries
+    # and repeat extractions of one file encode it once.
+    LLM_PDF_PAYLOAD_CACHE_MAX_BYTES: int = 128 * 1024 * 1024
+
+    # Record completions to, or replay them from, a JSON-lines fixture (see
+    # optexity.inference.models.replay). Replay never touches the network; its
+    # delay is the recorded latency times the scale, unless a fixed one is set.
+    LLM_REPLAY_MODE: Literal["record", "replay"] | None = None
+    LLM_REPLAY_FIXTURE_PATH: str | None = None
+    LLM_REPLAY_LATENCY_SECONDS: float | None = None
+    LLM_REPLAY_LATENCY_SCALE: float = 1.0
+
     def llm_api_key_for(self, model: str) -> str | None:
         """The configured key for an arbitrary litellm model string.
 
@@ -57,6 +57,72 @@ class Settings(LLMSettings):
     UPLOAD_READ_TIMEOUT_SECONDS: float = 600.0
     UPLOAD_POOL_TIMEOUT_SECONDS: float = 30.0
 
+    # Concurrent execution slots per inference child. Each slot owns its own
+    # browser, CDP port and worker subprocess. The first slot always admits a
+    # task; further slots only take one while the container (cgroup) has at
+    # least CHILD_SLOT_MIN_FREE_MEMORY_MB of headroom.
+    CHILD_EXECUTION_SLOTS: int = Field(default=1, ge=1)
+    CHILD_SLOT_MIN_FREE_MEMORY_MB: float = 1536.0
+    CHILD_SLOT_ADMISSION_POLL_SECONDS: float = 2.0
+    # Slot N's CDP port is 9222 + child_process_id + N * CHILD_SLOT_PORT_STRIDE.
+    CHILD_SLOT_PORT_STRIDE: int = 100
+
+    # /allocate_task answers 429 with Retry-After once the local queue would
+    # exceed CHILD_QUEUE_CAPACITY tasks (0 = unbounded). With
+    # CHILD_QUEUE_STRIP_AUTOMATION queued tasks drop their embedded Automation;
+    # it is fetched at dequeue, and a failed fetch then fails the task instead
+    # of falling back to the allocated copy.
+    CHILD_QUEUE_CAPACITY: int = 0
+    CHILD_QUEUE_RETRY_AFTER_SECONDS: int = 30
+    CHILD_QUEUE_STRIP_AUTOMATION: bool = False
+
+    # Journal queued tasks to CHILD_QUEUE_DIR/task_queue_<child id>.sqlite3 so
+    # a restarted child replays allocated tasks that had not started yet.
+    CHILD_PERSISTENT_QUEUE: bool = False
+    CHILD_QUEUE_DIR: str = "/tmp/optexity"
+
+    # Pre-forked worker processes kept idle with playwright, browser_use,
+    # litellm etc. already imported and plugins loaded. 0 spawns a cold
+    # worker.py per attempt. A pooled worker is recycled after
+    # WORKER_POOL_MAX_TASKS_PER_WORKER tasks or once its RSS passes
+    # WORKER_POOL_RECYCLE_RSS_MB.
+    WORKER_POOL_SIZE: int = 0
+    WORKER_POOL_MAX_TASKS_PER_WORKER: int = 20
+    WORKER_POOL_RECYCLE_RSS_MB: float = 1024.0
+
+    # Recordings for the next RECORDING_PREFETCH_DEPTH queued tasks are fetched
+    # in the background (0 disables). A cached, validated Automation younger
+    # than RECORDING_CACHE_TTL_SECONDS is used as-is; an older one is
+    # revalidated with If-None-Match.
+    RECORDING_PREFETCH_DEPTH: int = 4
+    RECORDING_CACHE_TTL_SECONDS: float = 30.0
+    RECORDING_CACHE_MAX_ENTRIES: int = 64
+
+    # Keep a pre-launched "hot spare" browser per slot for non-dedicated tasks.
+    # It is started while the current task runs and handed over by
+    # setup_browser when channel, proxy, os_emulation and allow_cookies match.
+    # The spare listens on the slot's CDP port + BROWSER_SPARE_PORT_OFFSET
+    # (keep it below CHILD_SLOT_PORT_STRIDE) and is only launched while the
+    # container has CHILD_SLOT_MIN_FREE_MEMORY_MB of headroom.
+    BROWSER_HOT_SPARE: bool = False
+    BROWSER_SPARE_PORT_OFFSET: int = 50
+
+    # Start non-dedicated browsers from a profile template baked once per
+    # container for each (launch mode, channel, extensions, os_emulation)
+    # instead of an empty user-data-dir, skipping Chrome's first-run setup.
+    BROWSER_PROFILE_TEMPLATES: bool = False
+
+    # SQLite file remembering which element each prompt-based step resolved
+    # to, so later runs can skip the index-prediction LLM call (None = off).
+    AXTREE_INDEX_MEMO_PATH: str | None = None
+    AXTREE_INDEX_MEMO_TTL_SECONDS: float = 30 * 24 * 3600
+
+    # Ring-buffer caps on the network calls a browser keeps for network_call
+    # extractions; the oldest calls are dropped first. Automations can narrow
+    # them with `network_capture`.
+    NETWORK_CAPTURE_MAX_ENTRIES: int = 2000
+    NETWORK_CAPTURE_MAX_BYTES: int = 64 * 1024 * 1024
+
     @model_validator(mode="after")
     def validate_local_callback_url(self):
         if self.DEPLOYMENT == "prod" and self.LOCAL_CALLBACK_URL is not None:
@@ -2,6 +2,7 @@ import base64
 import json
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional
 from urllib.parse import urlparse
@@ -83,17 +84,29 @@ async def get_onepassword_client(
 
 
 def build_model(schema: dict, model_name="AutoModel"):
+    """A pydantic model for an extraction/output format. Identical formats (e.g.
+    every iteration of a for-loop) share one class, so its JSON schema is also
+    compiled only once downstream."""
+    return _build_model_cached(json.dumps(schema), model_name)
+
+
+@lru_cache(maxsize=256)
+def _build_model_cached(schema_json: str, model_name: str):
+    return _build_model(json.loads(schema_json), model_name)
+
+
+def _build_model(schema: dict, model_name: str):
     fields = {}
     for key, value in schema.items():
         if isinstance(value, str):  # primitive type
             py_type = eval(value)  # e.g., "str" -> str
             fields[key] = (Optional[py_type], None)
         elif isinstance(value, dict):  # nested object
-            sub_model = build_model(value, model_name=f"{model_name}_{key}")
+            sub_model = _build_model(value, model_name=f"{model_name}_{key}")
             fields[key] = (Optional[sub_model], None)
         elif isinstance(value, list):  # list of objects or primitives
             if len(value) > 0 and isinstance(value[0], dict):
-                sub_model = build_model(value[0], model_name=f"{model_name}_{key}")
+                sub_model = _build_model(value[0], model_name=f"{model_name}_{key}")
                 fields[key] = (Optional[List[sub_model]], None)
             else:  # list of primitives
                 py_type = eval(value[0])